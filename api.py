@@ -1,30 +1,114 @@
+import asyncio
+import json
 import os
 import re
-import tempfile
 import time
 import uuid
-import shutil
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
 from pathlib import Path
-from threading import Lock
+from threading import Lock, Thread
 
-import dspy
-from fastapi import BackgroundTasks, FastAPI, HTTPException
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from openai import OpenAI
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from src.make_a_book.audiobook_generator import AudiobookGenerator
-from src.make_a_book.chapter_generator import ChapterCreator
-from src.make_a_book.outline_generator import OutlineCreator
-from src.make_a_book.tts_time_estimator import count_words, estimate_tts_seconds
+from src.make_a_book.audio_pool import get_audio_pool
+from src.make_a_book.book_archive import iter_book_zip
+from src.make_a_book.cancellation import CancellationToken, JobCancelled
+from src.make_a_book.clients import get_clients
+from src.make_a_book.job_events import JobEventBroker
+from src.make_a_book.job_manifest import JobManifest
+from src.make_a_book.job_queue import JobQueue, QueueFullError
+from src.make_a_book.job_store import JobStore
+from src.make_a_book.job_trace import TRACE_FILENAME, JobTrace, append_span, read_trace, timings_from_trace
+from src.make_a_book.llm_cache import LLMResponseCache
+from src.make_a_book.metrics import (
+    ACTIVE_JOBS,
+    AUDIO_POOL_SATURATION,
+    HTTP_REQUEST_SECONDS,
+    JOB_POOL_SATURATION,
+    OUTPUT_DISK_BYTES,
+    QUEUED_JOBS,
+    REGISTRY,
+    THREADPOOL_SATURATION,
+    TTS_POOL_SATURATION,
+    TTS_QUEUED_REQUESTS,
+    ZIP_SECONDS,
+)
+from src.make_a_book.outline_parser import parse_outline_chapters
+from src.make_a_book.tts_cache import TTSChunkCache
+from src.make_a_book.text_chunker import chunk_text
+from src.make_a_book.tts_scheduler import get_scheduler
+from src.make_a_book.tts_time_estimator import TTSLatencyModel
 
 load_dotenv()
 
-app = FastAPI(title="Book Foundry API")
+# Import dspy, the OpenAI SDK and the LM in the background once the server is
+# up, so a cold start answers at once and the first real request finds them
+# loaded. Set to 0 to load them only on first use.
+WARM_UP = os.getenv("API_WARM_UP", "1") != "0"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _thread_limiter
+    # The limiter is per event loop and can't be looked up from the worker
+    # thread a /metrics scrape runs on.
+    _thread_limiter = anyio.to_thread.current_default_thread_limiter()
+    _resume_interrupted_jobs()
+    if WARM_UP:
+        Thread(target=_warm_up, name="api-warm-up", daemon=True).start()
+    yield
+    # Queued jobs stay "queued" in the store and resume on the next start.
+    job_queue.shutdown()
+    get_audio_pool().shutdown()
+    # Persist any batched progress before the machine stops.
+    job_store.close()
+    tts_latency_model.flush()
+    get_clients().close()
+
+
+class RequestMetricsMiddleware:
+    """Record handler latency per route template, method and status code."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Templates like /api/audiobook/status/{job_id} keep cardinality low.
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
+
+
+app = FastAPI(title="Book Foundry API", lifespan=lifespan)
+
+app.add_middleware(RequestMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
@@ -33,14 +117,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-audiobook_jobs: dict[str, dict] = {}
-audiobook_jobs_lock = Lock()
-
-
 class OutlineRequest(BaseModel):
     title: str
     prompt: str
     target_duration_minutes: int = 5
+    regenerate: bool = False
 
 
 class OutlineFeedbackRequest(BaseModel):
@@ -48,6 +129,7 @@ class OutlineFeedbackRequest(BaseModel):
     prompt: str
     feedback: str
     target_duration_minutes: int = 5
+    regenerate: bool = False
 
 
 class OutlineResponse(BaseModel):
@@ -58,6 +140,8 @@ class ChapterRequest(BaseModel):
     title: str
     outline: str
     target_duration_minutes: int = 5
+    per_chapter: bool = False
+    regenerate: bool = False
 
 
 class ChapterResponse(BaseModel):
@@ -79,17 +163,37 @@ class AudiobookRequest(BaseModel):
     speed: float
     include_outline: bool = True
     instructions: str | None = None
+    # Cancel the job if it has not finished this many seconds after submission.
+    deadline_seconds: float | None = None
+
+
+class MissingChunk(BaseModel):
+    chapter_index: int
+    chunk_index: int
+    error: str
 
 
 class AudiobookResponse(BaseModel):
     folder: str
     audio_files: list[str]
     download_url: str | None = None
+    # Chunks that failed after all retries; resuming the job synthesizes them again.
+    missing_chunks: list[MissingChunk] = []
 
 
 class AudiobookJobResponse(BaseModel):
     job_id: str
     total_chapters: int
+    queue_position: int | None = None
+    estimated_start_seconds: int | None = None
+
+
+class SpanTiming(BaseModel):
+    name: str
+    start_seconds: float
+    duration_seconds: float
+    attributes: dict[str, object] = {}
+    children: list["SpanTiming"] = []
 
 
 class AudiobookStatusResponse(BaseModel):
@@ -97,39 +201,186 @@ class AudiobookStatusResponse(BaseModel):
     progress: int
     completed_chapters: int
     total_chapters: int
+    completed_chunks: int | None = None
+    total_chunks: int | None = None
     elapsed_seconds: int | None = None
     estimated_seconds: int | None = None
+    eta_seconds: int | None = None
+    queue_position: int | None = None
+    estimated_start_seconds: int | None = None
     result: AudiobookResponse | None = None
     error: str | None = None
-
-anthropic_lm = dspy.LM(
-    model="anthropic/claude-haiku-4-5",
-    api_key=os.getenv("ANTHROPIC_API_KEY"),
-)
-outline_creator = OutlineCreator(anthropic_lm)
-chapter_creator = ChapterCreator(anthropic_lm)
+    timings: SpanTiming | None = None
 
 OUTPUT_ROOT = Path(os.getenv("BOOK_OUTPUT_DIR", "/tmp/book_foundry_outputs"))
 OUTPUT_ROOT.mkdir(parents=True, exist_ok=True)
+tts_cache = TTSChunkCache(OUTPUT_ROOT / "tts_cache")
+llm_cache = LLMResponseCache(OUTPUT_ROOT / "llm_cache")
+# Learns per-chunk synthesis time from every job; estimates and ETAs use it.
+tts_latency_model = TTSLatencyModel(OUTPUT_ROOT / "tts_latency_model.json")
+
+# Built on first use by _llm_creators: importing dspy and building the LM
+# takes about a second that a cold start should not spend before /api/health.
+outline_creator = None
+chapter_creator = None
+_llm_creators_lock = Lock()
+job_store = JobStore(OUTPUT_ROOT / "jobs.sqlite3")
+
+# Audiobook jobs run on a fixed pool of worker threads fed by a bounded queue
+# (AUDIOBOOK_JOB_WORKERS, AUDIOBOOK_QUEUE_DEPTH); when it is full new jobs get
+# a 429 instead of piling up on a small machine.
+job_queue = JobQueue()
+
+job_events = JobEventBroker()
+TERMINAL_JOB_STATUSES = {"completed", "error", "cancelled"}
+RESUMABLE_JOB_STATUSES = {"error", "cancelled"}
+SSE_KEEPALIVE_SECONDS = 15
+
+# Live span trees of running jobs; finished jobs are read from their trace file.
+job_traces: dict[str, JobTrace] = {}
+# Cancellation tokens of queued and running jobs.
+job_tokens: dict[str, CancellationToken] = {}
+job_state_lock = Lock()
+
+# Walking OUTPUT_ROOT on every scrape would be slow once many books exist.
+DISK_USAGE_TTL_SECONDS = 60.0
+_disk_usage = {"bytes": 0, "measured_at": float("-inf")}
+# AnyIO's default thread limiter, which runs sync endpoints and
+# run_in_threadpool work; captured by lifespan.
+_thread_limiter: anyio.CapacityLimiter | None = None
+
+
+def _output_disk_bytes() -> int:
+    now = time.monotonic()
+    if now - _disk_usage["measured_at"] >= DISK_USAGE_TTL_SECONDS:
+        total = 0
+        for root, _, files in os.walk(OUTPUT_ROOT):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        _disk_usage.update(bytes=total, measured_at=now)
+    return _disk_usage["bytes"]
+
+
+def _tts_saturation() -> float:
+    stats = get_scheduler().stats()
+    return stats["active"] / max(1, get_scheduler().max_concurrency)
+
+
+def _audio_pool_saturation() -> float:
+    stats = get_audio_pool().stats()
+    return stats["pending"] / stats["max_pending"]
+
+
+def _job_pool_saturation() -> float:
+    stats = job_queue.stats()
+    return stats["running"] / stats["workers"]
+
+
+def _threadpool_saturation() -> float:
+    if _thread_limiter is None:
+        return 0.0
+    return _thread_limiter.borrowed_tokens / max(1, _thread_limiter.total_tokens)
+
+
+ACTIVE_JOBS.set_function(lambda: job_queue.stats()["running"])
+QUEUED_JOBS.set_function(lambda: job_queue.stats()["queued"])
+JOB_POOL_SATURATION.set_function(_job_pool_saturation)
+TTS_POOL_SATURATION.set_function(_tts_saturation)
+THREADPOOL_SATURATION.set_function(_threadpool_saturation)
+AUDIO_POOL_SATURATION.set_function(_audio_pool_saturation)
+TTS_QUEUED_REQUESTS.set_function(lambda: get_scheduler().stats()["queued"])
+OUTPUT_DISK_BYTES.set_function(_output_disk_bytes)
+
+# Small enough that the browser can start decoding after the first frames.
+PREVIEW_STREAM_CHUNK_BYTES = 8 * 1024
+
+_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+
 
 def _job_download_url(job_id: str, filename: str) -> str:
     return f"/downloads/{job_id}/{filename}"
 
 
 @app.get("/api/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/cache/stats")
+def cache_stats():
+    return {"tts": tts_cache.stats(), "llm": llm_cache.stats()}
+
+
+@app.get("/api/clients/stats")
+def client_stats():
+    return get_clients().stats()
+
+
+def _load_llm_creators() -> tuple:
+    global outline_creator, chapter_creator
+    with _llm_creators_lock:
+        if outline_creator is None or chapter_creator is None:
+            from src.make_a_book.chapter_generator import ChapterCreator
+            from src.make_a_book.outline_generator import OutlineCreator
+
+            # DSPy's own response cache is disabled; llm_cache is bounded,
+            # observable and honours "regenerate".
+            anthropic_lm = get_clients().lm(
+                "anthropic/claude-haiku-4-5",
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                cache=False,
+            )
+            outline_creator = outline_creator or OutlineCreator(anthropic_lm, cache=llm_cache)
+            chapter_creator = chapter_creator or ChapterCreator(anthropic_lm, cache=llm_cache)
+    return outline_creator, chapter_creator
+
+
+async def _llm_creators() -> tuple:
+    """Return (outline_creator, chapter_creator), loading them off the event loop."""
+    if outline_creator is None or chapter_creator is None:
+        return await asyncio.to_thread(_load_llm_creators)
+    return outline_creator, chapter_creator
+
+
+def _audiobook_generator():
+    """Build a generator for one job; the first call imports the OpenAI SDK."""
+    from src.make_a_book.audiobook_generator import AudiobookGenerator
+
+    return AudiobookGenerator(cache=tts_cache, latency_model=tts_latency_model)
+
+
+def _generate_audiobook(**kwargs: object) -> tuple:
+    return _audiobook_generator().generate_audiobook(**kwargs)
+
+
+def _warm_up() -> None:
+    try:
+        import src.make_a_book.audiobook_generator  # noqa: F401
+
+        _load_llm_creators()
+    except Exception as e:
+        print(f"Warm-up failed; loading on first use instead: {e}")
+
+
 @app.post("/api/outline", response_model=OutlineResponse)
-def generate_outline(payload: OutlineRequest):
+async def generate_outline(payload: OutlineRequest):
     if not payload.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt is required")
 
     try:
-        outline = outline_creator.create_outline(
+        creator, _ = await _llm_creators()
+        outline = await creator.acreate_outline(
             payload.prompt,
             payload.target_duration_minutes,
+            regenerate=payload.regenerate,
         )
         return OutlineResponse(outline=outline)
     except Exception as exc:
@@ -137,7 +388,7 @@ def generate_outline(payload: OutlineRequest):
 
 
 @app.post("/api/outline/feedback", response_model=OutlineResponse)
-def regenerate_outline(payload: OutlineFeedbackRequest):
+async def regenerate_outline(payload: OutlineFeedbackRequest):
     if not payload.prompt.strip():
         raise HTTPException(status_code=400, detail="Prompt is required")
 
@@ -146,9 +397,11 @@ def regenerate_outline(payload: OutlineFeedbackRequest):
 
     try:
         updated_prompt = f"{payload.prompt}\n\nUser feedback: {payload.feedback}"
-        outline = outline_creator.create_outline(
+        creator, _ = await _llm_creators()
+        outline = await creator.acreate_outline(
             updated_prompt,
             payload.target_duration_minutes,
+            regenerate=payload.regenerate,
         )
         return OutlineResponse(outline=outline)
     except Exception as exc:
@@ -156,14 +409,20 @@ def regenerate_outline(payload: OutlineFeedbackRequest):
 
 
 @app.post("/api/chapters", response_model=ChapterResponse)
-def generate_chapters(payload: ChapterRequest):
+async def generate_chapters(payload: ChapterRequest):
     if not payload.outline.strip():
         raise HTTPException(status_code=400, detail="Outline is required")
 
     try:
-        chapters = chapter_creator.create_chapters(
+        _, creator = await _llm_creators()
+        if payload.per_chapter:
+            create = creator.acreate_chapters_per_chapter
+        else:
+            create = creator.acreate_chapters
+        chapters = await create(
             payload.outline,
             payload.target_duration_minutes,
+            regenerate=payload.regenerate,
         )
         if not chapters:
             raise HTTPException(status_code=500, detail="No chapters were generated")
@@ -173,6 +432,38 @@ def generate_chapters(payload: ChapterRequest):
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+@app.post("/api/chapters/stream")
+async def stream_chapters(payload: ChapterRequest):
+    """Stream chapters as NDJSON, one line per chapter as soon as it is written."""
+    if not payload.outline.strip():
+        raise HTTPException(status_code=400, detail="Outline is required")
+
+    async def lines():
+        expected = len(parse_outline_chapters(payload.outline))
+        yield json.dumps({"type": "plan", "total_chapters": expected if expected >= 2 else None}) + "\n"
+        count = 0
+        try:
+            _, creator = await _llm_creators()
+            async for index, chapter in creator.aiter_chapters(
+                payload.outline, payload.target_duration_minutes, regenerate=payload.regenerate
+            ):
+                count += 1
+                yield json.dumps({"type": "chapter", "index": index, "chapter": chapter}) + "\n"
+        except Exception as exc:
+            yield json.dumps({"type": "error", "detail": str(exc)}) + "\n"
+            return
+        if not count:
+            yield json.dumps({"type": "error", "detail": "No chapters were generated"}) + "\n"
+            return
+        yield json.dumps({"type": "done", "total_chapters": count}) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 def _extract_preview_text(text: str) -> str:
     cleaned_text = re.sub(r'#{1,6}\s*', '', text)
     paragraphs = [p.strip() for p in cleaned_text.split('\n\n') if p.strip()]
@@ -187,41 +478,121 @@ def _extract_preview_text(text: str) -> str:
     return preview_text or "This is a preview of the selected voice."
 
 
-def _update_audiobook_job(job_id: str, **updates: object) -> None:
-    with audiobook_jobs_lock:
-        job = audiobook_jobs.get(job_id)
-        if job is None:
-            return
-        job.update(updates)
+def _job_manifest(job_id: str) -> JobManifest:
+    return JobManifest(OUTPUT_ROOT / job_id / "manifest.json")
+
+
+def _job_timings(job_id: str) -> dict | None:
+    with job_state_lock:
+        trace = job_traces.get(job_id)
+    if trace is not None:
+        return trace.tree()
+    saved = read_trace(OUTPUT_ROOT / job_id / TRACE_FILENAME)
+    return timings_from_trace(saved) if saved else None
 
 
-def _run_audiobook_job(job_id: str, payload: AudiobookRequest) -> None:
-    _update_audiobook_job(job_id, status="running", started_at=time.time())
+def _submit_job(job_id: str, payload: AudiobookRequest, estimated_seconds: float | None = None,
+                deadline_at: float | None = None, force: bool = False) -> None:
+    """Queue a stored job; raises QueueFullError unless `force` is set."""
+    token = CancellationToken(deadline_at)
+    with job_state_lock:
+        job_tokens[job_id] = token
+    try:
+        job_queue.submit(
+            job_id,
+            partial(_run_audiobook_job, job_id, payload, token, time.monotonic()),
+            estimated_seconds,
+            force=force,
+        )
+    except QueueFullError:
+        with job_state_lock:
+            job_tokens.pop(job_id, None)
+        raise
+
+
+def _deadline_at(payload: AudiobookRequest) -> float | None:
+    return time.time() + payload.deadline_seconds if payload.deadline_seconds else None
+
+
+def _run_audiobook_job(job_id: str, payload: AudiobookRequest, token: CancellationToken,
+                       submitted_at: float) -> None:
+    queue_wait = time.monotonic() - submitted_at
+    trace = JobTrace("audiobook", job_id=job_id, queue_wait_seconds=round(queue_wait, 3))
+    with job_state_lock:
+        job_traces[job_id] = trace
+    try:
+        if token.cancelled:
+            _mark_cancelled(job_id, token.reason)
+            return
+        _execute_audiobook_job(job_id, payload, trace, token)
+    finally:
+        with job_state_lock:
+            job_traces.pop(job_id, None)
+            if job_tokens.get(job_id) is token:
+                del job_tokens[job_id]
+
+
+def _mark_cancelled(job_id: str, reason: str | None) -> bool:
+    """Record a cancellation unless the job already finished; returns whether it did."""
+    cancelled = job_store.update_if_status(
+        job_id, ("queued", "running"),
+        status="cancelled", error=reason, completed_at=time.time(), eta_seconds=0,
+    )
+    if cancelled:
+        job_events.publish(job_id, {"type": "result"})
+    return cancelled
+
+
+def _execute_audiobook_job(job_id: str, payload: AudiobookRequest, trace: JobTrace,
+                           token: CancellationToken) -> None:
+    job = job_store.get(job_id) or {}
+    started_at = job.get("started_at") or time.time()
+    job_store.update(job_id, status="running", error=None, started_at=started_at)
+
+    planned_chunks = 0
+    missing_chunks: list[dict] = []
 
     def progress_callback(**kwargs: object) -> None:
-        completed = 0
-        total = 0
+        # Progress is the share of this run's predicted synthesis work that is
+        # finished, and the estimate is elapsed time plus the ETA for the work
+        # left. The store batches these writes; subscribers get every event.
+        nonlocal planned_chunks
         stage = kwargs.get("stage")
-        if stage == "chapter":
-            completed = int(kwargs.get("chapter_index", 0))
-            total = int(kwargs.get("total_chapters", 0))
+        updates: dict[str, object] = {}
+        if stage == "chunk_failed":
+            # Reported with the result; the job carries on without the chunk.
+            missing_chunks.append(_missing_chunk(kwargs))
+            return
+        if stage == "plan":
+            planned_chunks = int(kwargs.get("total_chunks", 0))
+            updates = {"completed_chunks": 0, "total_chunks": planned_chunks}
         elif stage == "chunk":
-            chapter_index = int(kwargs.get("chapter_index", 0))
-            completed = max(0, chapter_index - 1)
-            with audiobook_jobs_lock:
-                total = int(audiobook_jobs.get(job_id, {}).get("total_chapters", 0))
-        progress = int(round((completed / total) * 100)) if total else 0
-        _update_audiobook_job(
-            job_id,
-            progress=progress,
-            completed_chapters=completed,
-            total_chapters=total,
-        )
+            completed = int(kwargs.get("completed_chunks", 0))
+            updates = {"completed_chunks": completed, "total_chunks": planned_chunks}
+            updates["progress"] = min(99, int(float(kwargs.get("work_fraction", 0.0)) * 100))
+        elif stage == "chapter":
+            updates = {
+                "completed_chapters": int(kwargs.get("completed_chapters", 0)),
+                "total_chapters": int(kwargs.get("total_chapters", 0)),
+            }
+        if "eta_seconds" in kwargs:
+            eta_seconds = int(kwargs["eta_seconds"])
+            job_queue.report_remaining(job_id, eta_seconds)
+            updates["eta_seconds"] = eta_seconds
+            updates["estimated_seconds"] = int(time.time() - started_at) + eta_seconds
+        if updates:
+            job_store.update(job_id, **updates)
+            job_events.publish(job_id, {
+                "type": "progress",
+                "stage": stage,
+                "chapter_index": kwargs.get("chapter_index"),
+                "elapsed_seconds": int(time.time() - started_at),
+                **updates,
+            })
 
     try:
-        audiobook_gen = AudiobookGenerator()
         job_dir = OUTPUT_ROOT / job_id
-        folder, audio_files = audiobook_gen.generate_audiobook(
+        folder, audio_files = _audiobook_generator().generate_audiobook(
             book_title=payload.title,
             outline=payload.outline,
             chapters=payload.chapters,
@@ -231,28 +602,54 @@ def _run_audiobook_job(job_id: str, payload: AudiobookRequest) -> None:
             voice_instructions=payload.instructions,
             progress_callback=progress_callback,
             output_dir=job_dir,
+            manifest=_job_manifest(job_id),
+            trace=trace,
+            cancel_token=token,
         )
-        folder_name = Path(folder).name
-        zip_path = shutil.make_archive(
-            str(job_dir / folder_name),
-            "zip",
-            root_dir=Path(folder).parent,
-            base_dir=folder_name,
-        )
-        download_url = _job_download_url(job_id, Path(zip_path).name)
-        _update_audiobook_job(
+        download_url = _job_download_url(job_id, f"{Path(folder).name}.zip")
+        _save_job_trace(job_id, trace, status="completed")
+        job_store.update(
             job_id,
             status="completed",
             progress=100,
             completed_at=time.time(),
-            result={"folder": folder, "audio_files": audio_files, "download_url": download_url},
+            result={
+                "folder": folder,
+                "audio_files": audio_files,
+                "download_url": download_url,
+                "missing_chunks": missing_chunks,
+            },
         )
+    except JobCancelled as exc:
+        _save_job_trace(job_id, trace, status="cancelled", error=str(exc))
+        _mark_cancelled(job_id, str(exc))
+        return
     except Exception as exc:
-        _update_audiobook_job(job_id, status="error", error=str(exc))
+        _save_job_trace(job_id, trace, status="error", error=str(exc))
+        job_store.update(job_id, status="error", error=str(exc))
+
+    job_events.publish(job_id, {"type": "result"})
+
+
+def _missing_chunk(kwargs: dict) -> dict:
+    return {
+        "chapter_index": int(kwargs.get("chapter_index", 0)),
+        "chunk_index": int(kwargs.get("chunk_index", 0)),
+        "error": str(kwargs.get("error", "")),
+    }
+
+
+def _save_job_trace(job_id: str, trace: JobTrace, **attrs: object) -> None:
+    """Close the job span and write the Chrome trace next to the job output."""
+    trace.finish(**attrs)
+    try:
+        trace.write(OUTPUT_ROOT / job_id / TRACE_FILENAME)
+    except OSError as e:
+        print(f"Could not write trace for job {job_id}: {e}")
 
 
 @app.post("/api/voice/preview")
-def voice_preview(payload: VoicePreviewRequest, background_tasks: BackgroundTasks):
+async def voice_preview(payload: VoicePreviewRequest):
     if not payload.text.strip():
         raise HTTPException(status_code=400, detail="Preview text is required")
 
@@ -261,31 +658,42 @@ def voice_preview(payload: VoicePreviewRequest, background_tasks: BackgroundTask
 
     preview_text = _extract_preview_text(payload.text)
 
+    # The client is shared; the stack only owns (and closes) this response.
+    stack = AsyncExitStack()
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        client = get_clients().async_openai()
         api_params = {
             "model": "gpt-4o-mini-tts",
             "voice": payload.voice,
             "input": preview_text,
             "speed": payload.speed,
+            "response_format": "mp3",
         }
         if payload.instructions and payload.instructions.strip():
             api_params["instructions"] = payload.instructions
 
-        response = client.audio.speech.create(**api_params)
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
-            response.stream_to_file(temp_file.name)
-            temp_path = temp_file.name
-
-        background_tasks.add_task(os.unlink, temp_path)
-        return FileResponse(temp_path, media_type="audio/mpeg", filename="preview.mp3")
+        # Open the upstream response before returning so errors still map to a 500.
+        response = await stack.enter_async_context(
+            client.audio.speech.with_streaming_response.create(**api_params)
+        )
     except Exception as exc:
+        await stack.aclose()
         raise HTTPException(status_code=500, detail=str(exc))
 
+    async def stream_audio():
+        async with stack:
+            async for chunk in response.iter_bytes(PREVIEW_STREAM_CHUNK_BYTES):
+                yield chunk
+
+    return StreamingResponse(
+        stream_audio(),
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": 'inline; filename="preview.mp3"'},
+    )
+
 
 @app.post("/api/audiobook/start", response_model=AudiobookJobResponse)
-def start_audiobook_job(payload: AudiobookRequest, background_tasks: BackgroundTasks):
+def start_audiobook_job(payload: AudiobookRequest):
     if not payload.chapters:
         raise HTTPException(status_code=400, detail="Chapters are required")
 
@@ -294,37 +702,116 @@ def start_audiobook_job(payload: AudiobookRequest, background_tasks: BackgroundT
 
     job_id = uuid.uuid4().hex
     total_chapters = len(payload.chapters)
-    text_for_estimate = " ".join(payload.chapters)
-    if payload.include_outline:
-        text_for_estimate = f"{payload.outline} {text_for_estimate}"
-    word_count = count_words(text_for_estimate)
-    estimated_seconds = estimate_tts_seconds(word_count, payload.speed)
-
-    with audiobook_jobs_lock:
-        audiobook_jobs[job_id] = {
-            "status": "queued",
-            "progress": 0,
-            "completed_chapters": 0,
-            "total_chapters": total_chapters,
-            "estimated_seconds": estimated_seconds,
-            "started_at": None,
-            "completed_at": None,
-            "result": None,
-            "error": None,
-        }
+    estimated_seconds = _estimate_job_seconds(payload)
+
+    deadline_at = _deadline_at(payload)
+
+    job_store.create(
+        job_id,
+        status="queued",
+        progress=0,
+        completed_chapters=0,
+        total_chapters=total_chapters,
+        estimated_seconds=estimated_seconds,
+        deadline_at=deadline_at,
+        started_at=None,
+        completed_at=None,
+        result=None,
+        error=None,
+    )
+    _job_manifest(job_id).save_request(payload.model_dump())
 
-    background_tasks.add_task(_run_audiobook_job, job_id, payload)
-    return AudiobookJobResponse(job_id=job_id, total_chapters=total_chapters)
+    try:
+        _submit_job(job_id, payload, estimated_seconds, deadline_at)
+    except QueueFullError as exc:
+        job_store.delete(job_id)
+        raise _queue_full(exc)
+    return _job_response(job_id, total_chapters)
 
 
-@app.get("/api/audiobook/status/{job_id}", response_model=AudiobookStatusResponse)
-def audiobook_job_status(job_id: str):
-    with audiobook_jobs_lock:
-        job = audiobook_jobs.get(job_id)
+def _queue_full(exc: QueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many audiobooks are queued; try again shortly",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _job_response(job_id: str, total_chapters: int) -> AudiobookJobResponse:
+    queued = job_queue.position(job_id)
+    return AudiobookJobResponse(
+        job_id=job_id,
+        total_chapters=total_chapters,
+        queue_position=queued[0] if queued else None,
+        estimated_start_seconds=round(queued[1]) if queued else None,
+    )
+
+
+def _estimate_job_seconds(payload: AudiobookRequest) -> int:
+    from src.make_a_book.audiobook_generator import DEFAULT_VOICE_INSTRUCTIONS
+
+    texts = ([payload.outline] if payload.include_outline else []) + payload.chapters
+    chunk_lengths = [len(chunk) for text in texts for chunk in chunk_text(text)]
+    return tts_latency_model.estimate_seconds(
+        chunk_lengths,
+        payload.speed,
+        len(payload.instructions or DEFAULT_VOICE_INSTRUCTIONS),
+        payload.voice,
+        get_scheduler().max_concurrency,
+    )
+
 
+def _load_job_request(job_id: str) -> AudiobookRequest | None:
+    request = _job_manifest(job_id).request
+    return AudiobookRequest(**request) if request else None
+
+
+@app.post("/api/audiobook/resume/{job_id}", response_model=AudiobookJobResponse)
+def resume_audiobook_job(job_id: str):
+    job = job_store.get(job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Audiobook job not found")
 
+    if job_id in job_queue:
+        raise HTTPException(status_code=409, detail="Audiobook job is already queued or running")
+    # Queued or running jobs missing from this process's queue were left by a
+    # previous one; a completed job is resumable only to fill in missing chunks.
+    incomplete = job["status"] == "completed" and (job.get("result") or {}).get("missing_chunks")
+    if job["status"] not in RESUMABLE_JOB_STATUSES | {"queued", "running"} and not incomplete:
+        raise HTTPException(status_code=409, detail=f"Audiobook job is {job['status']} and cannot be resumed")
+
+    payload = _load_job_request(job_id)
+    if payload is None:
+        raise HTTPException(status_code=409, detail="Audiobook job has no checkpoint to resume from")
+
+    deadline_at = _deadline_at(payload)
+    job_store.update(job_id, status="queued", error=None, completed_at=None, deadline_at=deadline_at)
+    try:
+        _submit_job(job_id, payload, job.get("eta_seconds") or job.get("estimated_seconds"), deadline_at)
+    except QueueFullError as exc:
+        job_store.update(
+            job_id, status=job["status"], error=job.get("error"),
+            completed_at=job.get("completed_at"), deadline_at=job.get("deadline_at"),
+        )
+        raise _queue_full(exc)
+    return _job_response(job_id, len(payload.chapters))
+
+
+def _resume_interrupted_jobs() -> None:
+    """Restart jobs a previous process left queued or running."""
+    for job_id, job in job_store.list_by_status("queued", "running"):
+        payload = _load_job_request(job_id)
+        if payload is None:
+            job_store.update(job_id, status="error", error="Job was interrupted by a server restart")
+            continue
+        # These were admitted before the restart, so they bypass the depth limit.
+        _submit_job(
+            job_id, payload, job.get("eta_seconds") or job.get("estimated_seconds"),
+            job.get("deadline_at"), force=True,
+        )
+
+
+def _job_status(job_id: str, job: dict, timings: dict | None = None) -> AudiobookStatusResponse:
     elapsed_seconds = None
     estimated_seconds = job.get("estimated_seconds")
     if job.get("started_at"):
@@ -332,31 +819,112 @@ def audiobook_job_status(job_id: str):
         elapsed_seconds = int(max(0, end_time - job["started_at"]))
 
     progress = job.get("progress", 0)
-    if job.get("status") == "running" and estimated_seconds:
-        progress = min(99, int(round((elapsed_seconds or 0) / estimated_seconds * 100)))
     if job.get("status") == "completed":
         progress = 100
+    if job.get("status") in TERMINAL_JOB_STATUSES:
+        job["eta_seconds"] = 0
 
-    response = dict(job)
+    response = job
     response["progress"] = progress
     response["elapsed_seconds"] = elapsed_seconds
     response["estimated_seconds"] = estimated_seconds
+    response["timings"] = timings
+    if job.get("status") == "queued":
+        queued = job_queue.position(job_id)
+        if queued:
+            response["queue_position"] = queued[0]
+            response["estimated_start_seconds"] = round(queued[1])
     return AudiobookStatusResponse(**response)
 
 
+@app.get("/api/audiobook/status/{job_id}", response_model=AudiobookStatusResponse)
+def audiobook_job_status(job_id: str, timings: bool = False):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Audiobook job not found")
+
+    return _job_status(job_id, job, _job_timings(job_id) if timings else None)
+
+
+@app.delete("/api/audiobook/{job_id}", response_model=AudiobookStatusResponse)
+def cancel_audiobook_job(job_id: str):
+    """Cancel a queued or running job; running jobs stop within a second or so."""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Audiobook job not found")
+    if job["status"] in TERMINAL_JOB_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Audiobook job is already {job['status']}")
+
+    with job_state_lock:
+        token = job_tokens.get(job_id)
+    if token is not None:
+        token.cancel("Cancelled by user")
+    # A running job's worker records the cancellation itself once it sees the
+    # token. Only jobs no worker will pick up are marked here: those dropped
+    # from the queue, and ones a previous process left queued or running. A
+    # job that finished in the meantime keeps its final status.
+    if job_queue.cancel(job_id) or job_id not in job_queue:
+        _mark_cancelled(job_id, "Cancelled by user")
+    return _job_status(job_id, job_store.get(job_id))
+
+
+def _sse_message(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@app.get("/api/audiobook/events/{job_id}")
+async def audiobook_job_events(job_id: str):
+    if job_store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Audiobook job not found")
+
+    async def stream():
+        # Subscribe before reading the snapshot so no event falls in between.
+        queue = job_events.subscribe(job_id)
+        try:
+            job = job_store.get(job_id)
+            yield _sse_message("status", _job_status(job_id, job).model_dump_json())
+            while job["status"] not in TERMINAL_JOB_STATUSES:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event["type"] == "result":
+                    job = job_store.get(job_id)
+                    break
+                yield _sse_message("progress", json.dumps(event))
+            yield _sse_message("result", _job_status(job_id, job).model_dump_json())
+        finally:
+            job_events.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/api/audiobook", response_model=AudiobookResponse)
-def generate_audiobook(payload: AudiobookRequest):
+async def generate_audiobook(payload: AudiobookRequest):
     if not payload.chapters:
         raise HTTPException(status_code=400, detail="Chapters are required")
 
     if not os.getenv("OPENAI_API_KEY"):
         raise HTTPException(status_code=400, detail="OPENAI_API_KEY is not configured")
 
+    token = CancellationToken(_deadline_at(payload))
+    missing_chunks: list[dict] = []
+
+    def progress_callback(**kwargs: object) -> None:
+        if kwargs.get("stage") == "chunk_failed":
+            missing_chunks.append(_missing_chunk(kwargs))
+
     try:
-        audiobook_gen = AudiobookGenerator()
         job_id = uuid.uuid4().hex
         job_dir = OUTPUT_ROOT / job_id
-        folder, audio_files = audiobook_gen.generate_audiobook(
+        # The generator is built on the job's worker thread, not the event loop.
+        generate = partial(
+            _generate_audiobook,
             book_title=payload.title,
             outline=payload.outline,
             chapters=payload.chapters,
@@ -365,21 +933,71 @@ def generate_audiobook(payload: AudiobookRequest):
             include_outline=payload.include_outline,
             voice_instructions=payload.instructions,
             output_dir=job_dir,
+            progress_callback=progress_callback,
+            cancel_token=token,
         )
-        folder_name = Path(folder).name
-        zip_path = shutil.make_archive(
-            str(job_dir / folder_name),
-            "zip",
-            root_dir=Path(folder).parent,
-            base_dir=folder_name,
+        # Blocking requests take a place in the job queue like any other job.
+        future = job_queue.submit(job_id, generate, _estimate_job_seconds(payload))
+        try:
+            folder, audio_files = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # The client went away; stop synthesizing for it.
+            token.cancel("Client disconnected")
+            job_queue.cancel(job_id)
+            raise
+        download_url = _job_download_url(job_id, f"{Path(folder).name}.zip")
+        return AudiobookResponse(
+            folder=folder,
+            audio_files=audio_files,
+            download_url=download_url,
+            missing_chunks=missing_chunks,
         )
-        download_url = _job_download_url(job_id, Path(zip_path).name)
-        return AudiobookResponse(folder=folder, audio_files=audio_files, download_url=download_url)
+    except QueueFullError as exc:
+        raise _queue_full(exc)
+    except JobCancelled as exc:
+        raise HTTPException(status_code=504, detail=str(exc))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
-app.mount("/downloads", StaticFiles(directory=OUTPUT_ROOT), name="downloads")
+@app.get("/downloads/{job_id}/{folder_name}.zip")
+def download_audiobook_zip(job_id: str, folder_name: str):
+    # Archives are built on the fly from the book folder, so no zip is stored.
+    job_dir = (OUTPUT_ROOT / job_id).resolve()
+    book_folder = (job_dir / folder_name).resolve()
+    if not _JOB_ID_RE.fullmatch(job_id) or book_folder.parent != job_dir:
+        raise HTTPException(status_code=404, detail="Download not found")
+    if not book_folder.is_dir():
+        raise HTTPException(status_code=404, detail="Download not found")
+
+    def timed_zip():
+        started_at = time.time()
+        size = 0
+        with ZIP_SECONDS.time():
+            for data in iter_book_zip(book_folder):
+                size += len(data)
+                yield data
+        append_span(job_dir / TRACE_FILENAME, "zip", started_at, time.time(), bytes=size)
+
+    return StreamingResponse(
+        timed_zip(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{folder_name}.zip"'},
+    )
+
+
+@app.get("/downloads/{job_id}/{file_path:path}")
+def download_job_file(job_id: str, file_path: str):
+    # Only files inside job folders are served; job state and caches that
+    # share OUTPUT_ROOT stay private.
+    job_dir = (OUTPUT_ROOT / job_id).resolve()
+    target = (job_dir / file_path).resolve()
+    if not _JOB_ID_RE.fullmatch(job_id) or not target.is_relative_to(job_dir):
+        raise HTTPException(status_code=404, detail="Download not found")
+    if not target.is_file():
+        raise HTTPException(status_code=404, detail="Download not found")
+    return FileResponse(target)
+
 
 frontend_dist = Path(__file__).resolve().parent / "frontend" / "dist"
 if frontend_dist.is_dir():
@@ -1,9 +1,12 @@
 import streamlit as st
 import os
 import time
+from pathlib import Path
 from src.make_a_book.outline_generator import OutlineCreator
 from src.make_a_book.chapter_generator import ChapterCreator
 from src.make_a_book.audiobook_generator import AudiobookGenerator
+from src.make_a_book.clients import get_clients
+from src.make_a_book.llm_cache import LLMResponseCache
 from src.make_a_book.tts_time_estimator import (
     count_words,
     estimate_tts_seconds,
@@ -17,6 +20,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Reruns recreate this object, but its disk tier survives them.
+llm_cache = LLMResponseCache(Path(os.getenv("BOOK_OUTPUT_DIR", "/tmp/book_foundry_outputs")) / "llm_cache")
+
 # Initialize session state
 if 'outline' not in st.session_state:
     st.session_state.outline = None
@@ -116,7 +122,7 @@ def main():
             st.session_state.target_duration_minutes = int(target_duration_minutes)
             
             with st.spinner("Generating outline..."):
-                outline_generator = OutlineCreator()
+                outline_generator = OutlineCreator(cache=llm_cache)
                 outline = outline_generator.create_outline(
                     prompt,
                     st.session_state.target_duration_minutes
@@ -163,10 +169,11 @@ def main():
                 if feedback:
                     updated_prompt = f"{prompt}\n\nUser feedback: {feedback}"
                     with st.spinner("Updating outline..."):
-                        outline_generator = OutlineCreator()
+                        outline_generator = OutlineCreator(cache=llm_cache)
                         outline = outline_generator.create_outline(
                             updated_prompt,
-                            st.session_state.target_duration_minutes
+                            st.session_state.target_duration_minutes,
+                            regenerate=True
                         )
                         st.session_state.outline = outline
                         st.rerun()
@@ -182,20 +189,20 @@ def main():
                 if st.button("🚀 Generate Full Book", type="primary"):
                     with st.spinner("Generating chapters... This may take a few minutes."):
                         # Create chapter generator
-                        outline_generator = OutlineCreator()
+                        outline_generator = OutlineCreator(cache=llm_cache)
                         # Create chapter generator using the same LM configuration
-                        import dspy
-                        anthropic_lm = dspy.LM(
-                            model="anthropic/claude-sonnet-4-5-20250929",
-                            api_key=os.getenv("ANTHROPIC_API_KEY")
+                        anthropic_lm = get_clients().lm(
+                            "anthropic/claude-sonnet-4-5-20250929",
+                            api_key=os.getenv("ANTHROPIC_API_KEY"),
+                            cache=False
                         )
-                        chapter_generator = ChapterCreator(anthropic_lm)
+                        chapter_generator = ChapterCreator(anthropic_lm, cache=llm_cache)
                         
                         # Generate chapters with progress
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         status_text.text("Generating chapters...")
-                        chapters = chapter_generator.create_chapters(
+                        chapters = chapter_generator.create_chapters_per_chapter(
                             st.session_state.outline,
                             st.session_state.target_duration_minutes
                         )
@@ -427,7 +434,6 @@ def main():
             else:
                 with st.spinner("Generating voice preview..."):
                     try:
-                        from openai import OpenAI
                         import tempfile
                         import re
                         
@@ -446,7 +452,7 @@ def main():
                             preview_text = '. '.join(sentences[:3]) + '.'
                         
                         # Generate audio with instructions
-                        client = OpenAI(api_key=openai_key)
+                        client = get_clients().openai(openai_key)
                         
                         # Prepare API parameters
                         api_params = {
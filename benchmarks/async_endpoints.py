@@ -0,0 +1,115 @@
+"""Load test: sync vs async handling of slow LLM calls in api.py.
+
+Runs the real FastAPI app in-process with the outline creator replaced by a
+stub that waits `--latency` seconds (blocking in the sync path, awaiting in the
+async path). For each mode it fires `--requests` concurrent outline requests
+while probing /api/health, then reports wall time, request latency
+percentiles, and health-check latency.
+
+    python benchmarks/async_endpoints.py --requests 200 --latency 1.0
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("BOOK_OUTPUT_DIR", tempfile.mkdtemp(prefix="book_foundry_bench_"))
+
+import httpx  # noqa: E402
+
+import api  # noqa: E402
+
+
+class _SlowOutlineCreator:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def create_outline(self, prompt: str, target_duration_minutes: int, regenerate: bool = False) -> str:
+        time.sleep(self.latency)
+        return "Chapter 1: Benchmark"
+
+    async def acreate_outline(self, prompt: str, target_duration_minutes: int,
+                              regenerate: bool = False) -> str:
+        await asyncio.sleep(self.latency)
+        return "Chapter 1: Benchmark"
+
+
+@api.app.post("/bench/sync-outline", response_model=api.OutlineResponse)
+def _sync_outline(payload: api.OutlineRequest):
+    # Mirrors the previous sync handler: the LM call holds a threadpool worker.
+    outline = api.outline_creator.create_outline(payload.prompt, payload.target_duration_minutes)
+    return api.OutlineResponse(outline=outline)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(path: str, requests: int) -> dict:
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        payload = {"title": "Bench", "prompt": "A benchmark book", "target_duration_minutes": 5}
+        done = asyncio.Event()
+        health_latencies: list[float] = []
+
+        async def probe_health():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/health")
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.05)
+
+        async def one_request() -> float:
+            start = time.perf_counter()
+            response = await client.post(path, json=payload)
+            response.raise_for_status()
+            return time.perf_counter() - start
+
+        prober = asyncio.create_task(probe_health())
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one_request() for _ in range(requests)))
+        wall = time.perf_counter() - start
+        done.set()
+        await prober
+
+    return {
+        "wall_seconds": wall,
+        "throughput_rps": requests / wall,
+        "p50": statistics.median(latencies),
+        "p95": _percentile(latencies, 95),
+        "health_p95": _percentile(health_latencies, 95),
+        "health_max": max(health_latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=1.0, help="simulated LM latency in seconds")
+    args = parser.parse_args()
+
+    api.outline_creator = _SlowOutlineCreator(args.latency)
+    # Unused here, but a missing creator makes the first request import dspy
+    # and build the LMs inside the timed pass.
+    api.chapter_creator = object()
+
+    print(f"{args.requests} concurrent outline requests, {args.latency:.2f}s simulated LM latency")
+    print(f"{'mode':<6} {'wall s':>8} {'req/s':>8} {'p50 s':>8} {'p95 s':>8} {'health p95':>11} {'health max':>11}")
+    for mode, path in (("sync", "/bench/sync-outline"), ("async", "/api/outline")):
+        result = asyncio.run(_run(path, args.requests))
+        print(
+            f"{mode:<6} {result['wall_seconds']:>8.2f} {result['throughput_rps']:>8.1f} "
+            f"{result['p50']:>8.2f} {result['p95']:>8.2f} "
+            f"{result['health_p95']:>11.3f} {result['health_max']:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Local stand-in for the OpenAI speech and Anthropic messages APIs.
+
+Serves `POST /v1/audio/speech` (silent but valid MP3, sized to the input's
+spoken length) and `POST /v1/messages` (completions in DSPy's
+`[[ ## field ## ]]` format, so outline and chapter predictors parse them).
+Latency, failures and 429s are injected per request. Point the app at it with:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 ANTHROPIC_BASE_URL=http://127.0.0.1:8100
+
+    python benchmarks/fake_upstream.py --port 8100 --llm-latency 2.0 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, Response  # noqa: E402
+
+from src.make_a_book.mp3_concat import parse_frame_header, silent_frame  # noqa: E402
+
+# MPEG-2 Layer III, 24 kHz, mono, 32 kbps.
+MP3_HEADER = parse_frame_header(bytes([0xFF, 0xF3, 0x44, 0xC0]))
+SPOKEN_WORDS_PER_SECOND = 2.5
+
+_OUTPUT_FIELDS_RE = re.compile(r"Your output fields are:\n(.*?)\nAll interactions", re.DOTALL)
+_FIELD_RE = re.compile(r"^\d+\. `(\w+)` \(([^)]*)\)", re.MULTILINE)
+_CHAPTER_LINE_RE = re.compile(r"^\s*(?:#+\s*)?chapter\s+\d+", re.IGNORECASE | re.MULTILINE)
+_WORDS = (
+    "the lighthouse keeper climbed slowly while gulls circled above the quiet harbor and "
+    "every lantern in town flickered as the tide rolled gently against old stones"
+).split()
+
+
+class Latency(NamedTuple):
+    """Per-request delay: `base` seconds plus `per_unit` per input unit, log-normally jittered."""
+    base: float
+    per_unit: float = 0.0
+    jitter: float = 0.0
+
+    def sample(self, rng: random.Random, units: int = 0) -> float:
+        mean = self.base + self.per_unit * units
+        if self.jitter <= 0 or mean <= 0:
+            return mean
+        # Log-normal with the requested mean; `jitter` is the sigma of log(delay).
+        return mean * rng.lognormvariate(-self.jitter ** 2 / 2, self.jitter)
+
+
+class FaultProfile(NamedTuple):
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+
+
+class FakeUpstream:
+    def __init__(self, llm_latency: Latency, tts_latency: Latency, faults: FaultProfile,
+                 outline_chapters: int = 4, chapter_words: int = 400, seed: int | None = None):
+        self.llm_latency = llm_latency
+        self.tts_latency = tts_latency
+        self.faults = faults
+        self.outline_chapters = outline_chapters
+        self.chapter_words = chapter_words
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts: Counter[str] = Counter()
+
+    def _roll(self) -> tuple[str | None, float]:
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.faults.rate_limit_rate:
+            return "rate_limit", self.faults.retry_after_seconds
+        if roll < self.faults.rate_limit_rate + self.faults.error_rate:
+            return "error", 0.0
+        return None, 0.0
+
+    def _delay(self, latency: Latency, units: int) -> float:
+        with self._lock:
+            return latency.sample(self._rng, units)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _text(self, words: int) -> str:
+        with self._lock:
+            tokens = [self._rng.choice(_WORDS) for _ in range(max(1, words))]
+        sentences = [" ".join(tokens[i:i + 12]).capitalize() + "." for i in range(0, len(tokens), 12)]
+        return " ".join(sentences)
+
+    def speech_mp3(self, text: str) -> bytes:
+        seconds = len(text.split()) / SPOKEN_WORDS_PER_SECOND
+        frames = max(1, round(seconds * MP3_HEADER.sample_rate / MP3_HEADER.samples_per_frame))
+        return silent_frame(MP3_HEADER) * frames
+
+    def completion(self, system: str, prompt: str) -> str:
+        """Answer a DSPy ChatAdapter prompt with plausible values for each output field."""
+        section = _OUTPUT_FIELDS_RE.search(system)
+        fields = _FIELD_RE.findall(section.group(1)) if section else [("answer", "str")]
+        parts = []
+        for name, type_name in fields:
+            if name == "outline":
+                value = "\n\n".join(
+                    f"## Chapter {number}: {self._text(3).rstrip('.')}\n{self._text(25)}"
+                    for number in range(1, self.outline_chapters + 1)
+                )
+            elif type_name.startswith("list"):
+                count = len(_CHAPTER_LINE_RE.findall(prompt)) or self.outline_chapters
+                value = json.dumps([self._text(self.chapter_words) for _ in range(count)])
+            elif type_name == "int":
+                value = "1"
+            else:
+                value = self._text(self.chapter_words)
+            parts.append(f"[[ ## {name} ## ]]\n{value}")
+        parts.append("[[ ## completed ## ]]")
+        return "\n\n".join(parts)
+
+
+def _message_text(content) -> str:
+    if isinstance(content, str):
+        return content
+    return "\n".join(block.get("text", "") for block in content if isinstance(block, dict))
+
+
+def create_app(upstream: FakeUpstream) -> FastAPI:
+    app = FastAPI(title="Fake upstream")
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        body = await request.json()
+        text = str(body.get("input", ""))
+        await asyncio.sleep(upstream._delay(upstream.tts_latency, len(text)))
+        fault, retry_after = upstream._roll()
+        if fault == "rate_limit":
+            upstream._count("speech_429")
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                status_code=429, headers={"retry-after": f"{retry_after:g}"},
+            )
+        if fault == "error":
+            upstream._count("speech_500")
+            return JSONResponse(
+                {"error": {"message": "Injected server error", "type": "server_error", "code": None}},
+                status_code=500,
+            )
+        upstream._count("speech_ok")
+        return Response(upstream.speech_mp3(text), media_type="audio/mpeg")
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        system = _message_text(body.get("system", ""))
+        prompt = "\n".join(_message_text(message.get("content", "")) for message in body.get("messages", []))
+        for message in body.get("messages", []):
+            if message.get("role") == "system":
+                system += _message_text(message.get("content", ""))
+        text = upstream.completion(system, prompt)
+        await asyncio.sleep(upstream._delay(upstream.llm_latency, len(text.split())))
+        fault, retry_after = upstream._roll()
+        if fault == "rate_limit":
+            upstream._count("messages_429")
+            return JSONResponse(
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "Injected rate limit"}},
+                status_code=429, headers={"retry-after": f"{retry_after:g}"},
+            )
+        if fault == "error":
+            upstream._count("messages_500")
+            return JSONResponse(
+                {"type": "error", "error": {"type": "api_error", "message": "Injected server error"}},
+                status_code=500,
+            )
+        upstream._count("messages_ok")
+        return {
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "fake"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len((system + prompt).split()), "output_tokens": len(text.split())},
+        }
+
+    @app.get("/fake/stats")
+    def stats():
+        with upstream._lock:
+            return {"counts": dict(upstream.counts), "at": time.time()}
+
+    return app
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="base seconds per LLM call")
+    parser.add_argument("--llm-latency-per-word", type=float, default=0.002)
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="base seconds per speech call")
+    parser.add_argument("--tts-latency-per-char", type=float, default=0.0005)
+    parser.add_argument("--jitter", type=float, default=0.3, help="log-normal sigma; 0 for fixed delays")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--outline-chapters", type=int, default=4)
+    parser.add_argument("--chapter-words", type=int, default=400)
+    parser.add_argument("--seed", type=int)
+
+
+def upstream_from_args(args: argparse.Namespace) -> FakeUpstream:
+    return FakeUpstream(
+        llm_latency=Latency(args.llm_latency, args.llm_latency_per_word, args.jitter),
+        tts_latency=Latency(args.tts_latency, args.tts_latency_per_char, args.jitter),
+        faults=FaultProfile(args.error_rate, args.rate_limit_rate, args.retry_after),
+        outline_chapters=args.outline_chapters,
+        chapter_words=args.chapter_words,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    add_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(upstream_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
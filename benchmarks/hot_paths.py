@@ -0,0 +1,270 @@
+"""Offline benchmarks for the text and audio hot paths.
+
+Builds deterministic synthetic books (1k to 500k words by default) and
+synthetic MP3 chunks, then times each path, measures its peak Python memory
+with tracemalloc, and fits a scaling exponent across book sizes (1.0 means
+linear). Results can be saved as a baseline and later runs compared with it:
+
+    python benchmarks/hot_paths.py --save-baseline
+    python benchmarks/hot_paths.py --check          # exit 1 on regressions
+
+Audio benchmarks write about 4 KB of MP3 per second of speech, so they only
+run for books up to --audio-max-words.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-offline")
+
+from src.make_a_book.audiobook_generator import AudiobookGenerator  # noqa: E402
+from src.make_a_book.book_archive import iter_book_zip  # noqa: E402
+from src.make_a_book.mp3_concat import parse_frame_header  # noqa: E402
+from src.make_a_book.tts_time_estimator import count_words, estimate_tts_seconds  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 50_000, 100_000, 500_000)
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "hot_paths.json"
+WORDS_PER_CHAPTER = 5_000
+SPOKEN_WORDS_PER_SECOND = 2.5
+
+# MPEG-2 Layer III, 24 kHz, mono, 32 kbps: 96-byte frames of 24 ms each.
+MP3_HEADER = bytes([0xFF, 0xF3, 0x44, 0xC0])
+
+_VOCABULARY = (
+    "the a lantern harbor fox whispered quietly across under bright morning river "
+    "children remembered stories of old ships and silver maps that nobody could "
+    "read until the storm finally passed over our little village near the sea"
+).split()
+
+
+class Case(NamedTuple):
+    run: Callable[[], object]
+    units: float
+    unit: str
+
+
+def synthetic_chapters(words: int, seed: int = 0) -> list[str]:
+    """Markdown chapters totalling `words` words with varied punctuation."""
+    rng = random.Random(seed or words)
+    chapters = []
+    remaining = words
+    while remaining > 0:
+        target = min(WORDS_PER_CHAPTER, remaining)
+        remaining -= target
+        sentences = [f"## Scene {len(chapters) + 1}\n"]
+        written = 0
+        while written < target:
+            length = min(rng.randint(5, 25), target - written)
+            tokens = [rng.choice(_VOCABULARY) for _ in range(length)]
+            if length > 8 and rng.random() < 0.4:
+                tokens[length // 2] += ","
+            if rng.random() < 0.1:
+                tokens[0] = f"**{tokens[0]}**"
+            sentence = " ".join(tokens).capitalize() + rng.choice(".....?!")
+            if rng.random() < 0.08:
+                sentence += "\n\n"
+            sentences.append(sentence)
+            written += length
+        chapters.append(" ".join(sentences))
+    return chapters
+
+
+def write_mp3(path: Path, seconds: float, rng: random.Random) -> None:
+    header = parse_frame_header(MP3_HEADER)
+    frames = max(1, round(seconds * header.sample_rate / header.samples_per_frame))
+    body = rng.randbytes(header.frame_length - 4)
+    with open(path, "wb") as handle:
+        for _ in range(frames):
+            handle.write(MP3_HEADER + body)
+
+
+def _folder_bytes(folder: Path) -> int:
+    return sum(path.stat().st_size for path in folder.rglob("*") if path.is_file())
+
+
+def prepare(name: str, words: int, workdir: Path, generator: AudiobookGenerator) -> Case:
+    chapters = synthetic_chapters(words)
+    text = "\n\n".join(chapters)
+
+    if name == "clean_text_for_speech":
+        return Case(lambda: generator.clean_text_for_speech(text), words, "words")
+    if name == "chunk_text":
+        return Case(lambda: [generator.chunk_text(chapter) for chapter in chapters], words, "words")
+    if name == "estimate_tts":
+        return Case(lambda: estimate_tts_seconds(count_words(text)), words, "words")
+    if name == "save_text_content":
+        folder = generator.create_book_folder("Benchmark Book", output_dir=workdir)
+        return Case(
+            lambda: generator.save_text_content("Benchmark Book", "Outline", chapters, folder),
+            words, "words",
+        )
+
+    rng = random.Random(words)
+    folder = generator.create_book_folder("Benchmark Book", output_dir=workdir)
+    jobs = []
+    for number, chapter in enumerate(chapters, 1):
+        chunks = []
+        for index, chunk in enumerate(generator.chunk_text(chapter), 1):
+            path = folder / "audio" / f"chapter_{number:02d}_part_{index:02d}.mp3"
+            write_mp3(path, count_words(chunk) / SPOKEN_WORDS_PER_SECOND, rng)
+            chunks.append(path)
+        jobs.append((chunks, folder / "audio" / f"chapter_{number:02d}.mp3"))
+
+    if name == "combine_audio_files":
+        total = sum(path.stat().st_size for chunks, _ in jobs for path in chunks)
+
+        def combine():
+            for chunks, output in jobs:
+                generator._combine_audio_files(chunks, output)
+
+        return Case(combine, total, "bytes")
+
+    if name == "zip_book":
+        generator.save_text_content("Benchmark Book", "Outline", chapters, folder)
+        for chunks, output in jobs:
+            generator._combine_audio_files(chunks, output)
+            for path in chunks:
+                path.unlink()
+
+        def package():
+            for _ in iter_book_zip(folder):
+                pass
+
+        return Case(package, _folder_bytes(folder), "bytes")
+
+    raise ValueError(f"unknown benchmark {name}")
+
+
+TEXT_BENCHMARKS = ("clean_text_for_speech", "chunk_text", "estimate_tts", "save_text_content")
+AUDIO_BENCHMARKS = ("combine_audio_files", "zip_book")
+
+
+def measure(case: Case, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    case.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        "seconds": seconds,
+        "throughput": case.units / seconds if seconds else float("inf"),
+        "unit": case.unit,
+        "peak_bytes": peak,
+    }
+
+
+def scaling_exponent(points: list[tuple[int, float]]) -> float | None:
+    """Least-squares slope of log(seconds) against log(words)."""
+    points = [(size, seconds) for size, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    if not denominator:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+
+
+def _format_throughput(value: float, unit: str) -> str:
+    if unit == "bytes":
+        return f"{value / 1e6:,.1f} MB/s"
+    return f"{value:,.0f} words/s"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated book sizes in words")
+    parser.add_argument("--audio-max-words", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="comma-separated benchmark names")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any result regresses")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown or memory growth over the baseline")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    names = TEXT_BENCHMARKS + AUDIO_BENCHMARKS
+    if args.only:
+        names = tuple(name for name in names if name in args.only.split(","))
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    generator = AudiobookGenerator()
+    results: dict[str, dict[str, dict]] = {}
+    regressions = []
+
+    print(f"{'benchmark':<22} {'words':>8} {'seconds':>9} {'throughput':>16} {'peak MiB':>9} {'vs base':>8}")
+    for name in names:
+        results[name] = {}
+        for words in sizes:
+            if name in AUDIO_BENCHMARKS and words > args.audio_max_words:
+                continue
+            workdir = Path(tempfile.mkdtemp(prefix="book_foundry_bench_"))
+            try:
+                result = measure(prepare(name, words, workdir, generator), args.repeat)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+            results[name][str(words)] = result
+
+            compared = ""
+            base = baseline.get(name, {}).get(str(words))
+            if base:
+                ratio = result["seconds"] / base["seconds"]
+                compared = f"{ratio:.2f}x"
+                grew = result["peak_bytes"] > base["peak_bytes"] * (1 + args.tolerance)
+                if ratio > 1 + args.tolerance or grew:
+                    compared += " !"
+                    regressions.append(f"{name} @ {words} words")
+            print(
+                f"{name:<22} {words:>8} {result['seconds']:>9.4f} "
+                f"{_format_throughput(result['throughput'], result['unit']):>16} "
+                f"{result['peak_bytes'] / 2**20:>9.1f} {compared:>8}"
+            )
+
+        exponent = scaling_exponent([(int(size), r["seconds"]) for size, r in results[name].items()])
+        if exponent is not None:
+            print(f"{'':<22} scaling ~ n^{exponent:.2f}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        args.baseline.write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions:
+        print("Regressions over baseline (+{:.0%}): {}".format(args.tolerance, ", ".join(regressions)))
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""End-to-end load test of api.py against the fake upstream servers.
+
+Starts benchmarks/fake_upstream.py and the API (uvicorn) as subprocesses
+wired to each other, unless --api-url points at a running API. Then N
+simulated users each request an outline, generate chapters, start an
+audiobook job and poll it to completion. Reports per-endpoint throughput and
+latency percentiles, job completion times, and what the upstream served.
+
+    python benchmarks/load_test.py --users 20 --llm-latency 1.5 --rate-limit-rate 0.05
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_upstream import add_arguments  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+TERMINAL_STATUSES = {"completed", "error", "cancelled"}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _is_success(status: int | str) -> bool:
+    return isinstance(status, int) and status < 400
+
+
+def _fake_upstream_args(args: argparse.Namespace) -> list[str]:
+    """Re-encode the fake upstream options parsed by this script."""
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    cli = []
+    for action in parser._actions:
+        value = getattr(args, action.dest)
+        if value is not None:
+            cli += [action.option_strings[0], str(value)]
+    return cli
+
+
+def _wait_until_up(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.jobs: list[float] = []
+        self.job_outcomes: Counter[str] = Counter()
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, path: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except httpx.HTTPError as exc:
+            self.statuses[name][type(exc).__name__] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        self.statuses[name][response.status_code] += 1
+        return response if response.is_success else None
+
+
+async def simulated_user(client: httpx.AsyncClient, recorder: Recorder, user: int,
+                         args: argparse.Namespace) -> None:
+    for iteration in range(args.iterations):
+        title = f"Load test {user}-{iteration}"
+        # A unique prompt per request keeps the LLM cache out of the measurement.
+        prompt = f"A short story for load test user {user}, iteration {iteration} ({uuid.uuid4().hex[:8]})"
+        response = await recorder.call(client, "outline", "POST", "/api/outline", json={
+            "title": title, "prompt": prompt, "target_duration_minutes": args.duration,
+        })
+        if response is None:
+            continue
+        outline = response.json()["outline"]
+
+        response = await recorder.call(client, "chapters", "POST", "/api/chapters", json={
+            "title": title, "outline": outline, "target_duration_minutes": args.duration,
+            "per_chapter": True,
+        })
+        if response is None or args.skip_audiobook:
+            continue
+        chapters = response.json()["chapters"]
+
+        started = time.perf_counter()
+        response = await recorder.call(client, "audiobook_start", "POST", "/api/audiobook/start", json={
+            "title": title, "outline": outline, "chapters": chapters,
+            "voice": "alloy", "speed": 1.0, "include_outline": True,
+        })
+        if response is None:
+            recorder.job_outcomes["not_started"] += 1
+            continue
+        job_id = response.json()["job_id"]
+
+        deadline = time.monotonic() + args.job_timeout
+        outcome = "timeout"
+        while time.monotonic() < deadline:
+            await asyncio.sleep(args.poll_interval)
+            status = await recorder.call(client, "audiobook_status", "GET", f"/api/audiobook/status/{job_id}")
+            if status is not None and status.json()["status"] in TERMINAL_STATUSES:
+                outcome = status.json()["status"]
+                break
+        recorder.job_outcomes[outcome] += 1
+        if outcome == "completed":
+            recorder.jobs.append(time.perf_counter() - started)
+
+
+async def run_load(args: argparse.Namespace, api_url: str) -> tuple[Recorder, float]:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users * 2)
+    async with httpx.AsyncClient(base_url=api_url, timeout=args.request_timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(simulated_user(client, recorder, user, args) for user in range(args.users)))
+        wall = time.perf_counter() - start
+    return recorder, wall
+
+
+def report(recorder: Recorder, wall: float, upstream_stats: dict | None) -> None:
+    print(f"\nWall time {wall:.1f}s")
+    print(f"{'endpoint':<18} {'ok':>5} {'failed':>7} {'req/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'max s':>7}")
+    for name, statuses in recorder.statuses.items():
+        errors = {str(status): count for status, count in statuses.items() if not _is_success(status)}
+        failed = sum(errors.values())
+        ok = sum(statuses.values()) - failed
+        latencies = recorder.latencies[name] or [0.0]
+        print(
+            f"{name:<18} {ok:>5} {failed:>7} {sum(statuses.values()) / wall:>7.2f} "
+            f"{statistics.median(latencies):>7.2f} {_percentile(latencies, 95):>7.2f} "
+            f"{_percentile(latencies, 99):>7.2f} {max(latencies):>7.2f}"
+        )
+        if errors:
+            print(f"{'':<18} failures: {errors}")
+
+    if recorder.job_outcomes:
+        print(f"\nJobs: {dict(recorder.job_outcomes)}")
+    if recorder.jobs:
+        print(
+            f"Job completion s: p50 {statistics.median(recorder.jobs):.1f}  "
+            f"p95 {_percentile(recorder.jobs, 95):.1f}  max {max(recorder.jobs):.1f}"
+        )
+    if upstream_stats:
+        print(f"Upstream: {upstream_stats['counts']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=1, help="books per user")
+    parser.add_argument("--duration", type=int, default=5, help="target_duration_minutes per book")
+    parser.add_argument("--skip-audiobook", action="store_true")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--job-timeout", type=float, default=600.0)
+    parser.add_argument("--request-timeout", type=float, default=300.0)
+    parser.add_argument("--api-url", help="use a running API instead of spawning one")
+    parser.add_argument("--api-port", type=int, default=8000)
+    parser.add_argument("--upstream-port", type=int, default=8100)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    upstream_url = f"http://127.0.0.1:{args.upstream_port}"
+    processes = []
+    try:
+        if args.api_url:
+            api_url = args.api_url
+        else:
+            processes.append(subprocess.Popen(
+                [sys.executable, str(ROOT / "benchmarks" / "fake_upstream.py"),
+                 "--port", str(args.upstream_port), *_fake_upstream_args(args)],
+            ))
+            _wait_until_up(f"{upstream_url}/fake/stats")
+
+            env = dict(
+                os.environ,
+                OPENAI_BASE_URL=f"{upstream_url}/v1",
+                OPENAI_API_KEY="load-test",
+                ANTHROPIC_BASE_URL=upstream_url,
+                ANTHROPIC_API_KEY="load-test",
+                BOOK_OUTPUT_DIR=tempfile.mkdtemp(prefix="book_foundry_load_"),
+                LITELLM_LOCAL_MODEL_COST_MAP="True",
+                # The fake upstream has no account limits; keep the TTS rate
+                # limits off unless the caller sets them.
+                TTS_REQUESTS_PER_MINUTE=os.getenv("TTS_REQUESTS_PER_MINUTE", "0"),
+                TTS_CHARS_PER_MINUTE=os.getenv("TTS_CHARS_PER_MINUTE", "0"),
+            )
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "api:app", "--port", str(args.api_port),
+                 "--log-level", "warning"],
+                cwd=ROOT, env=env,
+            ))
+            api_url = f"http://127.0.0.1:{args.api_port}"
+            _wait_until_up(f"{api_url}/api/health")
+
+        print(f"{args.users} users x {args.iterations} books against {api_url}")
+        recorder, wall = asyncio.run(run_load(args, api_url))
+
+        upstream_stats = None
+        try:
+            upstream_stats = httpx.get(f"{upstream_url}/fake/stats", timeout=5.0).json()
+        except httpx.HTTPError:
+            pass
+        report(recorder, wall, upstream_stats)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Cold-start benchmark for api.py.
+
+Each run uses a fresh interpreter, as after a scale-to-zero stop. It reports:
+
+- how long `import api` takes and which heavy modules (dspy, litellm, openai)
+  it loads eagerly;
+- time from spawning uvicorn to the first 200 from /api/health;
+- time to the first response for / (the static frontend, once built).
+
+    python benchmarks/startup.py --runs 5
+    python benchmarks/startup.py --check     # exit 1 over budget or on eager heavy imports
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("dspy", "litellm", "openai")
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import api
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "heavy_modules": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def _env(warm_up: bool) -> dict:
+    return dict(
+        os.environ,
+        OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "startup-benchmark"),
+        ANTHROPIC_API_KEY=os.getenv("ANTHROPIC_API_KEY", "startup-benchmark"),
+        BOOK_OUTPUT_DIR=tempfile.mkdtemp(prefix="book_foundry_startup_"),
+        LITELLM_LOCAL_MODEL_COST_MAP="True",
+        API_WARM_UP="1" if warm_up else "0",
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(warm_up: bool) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=ROOT, env=_env(warm_up), capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _first_response(url: str, started: float, timeout: float) -> tuple[float, int]:
+    """Poll `url` until the server answers; return (seconds since `started`, status)."""
+    deadline = started + timeout
+    while time.perf_counter() < deadline:
+        try:
+            response = httpx.get(url, timeout=timeout)
+            return time.perf_counter() - started, response.status_code
+        except httpx.TransportError:
+            time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer within {timeout:.0f}s")
+
+
+def measure_first_response(warm_up: bool, timeout: float) -> dict:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=_env(warm_up),
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        health_seconds, health_status = _first_response(f"{base}/api/health", started, timeout)
+        request_started = time.perf_counter()
+        frontend = httpx.get(f"{base}/", timeout=timeout)
+        return {
+            "health_seconds": health_seconds,
+            "health_status": health_status,
+            "frontend_seconds": health_seconds + time.perf_counter() - request_started,
+            "frontend_status": frontend.status_code,
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _median(runs: list[dict], key: str) -> float:
+    return statistics.median(run[key] for run in runs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--no-warm-up", action="store_true",
+                        help="start the API with API_WARM_UP=0")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a budget below is exceeded or heavy modules load at import")
+    parser.add_argument("--max-import-seconds", type=float, default=1.0)
+    parser.add_argument("--max-first-response-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    warm_up = not args.no_warm_up
+
+    imports = [measure_import(warm_up) for _ in range(args.runs)]
+    starts = [measure_first_response(warm_up, args.timeout) for _ in range(args.runs)]
+
+    import_seconds = _median(imports, "seconds")
+    health_seconds = _median(starts, "health_seconds")
+    heavy = sorted({name for run in imports for name in run["heavy_modules"]})
+    print(f"{args.runs} cold starts, warm-up {'on' if warm_up else 'off'} (medians)")
+    print(f"  import api           {import_seconds * 1000:8.0f} ms")
+    print(f"  heavy modules loaded {', '.join(heavy) or 'none'}")
+    print(f"  first /api/health    {health_seconds * 1000:8.0f} ms "
+          f"(status {starts[-1]['health_status']})")
+    print(f"  first /              {_median(starts, 'frontend_seconds') * 1000:8.0f} ms "
+          f"(status {starts[-1]['frontend_status']})")
+
+    if not args.check:
+        return 0
+    failures = []
+    if import_seconds > args.max_import_seconds:
+        failures.append(f"import took {import_seconds:.2f}s > {args.max_import_seconds:.2f}s")
+    if health_seconds > args.max_first_response_seconds:
+        failures.append(f"first response took {health_seconds:.2f}s > {args.max_first_response_seconds:.2f}s")
+    if heavy:
+        failures.append(f"imported eagerly: {', '.join(heavy)}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@ export interface OutlineRequest {
   title: string;
   prompt: string;
   targetDurationMinutes: number;
+  /** Skip the server's response cache and ask the model again. */
+  regenerate?: boolean;
 }
 
 export interface OutlineFeedbackRequest {
@@ -17,6 +19,10 @@ export interface ChaptersRequest {
   title: string;
   outline: string;
   targetDurationMinutes: number;
+  /** Skip the server's response cache and ask the model again. */
+  regenerate?: boolean;
+  /** Write each chapter in its own LM call (the default here; the API defaults to one call). */
+  perChapter?: boolean;
 }
 
 export interface VoicePreviewRequest {
@@ -44,26 +50,49 @@ interface ChaptersResponse {
   chapters: string[];
 }
 
+interface MissingChunk {
+  chapter_index: number;
+  chunk_index: number;
+  error: string;
+}
+
 interface AudiobookResponse {
   folder: string;
   audio_files: string[];
   download_url?: string | null;
+  missing_chunks?: MissingChunk[];
 }
 
 interface AudiobookJobResponse {
   job_id: string;
   total_chapters: number;
+  queue_position?: number | null;
+  estimated_start_seconds?: number | null;
+}
+
+export interface SpanTiming {
+  name: string;
+  start_seconds: number;
+  duration_seconds: number;
+  attributes: Record<string, unknown>;
+  children: SpanTiming[];
 }
 
-interface AudiobookStatusResponse {
-  status: 'queued' | 'running' | 'completed' | 'error';
+export interface AudiobookStatusResponse {
+  status: 'queued' | 'running' | 'completed' | 'error' | 'cancelled';
   progress: number;
   completed_chapters: number;
   total_chapters: number;
+  completed_chunks?: number | null;
+  total_chunks?: number | null;
   elapsed_seconds?: number | null;
   estimated_seconds?: number | null;
+  eta_seconds?: number | null;
+  queue_position?: number | null;
+  estimated_start_seconds?: number | null;
   result?: AudiobookResponse | null;
   error?: string | null;
+  timings?: SpanTiming | null;
 }
 
 async function handleResponse<T>(response: Response): Promise<T> {
@@ -93,6 +122,7 @@ export async function generateOutline(payload: OutlineRequest): Promise<string>
       title: payload.title,
       prompt: payload.prompt,
       target_duration_minutes: payload.targetDurationMinutes,
+      regenerate: payload.regenerate ?? false,
     }),
   });
 
@@ -128,6 +158,8 @@ export async function generateChapters(payload: ChaptersRequest): Promise<string
       title: payload.title,
       outline: payload.outline,
       target_duration_minutes: payload.targetDurationMinutes,
+      per_chapter: payload.perChapter ?? true,
+      regenerate: payload.regenerate ?? false,
     }),
   });
 
@@ -135,7 +167,96 @@ export async function generateChapters(payload: ChaptersRequest): Promise<string
   return data.chapters;
 }
 
-export async function generateVoicePreview(payload: VoicePreviewRequest): Promise<Blob> {
+type ChapterStreamEvent =
+  | { type: 'plan'; total_chapters: number | null }
+  | { type: 'chapter'; index: number; chapter: string }
+  | { type: 'done'; total_chapters: number }
+  | { type: 'error'; detail: string };
+
+export interface ChapterStreamHandlers {
+  onPlan?: (totalChapters: number | null) => void;
+  onChapter: (index: number, chapter: string) => void;
+}
+
+/**
+ * Generate chapters via the NDJSON stream, reporting each chapter as soon as it
+ * is written. Resolves with all chapters in outline order.
+ */
+export async function streamChapters(
+  payload: ChaptersRequest,
+  handlers: ChapterStreamHandlers,
+  signal?: AbortSignal,
+): Promise<string[]> {
+  const response = await fetch(`${API_BASE}/api/chapters/stream`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      title: payload.title,
+      outline: payload.outline,
+      target_duration_minutes: payload.targetDurationMinutes,
+      regenerate: payload.regenerate ?? false,
+    }),
+    signal,
+  });
+
+  if (!response.ok || !response.body) {
+    await handleResponse<unknown>(response);
+    throw new Error('Chapter streaming is not supported by this browser');
+  }
+
+  const chapters: string[] = [];
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  const handleLine = (line: string): boolean => {
+    if (!line.trim()) {
+      return false;
+    }
+    const event = JSON.parse(line) as ChapterStreamEvent;
+    switch (event.type) {
+      case 'plan':
+        handlers.onPlan?.(event.total_chapters);
+        return false;
+      case 'chapter':
+        chapters[event.index] = event.chapter;
+        handlers.onChapter(event.index, event.chapter);
+        return false;
+      case 'error':
+        throw new Error(event.detail);
+      case 'done':
+        return true;
+    }
+  };
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffer += decoder.decode(value, { stream: !done });
+    const lines = buffer.split('\n');
+    buffer = lines.pop() ?? '';
+    for (const line of lines) {
+      if (handleLine(line)) {
+        return chapters;
+      }
+    }
+    if (done) {
+      if (handleLine(buffer)) {
+        return chapters;
+      }
+      throw new Error('Chapter stream ended unexpectedly');
+    }
+  }
+}
+
+/**
+ * Start a voice preview and return an object URL for an <audio> element.
+ *
+ * Where MediaSource supports MP3, the URL is backed by the response stream so
+ * playback begins as soon as the first frames arrive.
+ */
+export async function streamVoicePreview(payload: VoicePreviewRequest): Promise<string> {
   const response = await fetch(`${API_BASE}/api/voice/preview`, {
     method: 'POST',
     headers: {
@@ -157,7 +278,38 @@ export async function generateVoicePreview(payload: VoicePreviewRequest): Promis
     throw new Error(message);
   }
 
-  return response.blob();
+  const canStream = response.body
+    && typeof MediaSource !== 'undefined'
+    && MediaSource.isTypeSupported('audio/mpeg');
+  if (!canStream || !response.body) {
+    return URL.createObjectURL(await response.blob());
+  }
+
+  const reader = response.body.getReader();
+  const mediaSource = new MediaSource();
+  mediaSource.addEventListener('sourceopen', async () => {
+    const sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+    const append = (chunk: Uint8Array) => new Promise<void>((resolve, reject) => {
+      sourceBuffer.addEventListener('updateend', () => resolve(), { once: true });
+      sourceBuffer.addEventListener('error', () => reject(new Error('Preview playback failed')), { once: true });
+      sourceBuffer.appendBuffer(chunk);
+    });
+
+    try {
+      for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        await append(value);
+      }
+      mediaSource.endOfStream();
+    } catch {
+      if (mediaSource.readyState === 'open') {
+        mediaSource.endOfStream('decode');
+      }
+    }
+  }, { once: true });
+
+  return URL.createObjectURL(mediaSource);
 }
 
 export async function generateAudiobook(payload: AudiobookRequest): Promise<AudiobookResponse> {
@@ -205,3 +357,68 @@ export async function getAudiobookStatus(jobId: string): Promise<AudiobookStatus
   const response = await fetch(`${API_BASE}/api/audiobook/status/${jobId}`);
   return handleResponse<AudiobookStatusResponse>(response);
 }
+
+export async function cancelAudiobook(jobId: string): Promise<AudiobookStatusResponse> {
+  const response = await fetch(`${API_BASE}/api/audiobook/${jobId}`, { method: 'DELETE' });
+  return handleResponse<AudiobookStatusResponse>(response);
+}
+
+const STATUS_POLL_INTERVAL_MS = 1500;
+
+function isTerminal(status: AudiobookStatusResponse): boolean {
+  return status.status === 'completed' || status.status === 'error' || status.status === 'cancelled';
+}
+
+async function pollAudiobookStatus(
+  jobId: string,
+  onUpdate: (update: Partial<AudiobookStatusResponse>) => void,
+): Promise<AudiobookStatusResponse> {
+  for (;;) {
+    const status = await getAudiobookStatus(jobId);
+    onUpdate(status);
+    if (isTerminal(status)) {
+      return status;
+    }
+    await new Promise((resolve) => setTimeout(resolve, STATUS_POLL_INTERVAL_MS));
+  }
+}
+
+/**
+ * Follow an audiobook job until it finishes, reporting each update.
+ *
+ * Uses the server-sent event stream and falls back to polling the status
+ * endpoint if EventSource is unavailable or the stream drops.
+ */
+export function watchAudiobookJob(
+  jobId: string,
+  onUpdate: (update: Partial<AudiobookStatusResponse>) => void,
+): Promise<AudiobookStatusResponse> {
+  if (typeof EventSource === 'undefined') {
+    return pollAudiobookStatus(jobId, onUpdate);
+  }
+
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE}/api/audiobook/events/${jobId}`);
+    let finished = false;
+
+    const handleUpdate = (event: MessageEvent<string>) => {
+      onUpdate(JSON.parse(event.data) as Partial<AudiobookStatusResponse>);
+    };
+
+    source.addEventListener('status', handleUpdate);
+    source.addEventListener('progress', handleUpdate);
+    source.addEventListener('result', (event: MessageEvent<string>) => {
+      finished = true;
+      source.close();
+      const status = JSON.parse(event.data) as AudiobookStatusResponse;
+      onUpdate(status);
+      resolve(status);
+    });
+    source.onerror = () => {
+      if (finished) return;
+      finished = true;
+      source.close();
+      pollAudiobookStatus(jobId, onUpdate).then(resolve, reject);
+    };
+  });
+}
@@ -1,7 +1,7 @@
 import { useMemo, useState, type FC } from 'react';
 import { StepLayout } from '../components/StepLayout';
 import type { BookData } from '../types';
-import { API_BASE, getAudiobookStatus, startAudiobook } from '../api';
+import { API_BASE, cancelAudiobook, startAudiobook, watchAudiobookJob } from '../api';
 
 interface AudiobookStepProps {
   bookData: BookData;
@@ -17,6 +17,9 @@ export const AudiobookStep: FC<AudiobookStepProps> = ({ bookData, onBack }) => {
   const [totalChapters, setTotalChapters] = useState(0);
   const [elapsedSeconds, setElapsedSeconds] = useState<number | null>(null);
   const [estimatedSeconds, setEstimatedSeconds] = useState<number | null>(null);
+  const [queuePosition, setQueuePosition] = useState<number | null>(null);
+  const [startsInSeconds, setStartsInSeconds] = useState<number | null>(null);
+  const [jobId, setJobId] = useState<string | null>(null);
   const fallbackSettings = useMemo(() => ({
     voice: 'fable',
     speed: 1,
@@ -48,6 +51,7 @@ export const AudiobookStep: FC<AudiobookStepProps> = ({ bookData, onBack }) => {
       setTotalChapters(0);
       setElapsedSeconds(null);
       setEstimatedSeconds(null);
+      setQueuePosition(null);
 
       const job = await startAudiobook({
         title: bookData.title,
@@ -59,41 +63,54 @@ export const AudiobookStep: FC<AudiobookStepProps> = ({ bookData, onBack }) => {
         instructions: voiceSettings.instructions,
       });
 
+      setJobId(job.job_id);
       setTotalChapters(job.total_chapters);
-
-      let isComplete = false;
-      while (!isComplete) {
-        const status = await getAudiobookStatus(job.job_id);
-        const derivedProgress = (status.elapsed_seconds != null && status.estimated_seconds)
-          ? Math.min(99, Math.round((status.elapsed_seconds / status.estimated_seconds) * 100))
-          : status.progress;
-        setProgress(derivedProgress);
-        setCompletedChapters(status.completed_chapters);
-        setTotalChapters(status.total_chapters);
-        setElapsedSeconds(status.elapsed_seconds ?? null);
-        setEstimatedSeconds(status.estimated_seconds ?? null);
-
-        if (status.status === 'completed' && status.result) {
-          setResult({
-            folder: status.result.folder,
-            audioFiles: status.result.audio_files,
-            downloadUrl: status.result.download_url ?? null,
-          });
-          isComplete = true;
-          break;
-        }
-
-        if (status.status === 'error') {
-          throw new Error(status.error ?? 'Failed to generate audiobook');
+      setQueuePosition(job.queue_position ?? null);
+      setStartsInSeconds(job.estimated_start_seconds ?? null);
+
+      const status = await watchAudiobookJob(job.job_id, (update) => {
+        if (update.progress != null) setProgress(update.progress);
+        if (update.completed_chapters != null) setCompletedChapters(update.completed_chapters);
+        if (update.total_chapters != null) setTotalChapters(update.total_chapters);
+        if (update.elapsed_seconds !== undefined) setElapsedSeconds(update.elapsed_seconds ?? null);
+        if (update.estimated_seconds !== undefined) setEstimatedSeconds(update.estimated_seconds ?? null);
+        // Status snapshots carry the queue position; progress events mean the job has started.
+        if (update.queue_position !== undefined) {
+          setQueuePosition(update.queue_position ?? null);
+          setStartsInSeconds(update.estimated_start_seconds ?? null);
+        } else {
+          setQueuePosition(null);
         }
+      });
 
-        await new Promise((resolve) => setTimeout(resolve, 1500));
+      if (status.status === 'cancelled') {
+        throw new Error(status.error ?? 'Audiobook generation was cancelled');
       }
+      if (status.status === 'error' || !status.result) {
+        throw new Error(status.error ?? 'Failed to generate audiobook');
+      }
+
+      setResult({
+        folder: status.result.folder,
+        audioFiles: status.result.audio_files,
+        downloadUrl: status.result.download_url ?? null,
+      });
     } catch (err) {
       const message = err instanceof Error ? err.message : 'Failed to generate audiobook';
       setError(message);
     } finally {
       setIsGenerating(false);
+      setJobId(null);
+    }
+  };
+
+  const handleCancel = async () => {
+    if (!jobId) return;
+    try {
+      // The job watcher resolves with the "cancelled" status.
+      await cancelAudiobook(jobId);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to cancel the audiobook');
     }
   };
 
@@ -125,6 +142,11 @@ export const AudiobookStep: FC<AudiobookStepProps> = ({ bookData, onBack }) => {
             >
               {isGenerating ? 'Generating Audiobook...' : 'Generate Audiobook'}
             </button>
+            {isGenerating && jobId ? (
+              <button className="btn btn-secondary" type="button" onClick={handleCancel}>
+                Cancel
+              </button>
+            ) : null}
           </div>
 
           {isGenerating && (
@@ -136,6 +158,12 @@ export const AudiobookStep: FC<AudiobookStepProps> = ({ bookData, onBack }) => {
               <div className="progress-track">
                 <div className="progress-fill" style={{ width: `${progress}%` }}></div>
               </div>
+              {queuePosition !== null ? (
+                <p className="progress-footnote">
+                  Queued behind other books (position {queuePosition}
+                  {startsInSeconds !== null ? `, starting in ~${formatDuration(Math.max(1, startsInSeconds))}` : ''})
+                </p>
+              ) : null}
               <p className="progress-footnote">
                 {elapsedSeconds !== null && estimatedSeconds !== null
                   ? `${formatDuration(Math.max(0, elapsedSeconds))} elapsed of ~${formatDuration(Math.max(1, estimatedSeconds))}`
@@ -28,6 +28,7 @@ export const BookSetupStep: FC<BookSetupStepProps> = ({
         title: bookData.title,
         prompt: bookData.prompt,
         targetDurationMinutes: bookData.targetDurationMinutes,
+        regenerate: Boolean(bookData.outline),
       });
       onUpdate({ outline });
       onNext();
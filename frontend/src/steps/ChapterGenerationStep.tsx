@@ -1,7 +1,7 @@
-import { useState, type FC } from 'react';
+import { useEffect, useRef, useState, type FC } from 'react';
 import { StepLayout } from '../components/StepLayout';
 import type { BookData } from '../types';
-import { generateChapters } from '../api';
+import { streamChapters } from '../api';
 
 interface ChapterGenerationStepProps {
   bookData: BookData;
@@ -18,6 +18,11 @@ export const ChapterGenerationStep: FC<ChapterGenerationStepProps> = ({
 }) => {
   const [isGenerating, setIsGenerating] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [draftChapters, setDraftChapters] = useState<(string | undefined)[]>([]);
+  const [expectedChapters, setExpectedChapters] = useState<number | null>(null);
+  const abortRef = useRef<AbortController | null>(null);
+
+  useEffect(() => () => abortRef.current?.abort(), []);
 
   const handleGenerateChapters = async () => {
     if (!bookData.outline) {
@@ -25,21 +30,47 @@ export const ChapterGenerationStep: FC<ChapterGenerationStepProps> = ({
       return;
     }
 
+    abortRef.current?.abort();
+    const controller = new AbortController();
+    abortRef.current = controller;
+
     setIsGenerating(true);
     setError(null);
+    setDraftChapters([]);
+    setExpectedChapters(null);
 
     try {
-      const chapters = await generateChapters({
-        title: bookData.title,
-        outline: bookData.outline,
-        targetDurationMinutes: bookData.targetDurationMinutes,
-      });
+      const chapters = await streamChapters(
+        {
+          title: bookData.title,
+          outline: bookData.outline,
+          targetDurationMinutes: bookData.targetDurationMinutes,
+          regenerate: Boolean(bookData.chapters?.length),
+        },
+        {
+          onPlan: setExpectedChapters,
+          onChapter: (index, chapter) => {
+            setDraftChapters((current) => {
+              const next = [...current];
+              next[index] = chapter;
+              return next;
+            });
+          },
+        },
+        controller.signal,
+      );
       onUpdate({ chapters });
     } catch (error) {
+      if (controller.signal.aborted) {
+        return;
+      }
       const message = error instanceof Error ? error.message : 'Failed to generate chapters';
       setError(message);
     } finally {
-      setIsGenerating(false);
+      if (abortRef.current === controller) {
+        abortRef.current = null;
+        setIsGenerating(false);
+      }
     }
   };
 
@@ -49,6 +80,12 @@ export const ChapterGenerationStep: FC<ChapterGenerationStepProps> = ({
     }
   };
 
+  const readyCount = draftChapters.filter((chapter) => chapter !== undefined).length;
+  const slotCount = Math.max(expectedChapters ?? 0, draftChapters.length);
+  const visibleChapters: (string | undefined)[] = isGenerating
+    ? Array.from({ length: slotCount }, (_, index) => draftChapters[index])
+    : bookData.chapters ?? [];
+
   return (
     <StepLayout
       title="Generate the Full Draft"
@@ -101,16 +138,25 @@ export const ChapterGenerationStep: FC<ChapterGenerationStepProps> = ({
         <div className="chapter-panel">
           <h3 className="section-title">Chapter Output</h3>
           <p className="muted-text">
-            {bookData.chapters?.length
-              ? `Generated ${bookData.chapters.length} chapters.`
-              : 'No chapters generated yet.'}
+            {isGenerating
+              ? `Written ${readyCount}${expectedChapters ? ` of ${expectedChapters}` : ''} chapters…`
+              : bookData.chapters?.length
+                ? `Generated ${bookData.chapters.length} chapters.`
+                : 'No chapters generated yet.'}
           </p>
 
           <div className="chapter-list">
-            {bookData.chapters?.map((chapter, index) => (
+            {visibleChapters.map((chapter, index) => (
               <article key={index} className="chapter-card">
                 <h4>Chapter {index + 1}</h4>
-                <p>{chapter.slice(0, 240)}{chapter.length > 240 ? '…' : ''}</p>
+                {chapter === undefined ? (
+                  <p className="muted-text">
+                    <span className="spinner"></span>
+                    Writing…
+                  </p>
+                ) : (
+                  <p>{chapter.slice(0, 240)}{chapter.length > 240 ? '…' : ''}</p>
+                )}
               </article>
             ))}
           </div>
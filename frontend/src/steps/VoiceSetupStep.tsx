@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState, type FC } from 'react';
 import { StepLayout } from '../components/StepLayout';
 import type { BookData } from '../types';
-import { generateVoicePreview } from '../api';
+import { streamVoicePreview } from '../api';
 
 interface VoiceSetupStepProps {
   bookData: BookData;
@@ -53,7 +53,7 @@ export const VoiceSetupStep: FC<VoiceSetupStepProps> = ({
     setIsPreviewing(true);
     setError(null);
     try {
-      const blob = await generateVoicePreview({
+      const url = await streamVoicePreview({
         voice: voiceSettings.voice,
         speed: voiceSettings.speed,
         instructions: voiceSettings.instructions,
@@ -62,7 +62,7 @@ export const VoiceSetupStep: FC<VoiceSetupStepProps> = ({
       if (previewUrl) {
         URL.revokeObjectURL(previewUrl);
       }
-      setPreviewUrl(URL.createObjectURL(blob));
+      setPreviewUrl(url);
     } catch (err) {
       const message = err instanceof Error ? err.message : 'Failed to generate preview';
       setError(message);
@@ -156,7 +156,7 @@ export const VoiceSetupStep: FC<VoiceSetupStepProps> = ({
           <p className="muted-text">Listen to a short excerpt using your current voice settings.</p>
 
           {previewUrl ? (
-            <audio controls src={previewUrl} className="audio-player" />
+            <audio controls autoPlay src={previewUrl} className="audio-player" />
           ) : (
             <div className="empty-state">
               <div className="spinner"></div>
@@ -0,0 +1,209 @@
+"""Audio post-processing on a pool of worker processes.
+
+Joining a chapter's chunks parses every MP3 frame, and the pydub fallback
+decodes and re-encodes the whole chapter; run in the API process, both hold
+the GIL that request handling and status polls need. AudioPool runs that
+work in separate processes, at most `workers` tasks at a time.
+
+The pool also pushes back on the TTS stage: TTS workers call
+`wait_for_capacity` before each request, so once `max_pending` tasks are
+queued or running, synthesis pauses until mixing catches up instead of
+piling up chunk files.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, List
+
+from .cancellation import CancellationToken
+from .metrics import AUDIO_COMBINE_SECONDS, QUEUE_WAIT_SECONDS
+from .mp3_concat import Mp3FormatError, concat_mp3_files
+
+
+# Sized for a small (1 CPU) machine; zero runs tasks inline in the caller.
+DEFAULT_AUDIO_WORKERS = int(os.getenv("AUDIO_WORKERS", "1"))
+DEFAULT_AUDIO_MAX_PENDING = int(os.getenv("AUDIO_MAX_PENDING", "4"))
+
+# How often a TTS worker held back by a full pool checks for cancellation.
+CAPACITY_POLL_SECONDS = 0.5
+
+
+def combine_audio_files(audio_files: List[Path], output_file: Path, gap_ms: int) -> None:
+    """Combine audio files into one, splicing MP3 frames when possible."""
+    existing = [file for file in audio_files if file.exists()]
+    try:
+        concat_mp3_files(existing, output_file, gap_ms=gap_ms)
+        return
+    except Mp3FormatError as e:
+        print(f"Re-encoding {output_file.name} with pydub: {e}")
+    _combine_audio_files_pydub(existing, output_file, gap_ms)
+
+
+def _combine_audio_files_pydub(audio_files: List[Path], output_file: Path, gap_ms: int) -> None:
+    """Combine multiple audio files into one using pydub."""
+    try:
+        from pydub import AudioSegment
+
+        combined = AudioSegment.empty()
+        for file in audio_files:
+            if file.exists():
+                audio = AudioSegment.from_mp3(file)
+                combined += audio
+                combined += AudioSegment.silent(duration=gap_ms)  # pause between chunks
+
+        combined.export(output_file, format="mp3")
+
+    except ImportError:
+        print("pydub not available, keeping separate chunk files")
+        # If pydub fails, just use the first chunk
+        if audio_files and audio_files[0].exists():
+            audio_files[0].rename(output_file)
+
+
+def combine_chapter(audio_files: List[Path], output_file: Path, gap_ms: int) -> str:
+    """Join a chapter's ordered chunk files into `output_file` and remove the chunks."""
+    combine_audio_files(audio_files, output_file, gap_ms)
+    for file in audio_files:
+        file.unlink(missing_ok=True)
+    return str(output_file)
+
+
+def _run_timed(fn: Callable, args: tuple) -> tuple:
+    """Worker-side wrapper: (wall-clock start, seconds spent, result)."""
+    started_at = time.time()
+    started = time.perf_counter()
+    result = fn(*args)
+    return started_at, time.perf_counter() - started, result
+
+
+class AudioPool:
+    """Bounded pool of processes for audio post-processing tasks.
+
+    Tasks must be picklable module-level functions. Worker processes are
+    started on first use with the "spawn" method, so they never inherit the
+    API's threads or open connections.
+    """
+
+    def __init__(self, workers: int = DEFAULT_AUDIO_WORKERS,
+                 max_pending: int = DEFAULT_AUDIO_MAX_PENDING):
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        self._condition = threading.Condition()
+
+    def submit(self, fn: Callable, *args: object) -> Future:
+        """Run `fn(*args)` on the pool and return a future for its result.
+
+        Never blocks: backpressure is applied to producers through
+        `wait_for_capacity`, not here.
+        """
+        submitted_at = time.time()
+        with self._condition:
+            self._pending += 1
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        if self.workers == 0:
+            try:
+                outcome = _run_timed(fn, args)
+            except BaseException as exc:
+                self._finish(future, submitted_at, exc=exc)
+            else:
+                self._finish(future, submitted_at, outcome=outcome)
+            return future
+
+        try:
+            task = self._submit_to_executor(fn, args)
+        except BaseException as exc:
+            self._finish(future, submitted_at, exc=exc)
+            return future
+
+        def on_done(task: Future) -> None:
+            try:
+                outcome = task.result()
+            except BaseException as exc:
+                self._finish(future, submitted_at, exc=exc)
+            else:
+                self._finish(future, submitted_at, outcome=outcome)
+
+        task.add_done_callback(on_done)
+        return future
+
+    def saturated(self) -> bool:
+        with self._condition:
+            return self._pending >= self.max_pending
+
+    def wait_for_capacity(self, cancel_token: CancellationToken | None = None) -> float:
+        """Block while `max_pending` tasks are queued or running; return seconds waited."""
+        started = time.monotonic()
+        with self._condition:
+            while self._pending >= self.max_pending:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                self._condition.wait(CAPACITY_POLL_SECONDS)
+        return time.monotonic() - started
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, cancelling tasks that have not started."""
+        with self._condition:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_to_executor(self, fn: Callable, args: tuple) -> Future:
+        try:
+            return self._get_executor().submit(_run_timed, fn, args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool once.
+            print("Audio worker pool broke; restarting it")
+            self.shutdown()
+            return self._get_executor().submit(_run_timed, fn, args)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._condition:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _finish(self, future: Future, submitted_at: float,
+                outcome: tuple | None = None, exc: BaseException | None = None) -> None:
+        try:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                started_at, seconds, result = outcome
+                QUEUE_WAIT_SECONDS.observe(max(0.0, started_at - submitted_at), queue="audio")
+                AUDIO_COMBINE_SECONDS.observe(seconds)
+                future.set_result(result)
+        finally:
+            with self._condition:
+                self._pending -= 1
+                self._condition.notify_all()
+
+
+_default_audio_pool: AudioPool | None = None
+_default_audio_pool_lock = threading.Lock()
+
+
+def get_audio_pool() -> AudioPool:
+    """Return the process-wide audio pool shared by every audiobook job."""
+    global _default_audio_pool
+    with _default_audio_pool_lock:
+        if _default_audio_pool is None:
+            _default_audio_pool = AudioPool()
+        return _default_audio_pool
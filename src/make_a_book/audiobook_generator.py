@@ -1,55 +1,76 @@
-import os
+import shutil
+import time
 import openai
-from openai import OpenAI
 from pathlib import Path
 from dotenv import load_dotenv
-import re
-from typing import List, Tuple
-import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+
+from . import text_chunker
+from .audio_pool import AudioPool, combine_audio_files, combine_chapter, get_audio_pool
+from .cancellation import CancellationToken, JobCancelled
+from .clients import get_clients
+from .job_manifest import JobManifest
+from .job_trace import JobTrace
+from .metrics import (
+    TTS_CHUNK_SECONDS,
+    TTS_SECONDS_PER_CHAR,
+    UPSTREAM_RETRIES,
+    upstream_call,
+)
+from .retry import RATE_LIMIT, RETRYABLE, RetryBudget, RetryPolicy, classify_error, retry_after_seconds
+from .tts_cache import TTSChunkCache
+from .tts_time_estimator import RemainingWorkEta, TTSLatencyModel
+from .tts_scheduler import TTSScheduler, get_scheduler
 
 load_dotenv()
 
+TTS_MODEL = "gpt-4o-mini-tts"
+CHUNK_PAUSE_MS = 500
+SPEECH_STREAM_CHUNK_BYTES = 64 * 1024
+# How often a job waiting on in-flight chunks checks for cancellation.
+CANCEL_POLL_SECONDS = 0.5
+
+# Default child-friendly instructions
+DEFAULT_VOICE_INSTRUCTIONS = ("Read with excitement and enthusiasm! You're a friendly storyteller reading to children. Use varied intonation, dramatic pauses for suspense, and express emotions clearly. Make it engaging and fun!")
+
+def _completed_future(value) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def _chapter_span_name(chapter_num: int) -> str:
+    return "outline" if chapter_num == 0 else f"chapter {chapter_num}"
+
+
 class AudiobookGenerator:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(self, scheduler: TTSScheduler | None = None,
+                 cache: TTSChunkCache | None = None,
+                 latency_model: TTSLatencyModel | None = None,
+                 retry_policy: RetryPolicy | None = None,
+                 audio_pool: AudioPool | None = None):
+        # Jobs share one pooled client; with_options only copies settings.
+        # Retries are handled by retry_policy so they share the scheduler's
+        # backoff and each job's retry budget; the SDK's own retries are off.
+        self.client = get_clients().openai().with_options(max_retries=0)
+        # All generators share the process-wide scheduler unless told otherwise,
+        # so concurrent jobs draw from one concurrency and rate-limit budget.
+        self.scheduler = scheduler or get_scheduler()
+        self.cache = cache
+        self.latency_model = latency_model or TTSLatencyModel()
+        self.retry_policy = retry_policy or RetryPolicy()
+        # Chapters are joined in worker processes shared by every job.
+        self.audio_pool = audio_pool or get_audio_pool()
         
     def clean_text_for_speech(self, text: str) -> str:
         """Clean text for better speech synthesis."""
-        # Remove markdown formatting
-        text = re.sub(r'#{1,6}\s*', '', text)  # Headers
-        text = re.sub(r'\*{1,2}([^\*]+)\*{1,2}', r'\1', text)  # Bold/italic
-        text = re.sub(r'`([^`]+)`', r'\1', text)  # Code
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)  # Links
-        
-        # Clean up extra whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)  # Multiple newlines
-        text = re.sub(r'\s{2,}', ' ', text)  # Multiple spaces
-        
-        return text.strip()
+        return text_chunker.clean_text_for_speech(text)
     
-    def chunk_text(self, text: str, max_chars: int = 4000) -> List[str]:
+    def chunk_text(self, text: str, max_chars: int = text_chunker.DEFAULT_MAX_CHUNK_CHARS) -> List[str]:
         """Split text into chunks suitable for TTS API limits."""
-        text = self.clean_text_for_speech(text)
-        
-        if len(text) <= max_chars:
-            return [text]
-        
-        chunks = []
-        sentences = re.split(r'[.!?]+\s+', text)
-        current_chunk = ""
-        
-        for sentence in sentences:
-            if len(current_chunk + sentence) <= max_chars:
-                current_chunk += sentence + ". "
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + ". "
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-            
-        return chunks
+        return text_chunker.chunk_text(text, max_chars)
     
     def create_book_folder(self, book_title: str, output_dir: Path | None = None) -> Path:
         """Create a folder for the book with all content."""
@@ -68,88 +89,278 @@ class AudiobookGenerator:
     def generate_chapter_audio(self, chapter_text: str, chapter_num: int,
                              book_folder: Path, voice: str = "alloy",
                              speed: float = 1.0, voice_instructions: str = None,
-                             progress_callback=None) -> str:
+                             progress_callback=None,
+                             cancel_token: CancellationToken | None = None) -> str:
         """Generate audio for a single chapter."""
-        chunks = self.chunk_text(chapter_text)
-        audio_files = []
-        
-        # Default child-friendly instructions
-        default_instructions = ("Read with excitement and enthusiasm! You're a friendly storyteller reading to children. Use varied intonation, dramatic pauses for suspense, and express emotions clearly. Make it engaging and fun!")
-        instructions = voice_instructions if voice_instructions else default_instructions
-        
-        for i, chunk in enumerate(chunks):
-            chunk_filename = book_folder / "audio" / f"chapter_{chapter_num:02d}_part_{i+1:02d}.mp3"
-            
-            try:
-                # Prepare API parameters
-                api_params = {
-                    "model": "gpt-4o-mini-tts",
-                    "voice": voice,
-                    "input": chunk,
-                    "speed": speed
-                }
-                
-                # Add instructions if provided
-                if instructions:
-                    api_params["instructions"] = instructions
-                
-                response = self.client.audio.speech.create(**api_params)
-                
-                response.stream_to_file(chunk_filename)
-                audio_files.append(chunk_filename)
-
-                if progress_callback:
-                    progress_callback(
-                        stage="chunk",
-                        chapter_index=chapter_num,
-                        chunk_index=i + 1,
-                        total_chunks=len(chunks),
-                    )
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f"Error generating audio for chapter {chapter_num}, chunk {i+1}: {e}")
-                continue
-        
-        # If multiple chunks, combine them into one chapter file
+        results = self._generate_chapters_audio(
+            [(chapter_num, chapter_text)], book_folder, voice, speed,
+            voice_instructions, progress_callback, cancel_token=cancel_token
+        )
+        return results.get(chapter_num)
+
+    def _generate_chapters_audio(self, chapters: List[Tuple[int, str]], book_folder: Path,
+                                 voice: str, speed: float, voice_instructions: str | None,
+                                 progress_callback=None,
+                                 on_chapter_done: Callable[[int, str | None, bool], None] | None = None,
+                                 manifest: JobManifest | None = None,
+                                 trace: JobTrace | None = None,
+                                 cancel_token: CancellationToken | None = None
+                                 ) -> Dict[int, str | None]:
+        """Synthesize every chunk of every chapter through the shared scheduler.
+
+        Chunks from all chapters are queued at once; each chapter is combined
+        on the audio pool as soon as its last chunk finishes. Chunks already checkpointed in
+        `manifest` are reused instead of synthesized again. Each chapter gets a
+        span in `trace`, with its chunks and the combine step beneath it.
+        Raises JobCancelled as soon as `cancel_token` fires; queued chunks are
+        dropped and in-flight ones stop streaming. Chunks that still fail after
+        their retries are reported with a "chunk_failed" progress event; their
+        chapter is left uncombined, its finished chunks kept on disk for a resume.
+        """
+        instructions = voice_instructions if voice_instructions else DEFAULT_VOICE_INSTRUCTIONS
+        trace = trace or JobTrace()
+        retry_budget = RetryBudget()
+
+        futures = {}
+        work: Dict[Future, float] = {}
+        pending: Dict[int, int] = {}
+        failed: Dict[int, int] = {}
+        chunk_files: Dict[int, Dict[int, Path]] = {}
+        chapter_spans: Dict[int, int] = {}
+        for chapter_num, chapter_text in chapters:
+            chunks = self.chunk_text(chapter_text)
+            pending[chapter_num] = len(chunks)
+            failed[chapter_num] = 0
+            chunk_files[chapter_num] = {}
+            # Chapters overlap in time, so each one gets its own trace track.
+            name = _chapter_span_name(chapter_num)
+            chapter_spans[chapter_num] = trace.start(name, track=name, chapter=chapter_num, chunks=len(chunks))
+            for i, chunk in enumerate(chunks):
+                chunk_filename = book_folder / "audio" / f"chapter_{chapter_num:02d}_part_{i+1:02d}.mp3"
+                chunk_span = trace.start(
+                    "chunk", parent=chapter_spans[chapter_num], chunk=i + 1, chars=len(chunk)
+                )
+                if manifest and manifest.chunk_file(chapter_num, i + 1):
+                    trace.end(chunk_span, source="checkpoint")
+                    futures[_completed_future(chunk_filename)] = (chapter_num, i, len(chunks), chunk_filename)
+                    continue
+                cache_key = None
+                if self.cache:
+                    cache_key = self.cache.make_key(TTS_MODEL, voice, speed, instructions, chunk)
+                    if self.cache.fetch(cache_key, chunk_filename):
+                        # Cache hits skip the scheduler and its rate budget.
+                        trace.end(chunk_span, source="cache")
+                        futures[_completed_future(chunk_filename)] = (chapter_num, i, len(chunks), chunk_filename)
+                        continue
+                synthesize = partial(self._synthesize_chunk, chunk, chunk_filename, voice, speed,
+                                     instructions, cache_key, cancel_token)
+                future = self.scheduler.submit(
+                    partial(self._run_chunk, synthesize, len(chunk), retry_budget, cancel_token,
+                            trace, chunk_span, trace.start("queued", parent=chunk_span)),
+                    group=id(self),
+                    cost_chars=len(chunk),
+                )
+                futures[future] = (chapter_num, i, len(chunks), chunk_filename)
+                work[future] = self.latency_model.predict(
+                    len(chunk), speed, len(instructions), self.scheduler.max_concurrency, voice
+                )
+
+        # Progress and ETA are measured in predicted seconds of synthesis,
+        # so a long chunk counts for more than a short one.
+        eta = RemainingWorkEta(sum(work.values()), min(self.scheduler.max_concurrency, len(work)))
+        if progress_callback:
+            progress_callback(stage="plan", total_chunks=len(futures), eta_seconds=eta.eta_seconds())
+
+        results: Dict[int, str | None] = {}
+        combines: Dict[Future, Tuple[int, int]] = {}
+        completed_chunks = 0
+
+        def chapter_done(chapter_num: int, chapter_audio: str | None) -> None:
+            results[chapter_num] = chapter_audio
+            trace.end(chapter_spans[chapter_num], failed_chunks=failed[chapter_num])
+            if on_chapter_done:
+                on_chapter_done(chapter_num, chapter_audio, failed[chapter_num] == 0)
+
+        try:
+            # Report chunks in completion order; reassemble in chunk order.
+            # With a cancel token the wait wakes up periodically, so a
+            # cancellation or deadline is noticed while requests are in flight.
+            not_done = set(futures)
+            while not_done:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                done, not_done = wait(
+                    not_done,
+                    timeout=CANCEL_POLL_SECONDS if cancel_token else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    if future in combines:
+                        chapter_num, combine_span = combines.pop(future)
+                        try:
+                            chapter_audio = future.result()
+                        finally:
+                            trace.end(combine_span)
+                        chapter_done(chapter_num, chapter_audio)
+                        continue
+
+                    chapter_num, i, total_chunks, chunk_filename = futures[future]
+                    try:
+                        future.result()
+                    except JobCancelled:
+                        failed[chapter_num] += 1
+                    except Exception as e:
+                        print(f"Error generating audio for chapter {chapter_num}, chunk {i+1}: {e}")
+                        failed[chapter_num] += 1
+                        if progress_callback:
+                            progress_callback(
+                                stage="chunk_failed",
+                                chapter_index=chapter_num,
+                                chunk_index=i + 1,
+                                error=f"{type(e).__name__}: {e}",
+                            )
+                    else:
+                        chunk_files[chapter_num][i] = chunk_filename
+                        if manifest:
+                            manifest.record_chunk(chapter_num, i + 1, chunk_filename)
+                        completed_chunks += 1
+                        eta.complete(work.get(future, 0.0))
+                        if progress_callback:
+                            progress_callback(
+                                stage="chunk",
+                                chapter_index=chapter_num,
+                                chunk_index=i + 1,
+                                total_chunks=total_chunks,
+                                completed_chunks=completed_chunks,
+                                work_fraction=eta.fraction_done,
+                                eta_seconds=eta.eta_seconds(),
+                            )
+
+                    pending[chapter_num] -= 1
+                    if pending[chapter_num] == 0 and failed[chapter_num]:
+                        # Combining would delete the chunks that did finish.
+                        chapter_done(chapter_num, None)
+                    elif pending[chapter_num] == 0:
+                        files = chunk_files[chapter_num]
+                        audio_files = [files[index] for index in sorted(files)]
+                        combine_span = trace.start(
+                            "combine", parent=chapter_spans[chapter_num], chunks=len(audio_files)
+                        )
+                        combine = self._finalize_chapter_audio(audio_files, chapter_num, book_folder)
+                        combines[combine] = (chapter_num, combine_span)
+                        not_done.add(combine)
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return results
+
+    def _run_chunk(self, synthesize: Callable[[], Path], cost_chars: int,
+                   retry_budget: RetryBudget, cancel_token: CancellationToken | None,
+                   trace: JobTrace, chunk_span: int, queued_span: int) -> Path:
+        """Run one scheduled chunk, retrying transient upstream failures.
+
+        Rate limits pause the whole scheduler for the backoff, so every job
+        slows down together instead of retrying at once. While the audio pool
+        is full the request waits, so synthesis doesn't outrun mixing. Each
+        attempt, backoff and wait is recorded under the chunk's span.
+        """
+        trace.end(queued_span)
+        attempt = 1
+        try:
+            while True:
+                if self.audio_pool.saturated():
+                    with trace.span("audio_backpressure", parent=chunk_span):
+                        self.audio_pool.wait_for_capacity(cancel_token)
+                try:
+                    with trace.span("request", parent=chunk_span, attempt=attempt):
+                        return synthesize()
+                except Exception as exc:
+                    kind = classify_error(exc)
+                    if (kind not in RETRYABLE or attempt >= self.retry_policy.max_attempts
+                            or not retry_budget.try_spend()):
+                        trace.end(chunk_span, attempts=attempt, error=kind)
+                        raise
+                    delay = self.retry_policy.delay(attempt, retry_after_seconds(exc))
+                    if kind == RATE_LIMIT:
+                        self.scheduler.pause(delay)
+                    UPSTREAM_RETRIES.inc(service="tts")
+                    print(f"Retrying TTS chunk after {kind} (attempt {attempt}) in {delay:.1f}s: {exc}")
+                with trace.span("backoff", parent=chunk_span, reason=kind, seconds=round(delay, 2)):
+                    if cancel_token:
+                        cancel_token.sleep(delay)
+                    else:
+                        time.sleep(delay)
+                    self.scheduler.throttle(cost_chars)
+                attempt += 1
+        finally:
+            trace.end(chunk_span, attempts=attempt)
+
+    def _finalize_chapter_audio(self, audio_files: List[Path], chapter_num: int,
+                                book_folder: Path) -> Future:
+        """Turn a chapter's ordered chunk files into a single chapter file.
+
+        Returns a future for the chapter file path (None without audio).
+        """
+        # If multiple chunks, combine them into one chapter file on the audio pool
         if len(audio_files) > 1:
             chapter_filename = book_folder / "audio" / f"chapter_{chapter_num:02d}.mp3"
-            self._combine_audio_files(audio_files, chapter_filename)
-            
-            # Clean up chunk files
-            for file in audio_files:
-                file.unlink()
-                
-            return str(chapter_filename)
+            return self.audio_pool.submit(combine_chapter, audio_files, chapter_filename, CHUNK_PAUSE_MS)
         elif len(audio_files) == 1:
             # Rename single file to chapter format
             chapter_filename = book_folder / "audio" / f"chapter_{chapter_num:02d}.mp3"
             audio_files[0].rename(chapter_filename)
-            return str(chapter_filename)
-        
-        return None
+            return _completed_future(str(chapter_filename))
+
+        return _completed_future(None)
     
-    def _combine_audio_files(self, audio_files: List[Path], output_file: Path):
-        """Combine multiple audio files into one using pydub."""
+    def _synthesize_chunk(self, chunk: str, chunk_filename: Path, voice: str,
+                          speed: float, instructions: str | None,
+                          cache_key: str | None = None,
+                          cancel_token: CancellationToken | None = None) -> Path:
+        """Synthesize a single text chunk to an MP3 file.
+
+        The audio is streamed to disk so a cancelled job stops mid-response;
+        a partial file is removed.
+        """
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+        api_params = {
+            "model": TTS_MODEL,
+            "voice": voice,
+            "input": chunk,
+            "speed": speed
+        }
+
+        # Add instructions if provided
+        if instructions:
+            api_params["instructions"] = instructions
+        if cancel_token and cancel_token.remaining() is not None:
+            api_params["timeout"] = max(1.0, cancel_token.remaining())
+
+        concurrency = self.scheduler.stats()["active"]
+        started = time.monotonic()
         try:
-            from pydub import AudioSegment
-            
-            combined = AudioSegment.empty()
-            for file in audio_files:
-                if file.exists():
-                    audio = AudioSegment.from_mp3(file)
-                    combined += audio
-                    combined += AudioSegment.silent(duration=500)  # 500ms pause between chunks
-            
-            combined.export(output_file, format="mp3")
-            
-        except ImportError:
-            print("pydub not available, keeping separate chunk files")
-            # If pydub fails, just use the first chunk
-            if audio_files and audio_files[0].exists():
-                audio_files[0].rename(output_file)
+            with upstream_call("tts", TTS_CHUNK_SECONDS), \
+                    self.client.audio.speech.with_streaming_response.create(**api_params) as response, \
+                    open(chunk_filename, "wb") as handle:
+                for data in response.iter_bytes(SPEECH_STREAM_CHUNK_BYTES):
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    handle.write(data)
+        except BaseException:
+            chunk_filename.unlink(missing_ok=True)
+            raise
+        elapsed = time.monotonic() - started
+        TTS_SECONDS_PER_CHAR.observe(elapsed / max(1, len(chunk)))
+        self.latency_model.observe(len(chunk), voice, speed, len(instructions or ""), concurrency, elapsed)
+        if self.cache and cache_key:
+            self.cache.store(cache_key, chunk_filename)
+        return chunk_filename
+
+    def _combine_audio_files(self, audio_files: List[Path], output_file: Path):
+        """Combine multiple audio files into one in this process (jobs use the audio pool)."""
+        combine_audio_files(audio_files, output_file, CHUNK_PAUSE_MS)
     
     def save_text_content(self, book_title: str, outline: str, chapters: List[str], 
                          book_folder: Path):
@@ -176,43 +387,78 @@ class AudiobookGenerator:
     def generate_audiobook(self, book_title: str, outline: str, chapters: List[str],
                           voice: str = "alloy", speed: float = 1.0,
                           include_outline: bool = True, voice_instructions: str = None,
-                          progress_callback=None, output_dir: Path | None = None) -> Tuple[str, List[str]]:
-        """Generate complete audiobook with organized folder structure."""
-        
+                          progress_callback=None, output_dir: Path | None = None,
+                          manifest: JobManifest | None = None,
+                          trace: JobTrace | None = None,
+                          cancel_token: CancellationToken | None = None) -> Tuple[str, List[str]]:
+        """Generate complete audiobook with organized folder structure.
+
+        When a `manifest` is given, finished chapters and chunks are
+        checkpointed to it and any recorded there are skipped. Timings of
+        each stage are recorded as spans in `trace`. If `cancel_token` fires,
+        the partial book folder is removed and JobCancelled is raised.
+        """
+        trace = trace or JobTrace()
+
         # Create book folder
         book_folder = self.create_book_folder(book_title, output_dir=output_dir)
         
         # Save all text content
-        self.save_text_content(book_title, outline, chapters, book_folder)
+        with trace.span("save_text"):
+            self.save_text_content(book_title, outline, chapters, book_folder)
         
-        audio_files = []
-        
-        # Generate outline audio if requested
-        if include_outline:
-            outline_audio = self.generate_chapter_audio(
-                f"Book Outline. {outline}", 0, book_folder, voice, speed,
-                voice_instructions, progress_callback
-            )
-            if outline_audio:
-                # Rename to outline
-                outline_path = book_folder / "audio" / "00_outline.mp3"
-                Path(outline_audio).rename(outline_path)
-                audio_files.append(str(outline_path))
-        
-        # Generate chapter audio for every chapter
         total_chapters = len(chapters)
-        for index, chapter in enumerate(chapters, 1):
-            chapter_audio = self.generate_chapter_audio(
-                chapter, index, book_folder, voice, speed, voice_instructions,
-                progress_callback
-            )
+        completed_chapters = 0
+        chapter_audio_files: Dict[int, str] = {}
+
+        def on_chapter_done(chapter_num: int, chapter_audio: str | None, complete: bool) -> None:
+            nonlocal completed_chapters
+            outline_path = book_folder / "audio" / "00_outline.mp3"
+            if chapter_num == 0 and chapter_audio and Path(chapter_audio) != outline_path:
+                # Rename to outline
+                Path(chapter_audio).rename(outline_path)
+                chapter_audio = str(outline_path)
             if chapter_audio:
-                audio_files.append(chapter_audio)
+                chapter_audio_files[chapter_num] = chapter_audio
+            if manifest and complete:
+                # Chapters missing chunks keep their finished chunks for resume.
+                manifest.record_chapter(chapter_num, chapter_audio)
+            if chapter_num == 0:
+                return
+            completed_chapters += 1
             if progress_callback:
                 progress_callback(
                     stage="chapter",
-                    chapter_index=index,
+                    chapter_index=chapter_num,
+                    completed_chapters=completed_chapters,
                     total_chapters=total_chapters,
                 )
+
+        # Queue the outline (if requested) and every chapter as one batch,
+        # skipping chapters a previous run already finished.
+        work = [(index, chapter) for index, chapter in enumerate(chapters, 1)]
+        if include_outline:
+            work.insert(0, (0, f"Book Outline. {outline}"))
+
+        remaining = []
+        for chapter_num, chapter_text in work:
+            finished = manifest.chapter_file(chapter_num) if manifest else None
+            if finished:
+                name = _chapter_span_name(chapter_num)
+                trace.end(trace.start(name, track=name, chapter=chapter_num, source="checkpoint"))
+                on_chapter_done(chapter_num, finished, True)
+            else:
+                remaining.append((chapter_num, chapter_text))
+
+        try:
+            self._generate_chapters_audio(
+                remaining, book_folder, voice, speed, voice_instructions,
+                progress_callback, on_chapter_done, manifest, trace, cancel_token
+            )
+        except JobCancelled:
+            shutil.rmtree(book_folder, ignore_errors=True)
+            raise
+
+        audio_files = [chapter_audio_files[index] for index in sorted(chapter_audio_files)]
         
         return str(book_folder), audio_files
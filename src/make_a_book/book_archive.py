@@ -0,0 +1,72 @@
+import io
+import zipfile
+from pathlib import Path
+from typing import Iterator
+
+
+# Already-compressed formats are stored as-is; deflating them only costs CPU.
+STORED_SUFFIXES = {".mp3"}
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink that hands out whatever was written so far.
+
+    zipfile detects that it cannot seek and writes data descriptors after each
+    entry instead of patching local headers, which is what makes streaming work.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._buffer = bytearray()
+        self._offset = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_book_zip(book_folder: Path, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """Yield a ZIP of `book_folder` piece by piece without touching the disk.
+
+    Entries are rooted at the folder name, matching shutil.make_archive with
+    base_dir set to the folder. MP3s are stored; text is deflated.
+    """
+    book_folder = Path(book_folder)
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, "w") as archive:
+        for path in sorted(book_folder.rglob("*")):
+            if not path.is_file():
+                continue
+            arcname = (Path(book_folder.name) / path.relative_to(book_folder)).as_posix()
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            if path.suffix.lower() in STORED_SUFFIXES:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+
+            force_zip64 = info.file_size >= zipfile.ZIP64_LIMIT
+            with open(path, "rb") as source, archive.open(info, "w", force_zip64=force_zip64) as dest:
+                while block := source.read(chunk_size):
+                    dest.write(block)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            data = sink.drain()
+            if data:
+                yield data
+
+    # Central directory
+    yield sink.drain()
@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once its token is cancelled or its deadline passes."""
+
+
+class CancellationToken:
+    """Cooperative stop signal for one job, with an optional wall-clock deadline.
+
+    Work checks the token between steps (`raise_if_cancelled`) and bounds
+    blocking calls by `remaining()`; nothing is interrupted forcibly.
+    """
+
+    def __init__(self, deadline_at: float | None = None):
+        self.deadline_at = deadline_at
+        self._event = threading.Event()
+        self._reason: str | None = None
+
+    def cancel(self, reason: str = "Cancelled") -> None:
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._event.is_set() and self.deadline_at is not None and time.time() >= self.deadline_at:
+            self.cancel("Deadline exceeded")
+        return self._event.is_set()
+
+    @property
+    def reason(self) -> str | None:
+        return self._reason if self.cancelled else None
+
+    def remaining(self) -> float | None:
+        """Seconds until the deadline, or None without one."""
+        if self.deadline_at is None:
+            return None
+        return max(0.0, self.deadline_at - time.time())
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to `seconds`, raising JobCancelled as soon as the token fires."""
+        remaining = self.remaining()
+        self._event.wait(seconds if remaining is None else min(seconds, remaining))
+        self.raise_if_cancelled()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled(self._reason)
@@ -1,5 +1,18 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
+
 import dspy
 
+from .llm_cache import LLMResponseCache, current_model_id
+from .metrics import LLM_CALL_SECONDS, UPSTREAM_RETRIES, upstream_call
+from .outline_parser import OutlineChapter, parse_outline_chapters
+
+
+DEFAULT_CHAPTER_CONCURRENCY = int(os.getenv("CHAPTER_CONCURRENCY", "4"))
+DEFAULT_CHAPTER_ATTEMPTS = 3
+
 class ChapterGenerator(dspy.Signature):
     """Generate detailed chapters for a book based on the outline."""
     
@@ -13,20 +26,183 @@ class ChapterGenerator(dspy.Signature):
         desc="An array of chapter contents in outline order; one string per chapter"
     )
 
+class SingleChapterGenerator(dspy.Signature):
+    """Write one chapter of a book, consistent with the full outline."""
+
+    book_outline: str = dspy.InputField(
+        desc="The complete book outline, for context and continuity"
+    )
+    chapter_heading: str = dspy.InputField(desc="Heading of the chapter to write")
+    chapter_summary: str = dspy.InputField(desc="The outline's notes for this chapter")
+    chapter_number: int = dspy.InputField(desc="Position of this chapter in the book")
+    total_chapters: int = dspy.InputField(desc="Number of chapters in the book")
+    target_duration_minutes: int = dspy.InputField(
+        desc="Target duration in minutes for this chapter alone"
+    )
+    chapter: str = dspy.OutputField(desc="The full text of this chapter only")
+
 class ChapterCreator:
-    def __init__(self, lm):
+    def __init__(self, lm, max_concurrency: int = DEFAULT_CHAPTER_CONCURRENCY,
+                 max_attempts: int = DEFAULT_CHAPTER_ATTEMPTS, cache: LLMResponseCache | None = None):
         # Configure DSPy once per process to avoid cross-thread reconfiguration.
         if getattr(dspy.settings, "lm", None) is None:
             dspy.settings.configure(lm=lm)
         self.generate_chapters = dspy.Predict(ChapterGenerator)
+        self.generate_chapter = dspy.Predict(SingleChapterGenerator)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.cache = cache
     
-    def create_chapters(self, book_outline: str, target_duration_minutes: int) -> list[str]:
+    def create_chapters(self, book_outline: str, target_duration_minutes: int,
+                        regenerate: bool = False) -> list[str]:
         """Generate all chapters for the outline in a single call."""
-        result = self.generate_chapters(
-            book_outline=book_outline,
-            target_duration_minutes=target_duration_minutes
+        inputs = {"book_outline": book_outline, "target_duration_minutes": target_duration_minutes}
+        key, cached = self._cached("chapters", inputs, regenerate)
+        if cached is not None:
+            return cached
+        with upstream_call("llm", LLM_CALL_SECONDS, operation="chapters"):
+            result = self.generate_chapters(**inputs)
+        return self._remember(key, self._normalize_chapters(result.chapters))
+
+    async def acreate_chapters(self, book_outline: str, target_duration_minutes: int,
+                               regenerate: bool = False) -> list[str]:
+        """Async variant of create_chapters that doesn't block the event loop."""
+        inputs = {"book_outline": book_outline, "target_duration_minutes": target_duration_minutes}
+        key, cached = self._cached("chapters", inputs, regenerate)
+        if cached is not None:
+            return cached
+        with upstream_call("llm", LLM_CALL_SECONDS, operation="chapters"):
+            result = await self.generate_chapters.acall(**inputs)
+        return self._remember(key, self._normalize_chapters(result.chapters))
+
+    def create_chapters_per_chapter(self, book_outline: str, target_duration_minutes: int,
+                                    regenerate: bool = False) -> list[str]:
+        """Generate each outlined chapter in its own concurrent call.
+
+        Falls back to create_chapters when the outline has fewer than two
+        "Chapter …" entries.
+        """
+        entries = parse_outline_chapters(book_outline)
+        if len(entries) < 2:
+            return self.create_chapters(book_outline, target_duration_minutes, regenerate)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(entries))) as executor:
+            return list(executor.map(
+                lambda entry: self._write_chapter(
+                    book_outline, entry, len(entries), target_duration_minutes, regenerate
+                ),
+                entries,
+            ))
+
+    async def acreate_chapters_per_chapter(self, book_outline: str, target_duration_minutes: int,
+                                           regenerate: bool = False) -> list[str]:
+        """Async variant of create_chapters_per_chapter."""
+        chapters = {}
+        async for index, chapter in self.aiter_chapters(book_outline, target_duration_minutes, regenerate):
+            chapters[index] = chapter
+        return [chapters[index] for index in sorted(chapters)]
+
+    async def aiter_chapters(self, book_outline: str, target_duration_minutes: int,
+                             regenerate: bool = False) -> AsyncIterator[tuple[int, str]]:
+        """Yield (index, chapter) pairs as soon as each chapter is written.
+
+        Chapters arrive in completion order; a chapter that still fails after
+        retrying raises and cancels the rest.
+        """
+        entries = parse_outline_chapters(book_outline)
+        if len(entries) < 2:
+            chapters = await self.acreate_chapters(book_outline, target_duration_minutes, regenerate)
+            for index, chapter in enumerate(chapters):
+                yield index, chapter
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def write(index: int, entry: OutlineChapter) -> tuple[int, str]:
+            async with semaphore:
+                return index, await self._awrite_chapter(
+                    book_outline, entry, len(entries), target_duration_minutes, regenerate
+                )
+
+        tasks = [asyncio.create_task(write(index, entry)) for index, entry in enumerate(entries)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _prepare_chapter(self, book_outline: str, entry: OutlineChapter, total_chapters: int,
+                         target_duration_minutes: int, regenerate: bool) -> tuple[dict, str | None, str | None]:
+        """Return (inputs, cache key, cached chapter or None) for one chapter call."""
+        inputs = {
+            "book_outline": book_outline,
+            "chapter_heading": entry.heading,
+            "chapter_summary": entry.summary,
+            "chapter_number": entry.number,
+            "total_chapters": total_chapters,
+            "target_duration_minutes": max(1, round(target_duration_minutes / total_chapters)),
+        }
+        key, cached = self._cached("chapter", inputs, regenerate)
+        return inputs, key, cached
+
+    def _chapter_attempt_failed(self, entry: OutlineChapter, attempt: int, exc: Exception) -> None:
+        """Record a failed chapter attempt, raising once attempts are exhausted."""
+        if attempt == self.max_attempts:
+            raise RuntimeError(f"{entry.heading} failed after {attempt} attempts: {exc}") from exc
+        UPSTREAM_RETRIES.inc(service="llm")
+        print(f"Retrying {entry.heading} (attempt {attempt} failed): {exc}")
+
+    def _write_chapter(self, book_outline: str, entry: OutlineChapter, total_chapters: int,
+                       target_duration_minutes: int, regenerate: bool = False) -> str:
+        inputs, key, cached = self._prepare_chapter(
+            book_outline, entry, total_chapters, target_duration_minutes, regenerate
+        )
+        if cached is not None:
+            return cached
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with upstream_call("llm", LLM_CALL_SECONDS, operation="chapter"):
+                    result = self.generate_chapter(**inputs)
+                return self._remember(key, self._chapter_text(result))
+            except Exception as exc:
+                self._chapter_attempt_failed(entry, attempt, exc)
+
+    async def _awrite_chapter(self, book_outline: str, entry: OutlineChapter, total_chapters: int,
+                              target_duration_minutes: int, regenerate: bool = False) -> str:
+        inputs, key, cached = self._prepare_chapter(
+            book_outline, entry, total_chapters, target_duration_minutes, regenerate
         )
-        chapters = result.chapters
+        if cached is not None:
+            return cached
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with upstream_call("llm", LLM_CALL_SECONDS, operation="chapter"):
+                    result = await self.generate_chapter.acall(**inputs)
+                return self._remember(key, self._chapter_text(result))
+            except Exception as exc:
+                self._chapter_attempt_failed(entry, attempt, exc)
+
+    def _cached(self, operation: str, inputs: dict, regenerate: bool):
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(operation, current_model_id(), **inputs)
+        return key, self.cache.lookup(key, bypass=regenerate)
+
+    def _remember(self, key: str | None, value):
+        if key is not None and value:
+            self.cache.put(key, value)
+        return value
+
+    @staticmethod
+    def _chapter_text(result) -> str:
+        text = str(result.chapter or "").strip()
+        if not text:
+            raise ValueError("empty chapter")
+        return text
+
+    @staticmethod
+    def _normalize_chapters(chapters) -> list[str]:
         if chapters is None:
             return []
         if isinstance(chapters, list):
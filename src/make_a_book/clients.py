@@ -0,0 +1,209 @@
+"""Process-wide, pooled clients for the upstream APIs.
+
+Every job and request shares one OpenAI client per API key, so connections
+(and their TCP and TLS handshakes) are reused instead of rebuilt per job,
+per preview or per Streamlit click. The keep-alive pool is sized to the TTS
+concurrency and speaks HTTP/2 when `h2` is installed. Shared clients must
+never be closed by a caller; cancelling a job only closes its own response.
+
+Anthropic calls go through dspy/litellm, which keeps its own pooled httpx
+client per process, so sharing the `dspy.LM` objects is enough there.
+
+The OpenAI SDK and dspy are imported on first use; together they take over a
+second to import, which a cold start should not pay before it can answer.
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .tts_scheduler import DEFAULT_TTS_CONCURRENCY
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+DEFAULT_HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+
+# Connections beyond the TTS workers, for previews and other one-off calls.
+EXTRA_CONNECTIONS = 2
+
+
+class ConnectionStats:
+    """Counts requests and newly opened connections for one pool."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self._seen: weakref.WeakSet = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def record(self, connections: list) -> None:
+        """Count one finished request given the pool's current connections."""
+        with self._lock:
+            self.requests += 1
+            for connection in connections:
+                if connection not in self._seen:
+                    self._seen.add(connection)
+                    self.connections_opened += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            reused = max(0, self.requests - self.connections_opened)
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "reused_requests": reused,
+                "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            }
+
+
+class _TrackedTransport(httpx.HTTPTransport):
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = super().handle_request(request)
+        self.stats.record(self._pool.connections)
+        return response
+
+    def open_connections(self) -> int:
+        return len(self._pool.connections)
+
+
+class _TrackedAsyncTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, stats: ConnectionStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await super().handle_async_request(request)
+        self.stats.record(self._pool.connections)
+        return response
+
+    def open_connections(self) -> int:
+        return len(self._pool.connections)
+
+
+class ClientRegistry:
+    """Creates each upstream client once and hands out the same instance."""
+
+    def __init__(self, concurrency: int = DEFAULT_TTS_CONCURRENCY,
+                 http2: bool = HTTP2_AVAILABLE,
+                 keepalive_seconds: float = DEFAULT_HTTP_KEEPALIVE_SECONDS):
+        concurrency = max(1, concurrency)
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=concurrency + EXTRA_CONNECTIONS,
+            max_keepalive_connections=concurrency,
+            keepalive_expiry=keepalive_seconds,
+        )
+        self._lock = threading.Lock()
+        # key -> (client, transport, event loop reference or None)
+        self._clients: dict[tuple, tuple] = {}
+        self._lms: dict[tuple, object] = {}
+
+    def openai(self, api_key: str | None = None) -> "OpenAI":
+        """Shared synchronous OpenAI client for `api_key` (OPENAI_API_KEY by default)."""
+        from openai import DefaultHttpxClient, OpenAI
+
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        base_url = os.getenv("OPENAI_BASE_URL")
+        key = ("openai", api_key, base_url)
+        with self._lock:
+            if key not in self._clients:
+                transport = _TrackedTransport(ConnectionStats(), http2=self.http2, limits=self.limits)
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=DefaultHttpxClient(transport=transport),
+                )
+                self._clients[key] = (client, transport, None)
+            return self._clients[key][0]
+
+    def async_openai(self, api_key: str | None = None) -> "AsyncOpenAI":
+        """Shared async OpenAI client for the running event loop.
+
+        Async connections belong to the loop that opened them, so each loop
+        gets its own client; clients of closed loops are dropped.
+        """
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        loop = asyncio.get_running_loop()
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        base_url = os.getenv("OPENAI_BASE_URL")
+        key = ("async_openai", api_key, base_url, id(loop))
+        with self._lock:
+            self._drop_closed_loops()
+            if key not in self._clients:
+                transport = _TrackedAsyncTransport(ConnectionStats(), http2=self.http2, limits=self.limits)
+                client = AsyncOpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=DefaultAsyncHttpxClient(transport=transport),
+                )
+                self._clients[key] = (client, transport, weakref.ref(loop))
+            return self._clients[key][0]
+
+    def lm(self, model: str, **kwargs: object):
+        """Shared `dspy.LM` for `model` and these settings."""
+        import dspy
+
+        key = (model, tuple(sorted(kwargs.items())))
+        with self._lock:
+            if key not in self._lms:
+                self._lms[key] = dspy.LM(model=model, **kwargs)
+            return self._lms[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._drop_closed_loops()
+            pools = [
+                {
+                    "client": key[0],
+                    "open_connections": transport.open_connections(),
+                    **transport.stats.snapshot(),
+                }
+                for key, (_, transport, _) in self._clients.items()
+            ]
+            lms = len(self._lms)
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_seconds": self.limits.keepalive_expiry,
+            "pools": pools,
+            "lms": lms,
+        }
+
+    def close(self) -> None:
+        """Close the synchronous clients (on process shutdown only)."""
+        with self._lock:
+            for key in [key for key, entry in self._clients.items() if entry[2] is None]:
+                self._clients.pop(key)[0].close()
+
+    def _drop_closed_loops(self) -> None:
+        for key, (_, _, loop_ref) in list(self._clients.items()):
+            if loop_ref is not None:
+                loop = loop_ref()
+                if loop is None or loop.is_closed():
+                    del self._clients[key]
+
+
+_default_clients: ClientRegistry | None = None
+_default_clients_lock = threading.Lock()
+
+
+def get_clients() -> ClientRegistry:
+    """Return the process-wide client registry shared by every code path."""
+    global _default_clients
+    with _default_clients_lock:
+        if _default_clients is None:
+            _default_clients = ClientRegistry()
+        return _default_clients
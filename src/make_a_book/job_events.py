@@ -0,0 +1,41 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+
+class JobEventBroker:
+    """Fan out job events from worker threads to async subscribers.
+
+    Audiobook jobs run on plain threads while SSE clients wait on the event
+    loop, so each subscriber is an asyncio.Queue fed via call_soon_threadsafe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Register a queue for `job_id`; call from the event loop."""
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[job_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(job_id, set())
+            for entry in [entry for entry in subscribers if entry[1] is queue]:
+                subscribers.discard(entry)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    def publish(self, job_id: str, event: dict) -> None:
+        """Deliver `event` to every subscriber of `job_id`; safe from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # The subscriber's loop has closed.
+                self.unsubscribe(job_id, queue)
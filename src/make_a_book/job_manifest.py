@@ -0,0 +1,64 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+
+class JobManifest:
+    """Checkpoint of an audiobook job's finished work, kept in its job folder.
+
+    Records the original request plus every chunk and chapter file already
+    produced, so a restarted job only synthesizes what is still missing.
+    Each change is written atomically (temp file + rename).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data = {"request": None, "chunks": {}, "chapters": {}}
+        if self.path.exists():
+            self._data.update(json.loads(self.path.read_text(encoding="utf-8")))
+
+    @property
+    def request(self) -> dict | None:
+        return self._data["request"]
+
+    def save_request(self, request: dict) -> None:
+        with self._lock:
+            self._data["request"] = request
+            self._write()
+
+    def chunk_file(self, chapter_num: int, chunk_index: int) -> Path | None:
+        """Return the finished file for a chunk if it is still on disk."""
+        with self._lock:
+            name = self._data["chunks"].get(str(chapter_num), {}).get(str(chunk_index))
+        if name and Path(name).exists():
+            return Path(name)
+        return None
+
+    def chapter_file(self, chapter_num: int) -> str | None:
+        """Return the finished file for a chapter if it is still on disk."""
+        with self._lock:
+            name = self._data["chapters"].get(str(chapter_num))
+        if name and Path(name).exists():
+            return name
+        return None
+
+    def record_chunk(self, chapter_num: int, chunk_index: int, path: Path) -> None:
+        with self._lock:
+            self._data["chunks"].setdefault(str(chapter_num), {})[str(chunk_index)] = str(path)
+            self._write()
+
+    def record_chapter(self, chapter_num: int, path: str | None) -> None:
+        with self._lock:
+            # Chunk files are removed once a chapter is combined.
+            self._data["chunks"].pop(str(chapter_num), None)
+            if path:
+                self._data["chapters"][str(chapter_num)] = str(path)
+            self._write()
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._data), encoding="utf-8")
+        os.replace(tmp_path, self.path)
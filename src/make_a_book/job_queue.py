@@ -0,0 +1,182 @@
+import heapq
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable
+
+from .metrics import QUEUE_WAIT_SECONDS
+
+
+# Sized for a small (1 CPU, 1 GB) machine: each running job holds a generator,
+# its chunk files and any pydub re-encode in memory.
+DEFAULT_JOB_WORKERS = int(os.getenv("AUDIOBOOK_JOB_WORKERS", "2"))
+DEFAULT_JOB_QUEUE_DEPTH = int(os.getenv("AUDIOBOOK_QUEUE_DEPTH", "8"))
+
+# Assumed duration of a job submitted without an estimate.
+DEFAULT_JOB_SECONDS = 300.0
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its maximum depth."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobQueue:
+    """Fixed pool of worker threads fed from a bounded FIFO of jobs.
+
+    Each job carries an estimated duration, so the queue can tell a caller
+    its position and roughly when it will start. Running jobs can refine their
+    estimate as they progress with `report_remaining`.
+    """
+
+    def __init__(self, workers: int = DEFAULT_JOB_WORKERS,
+                 max_depth: int = DEFAULT_JOB_QUEUE_DEPTH,
+                 thread_name_prefix: str = "audiobook-job"):
+        self.workers = max(1, workers)
+        # A job waits here until a worker picks it up, even when one is idle,
+        # so a depth of zero would reject every submission.
+        self.max_depth = max(1, max_depth)
+        self.thread_name_prefix = thread_name_prefix
+        self._queue: deque = deque()
+        # job_id -> (future, monotonic time the job is expected to finish)
+        self._running: dict[str, tuple[Future, float]] = {}
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    def submit(self, job_id: str, fn: Callable[[], object],
+               estimated_seconds: float | None = None, force: bool = False) -> Future:
+        """Queue `fn` as job `job_id` and return its future.
+
+        Raises QueueFullError once `max_depth` jobs are waiting, unless `force`
+        is set (used for jobs that were admitted before a restart). A job that
+        is already queued or running is not queued twice.
+        """
+        estimate = estimated_seconds if estimated_seconds is not None else DEFAULT_JOB_SECONDS
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Job queue is shut down")
+            existing = self._find(job_id)
+            if existing is not None:
+                return existing
+            if not force and len(self._queue) >= self.max_depth:
+                raise QueueFullError(self._retry_after_locked())
+            future: Future = Future()
+            self._queue.append((job_id, future, fn, max(0.0, estimate), time.monotonic()))
+            self._start_workers()
+            self._condition.notify()
+        return future
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._condition:
+            return self._find(job_id) is not None
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a job that has not started yet; returns False if it is not queued."""
+        with self._condition:
+            for entry in self._queue:
+                if entry[0] == job_id:
+                    self._queue.remove(entry)
+                    entry[1].cancel()
+                    return True
+        return False
+
+    def report_remaining(self, job_id: str, seconds: float) -> None:
+        """Update how long a running job still expects to take."""
+        with self._condition:
+            if job_id in self._running:
+                future, _ = self._running[job_id]
+                self._running[job_id] = (future, time.monotonic() + max(0.0, seconds))
+
+    def position(self, job_id: str) -> tuple[int, float] | None:
+        """Return (1-based queue position, seconds until it should start), or None if not queued."""
+        with self._condition:
+            for index, start in enumerate(self._start_times_locked()):
+                if self._queue[index][0] == job_id:
+                    return index + 1, start
+        return None
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "workers": self.workers,
+                "running": len(self._running),
+                "queued": len(self._queue),
+                "max_depth": self.max_depth,
+            }
+
+    def shutdown(self) -> None:
+        """Stop taking jobs and cancel the ones that have not started."""
+        with self._condition:
+            self._closed = True
+            while self._queue:
+                self._queue.popleft()[1].cancel()
+            self._condition.notify_all()
+
+    def _find(self, job_id: str) -> Future | None:
+        if job_id in self._running:
+            return self._running[job_id][0]
+        for queued_id, future, *_ in self._queue:
+            if queued_id == job_id:
+                return future
+        return None
+
+    def _start_times_locked(self) -> list[float]:
+        """Seconds from now until each queued job should start, in queue order."""
+        now = time.monotonic()
+        free = [max(0.0, ends_at - now) for _, ends_at in self._running.values()]
+        free += [0.0] * (self.workers - len(free))
+        heapq.heapify(free)
+        starts = []
+        for _, _, _, estimate, _ in self._queue:
+            start = heapq.heappop(free)
+            starts.append(start)
+            heapq.heappush(free, start + estimate)
+        return starts
+
+    def _retry_after_locked(self) -> int:
+        # A place frees up when the job at the head of the queue starts.
+        starts = self._start_times_locked()
+        return max(1, math.ceil(starts[0])) if starts else 1
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"{self.thread_name_prefix}_{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                job_id, future, fn, estimate, queued_at = self._queue.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._running[job_id] = (future, time.monotonic() + estimate)
+            QUEUE_WAIT_SECONDS.observe(time.monotonic() - queued_at, queue="jobs")
+
+            try:
+                result = fn()
+            except BaseException as exc:
+                self._finish(job_id)
+                future.set_exception(exc)
+            else:
+                self._finish(job_id)
+                future.set_result(result)
+
+    def _finish(self, job_id: str) -> None:
+        with self._condition:
+            self._running.pop(job_id, None)
@@ -0,0 +1,154 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+# Progress-only updates are held in memory and written at most this often.
+DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audiobook_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audiobook_jobs_status ON audiobook_jobs (status);
+"""
+
+
+class JobStore:
+    """Durable audiobook job state in SQLite (WAL mode).
+
+    `status` is a real, indexed column; every other field lives in a JSON
+    document. Updates that change `status` are written immediately; progress
+    updates are buffered and flushed in batches, and reads merge the buffer so
+    callers always see the latest values.
+    """
+
+    def __init__(self, path: Path, flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict] = {}
+        self._last_flush = time.monotonic()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def create(self, job_id: str, **fields: object) -> None:
+        now = time.time()
+        data = dict(fields)
+        status = str(data.pop("status", "queued"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO audiobook_jobs (job_id, status, data, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job_id, status, json.dumps(data), now, now),
+            )
+
+    def update(self, job_id: str, durable: bool = False, **fields: object) -> None:
+        """Merge `fields` into a job; status changes are always durable."""
+        with self._lock:
+            self._pending.setdefault(job_id, {}).update(fields)
+            stale = time.monotonic() - self._last_flush >= self.flush_interval
+            if durable or stale or "status" in fields:
+                self._flush_locked()
+
+    def update_if_status(self, job_id: str, statuses: tuple[str, ...], **fields: object) -> bool:
+        """Merge `fields` into a job only while its status is one of `statuses`.
+
+        The check and the write are one conditional UPDATE, so a concurrent
+        status change is never overwritten. Returns whether the job changed.
+        """
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            self._flush_locked()
+            row = self._conn.execute(
+                "SELECT status, data FROM audiobook_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            data = json.loads(row[1])
+            data.update(fields)
+            status = str(data.pop("status", row[0]))
+            cursor = self._conn.execute(
+                f"UPDATE audiobook_jobs SET status = ?, data = ?, updated_at = ? "
+                f"WHERE job_id = ? AND status IN ({placeholders})",
+                (status, json.dumps(data), time.time(), job_id, *statuses),
+            )
+            return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, data FROM audiobook_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            pending = dict(self._pending.get(job_id, {}))
+        if row is None:
+            return None
+        job = json.loads(row[1])
+        job["status"] = row[0]
+        job.update(pending)
+        return job
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._pending.pop(job_id, None)
+            self._conn.execute("DELETE FROM audiobook_jobs WHERE job_id = ?", (job_id,))
+
+    def list_by_status(self, *statuses: str) -> list[tuple[str, dict]]:
+        self.flush()
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id, status, data FROM audiobook_jobs WHERE status IN ({placeholders}) "
+                "ORDER BY created_at",
+                statuses,
+            ).fetchall()
+        jobs = []
+        for job_id, status, data in rows:
+            job = json.loads(data)
+            job["status"] = status
+            jobs.append((job_id, job))
+        return jobs
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        now = time.time()
+        self._conn.execute("BEGIN")
+        try:
+            for job_id, fields in self._pending.items():
+                row = self._conn.execute(
+                    "SELECT status, data FROM audiobook_jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                data = json.loads(row[1])
+                data.update(fields)
+                status = str(data.pop("status", row[0]))
+                self._conn.execute(
+                    "UPDATE audiobook_jobs SET status = ?, data = ?, updated_at = ? WHERE job_id = ?",
+                    (status, json.dumps(data), now, job_id),
+                )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,203 @@
+"""Span trees for audiobook jobs, saved as Chrome trace files.
+
+Spans are timed with a monotonic clock relative to the start of the job. The
+trace is stored in the Chrome trace event format, so `trace.json` in a job
+folder opens directly in Perfetto or chrome://tracing. Each span is drawn on
+the track of the thread that closed it, so a worker's queue wait and request
+nest under its chunk, unless the span names its own track (spans that overlap
+on one thread, like chapters, need one). The same file is turned back into
+the nested `timings` tree returned by the status API.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+
+TRACE_FILENAME = "trace.json"
+
+# Serializes read-modify-write of trace files (e.g. two downloads of one book).
+_file_lock = threading.Lock()
+
+
+class JobTrace:
+    """Thread-safe recorder of named, nested spans for one job."""
+
+    def __init__(self, name: str = "job", **attrs: object):
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._spans: Dict[int, dict] = {}
+        self.root: int | None = None
+        self.root = self.start(name, **attrs)
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def start(self, name: str, parent: int | None = None, track: str | None = None,
+              **attrs: object) -> int:
+        """Open a span under `parent` (the root by default) and return its id."""
+        span_id = next(self._ids)
+        thread = threading.current_thread()
+        span = {
+            "name": name,
+            "parent": parent or self.root,
+            "start": self._now(),
+            "end": None,
+            "track": (track, track) if track else (thread.ident, thread.name),
+            "fixed_track": track is not None,
+            "attrs": dict(attrs),
+        }
+        with self._lock:
+            self._spans[span_id] = span
+        return span_id
+
+    def end(self, span_id: int, **attrs: object) -> None:
+        """Close a span; closing it again only merges the new attributes."""
+        now = self._now()
+        thread = threading.current_thread()
+        with self._lock:
+            span = self._spans[span_id]
+            if span["end"] is None:
+                span["end"] = now
+                if not span["fixed_track"]:
+                    span["track"] = (thread.ident, thread.name)
+            span["attrs"].update(attrs)
+
+    @contextmanager
+    def span(self, name: str, parent: int | None = None, **attrs: object):
+        span_id = self.start(name, parent, **attrs)
+        try:
+            yield span_id
+        except BaseException as exc:
+            self.end(span_id, error=type(exc).__name__)
+            raise
+        finally:
+            self.end(span_id)
+
+    def finish(self, **attrs: object) -> None:
+        self.end(self.root, **attrs)
+
+    def chrome_trace(self) -> dict:
+        """Return the trace in Chrome's JSON object format; open spans end now."""
+        now = self._now()
+        with self._lock:
+            spans = [(span_id, dict(span)) for span_id, span in self._spans.items()]
+
+        tracks: Dict[object, int] = {}
+        events: List[dict] = []
+        for span_id, span in spans:
+            key, track_name = span["track"]
+            if key not in tracks:
+                tracks[key] = len(tracks) + 1
+                events.append({
+                    "name": "thread_name", "ph": "M", "pid": 1, "tid": tracks[key],
+                    "args": {"name": track_name},
+                })
+            end = span["end"] if span["end"] is not None else now
+            args = {"span_id": span_id, "parent_id": span["parent"], **span["attrs"]}
+            if span["end"] is None:
+                args["open"] = True
+            events.append({
+                "name": span["name"],
+                "ph": "X",
+                "ts": round(span["start"] * 1e6),
+                "dur": round((end - span["start"]) * 1e6),
+                "pid": 1,
+                "tid": tracks[key],
+                "args": args,
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"started_at": self.started_at},
+        }
+
+    def tree(self) -> dict | None:
+        return timings_from_trace(self.chrome_trace())
+
+    def write(self, path: Path) -> None:
+        write_trace(path, self.chrome_trace())
+
+
+def timings_from_trace(trace: dict) -> dict | None:
+    """Rebuild the nested span tree (seconds from job start) from a Chrome trace."""
+    nodes: Dict[int, dict] = {}
+    parents: Dict[int, int | None] = {}
+    for event in trace.get("traceEvents", []):
+        if event.get("ph") != "X":
+            continue
+        args = dict(event.get("args", {}))
+        span_id = args.pop("span_id")
+        parents[span_id] = args.pop("parent_id", None)
+        nodes[span_id] = {
+            "name": event["name"],
+            "start_seconds": round(event["ts"] / 1e6, 3),
+            "duration_seconds": round(event["dur"] / 1e6, 3),
+            "attributes": args,
+            "children": [],
+        }
+
+    root = None
+    for span_id, node in nodes.items():
+        parent = nodes.get(parents[span_id])
+        if parent is not None:
+            parent["children"].append(node)
+        elif root is None:
+            root = node
+    for node in nodes.values():
+        node["children"].sort(key=lambda child: child["start_seconds"])
+    return root
+
+
+def read_trace(path: Path) -> dict | None:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_trace(path: Path, trace: dict) -> None:
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(trace), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def append_span(path: Path, name: str, started_at: float, ended_at: float, **attrs: object) -> bool:
+    """Add a span measured outside the job (wall-clock times) under the saved root.
+
+    Returns False if the job has no trace file.
+    """
+    with _file_lock:
+        trace = read_trace(path)
+        if trace is None:
+            return False
+        events = trace["traceEvents"]
+        spans = [event for event in events if event.get("ph") == "X"]
+        root = next((event for event in spans if event["args"].get("parent_id") is None), None)
+        if root is None:
+            return False
+        tid = max((event["tid"] for event in events), default=0) + 1
+        origin = trace.get("otherData", {}).get("started_at", started_at)
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}})
+        events.append({
+            "name": name,
+            "ph": "X",
+            "ts": round((started_at - origin) * 1e6),
+            "dur": round((ended_at - started_at) * 1e6),
+            "pid": 1,
+            "tid": tid,
+            "args": {
+                "span_id": max(event["args"]["span_id"] for event in spans) + 1,
+                "parent_id": root["args"]["span_id"],
+                **attrs,
+            },
+        })
+        write_trace(path, trace)
+    return True
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+
+DEFAULT_LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+DEFAULT_LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+DEFAULT_LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def _normalize(value):
+    """Ignore whitespace that can't change what the model is asked."""
+    if isinstance(value, str):
+        return "\n".join(line.rstrip() for line in value.strip().replace("\r\n", "\n").splitlines())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def current_model_id() -> str:
+    """Identify the LM DSPy will call, for use in cache keys."""
+    import dspy
+
+    lm = dspy.settings.lm
+    return str(getattr(lm, "model", None) or lm)
+
+
+class LLMResponseCache:
+    """Two-tier cache of LLM results: an in-memory LRU over a disk store.
+
+    Disk entries are JSON files at `<root>/<key[:2]>/<key>.json`, evicted
+    least-recently-used once `max_disk_bytes` is exceeded. Entries older than
+    `ttl_seconds` are treated as misses and removed. Pass `root=None` for a
+    memory-only cache.
+    """
+
+    def __init__(self, root: Path | None = None, ttl_seconds: float = DEFAULT_LLM_CACHE_TTL_SECONDS,
+                 max_memory_entries: int = DEFAULT_LLM_CACHE_MEMORY_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_LLM_CACHE_MAX_BYTES):
+        self.root = Path(root) if root is not None else None
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._load_disk_entries()
+
+    @staticmethod
+    def make_key(operation: str, model: str, **inputs) -> str:
+        normalized = {name: _normalize(value) for name, value in inputs.items()}
+        payload = json.dumps([operation, model, normalized], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_disk_entries(self) -> None:
+        found = []
+        for path in self.root.glob("*/*.json"):
+            stat = path.stat()
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        with self._lock:
+            for _, key, size in sorted(found):
+                self._disk[key] = size
+                self._disk_bytes += size
+            self._evict_disk()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def get(self, key: str):
+        """Return the cached value for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            self._memory.pop(key, None)
+            on_disk = key in self._disk
+
+        if on_disk:
+            path = self._path(key)
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+                os.utime(path)
+            except (OSError, ValueError):
+                record = None
+            with self._lock:
+                if record is None or self._expired(record["created_at"]):
+                    self._disk_bytes -= self._disk.pop(key, 0)
+                    path.unlink(missing_ok=True)
+                else:
+                    self._disk.move_to_end(key)
+                    self._remember(key, record["created_at"], record["value"])
+                    self.disk_hits += 1
+                    return record["value"]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def lookup(self, key: str, bypass: bool = False):
+        """Like get, but a bypass (e.g. "regenerate") skips the cache and is counted."""
+        if bypass:
+            with self._lock:
+                self.bypassed += 1
+            return None
+        return self.get(key)
+
+    def put(self, key: str, value) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, value)
+        if self.root is None:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps({"created_at": created_at, "value": value}), encoding="utf-8")
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+        with self._lock:
+            self._disk_bytes += size - self._disk.pop(key, 0)
+            self._disk[key] = size
+            self._evict_disk()
+
+    def _remember(self, key: str, created_at: float, value) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self._path(key).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
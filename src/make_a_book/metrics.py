@@ -0,0 +1,270 @@
+"""Process-wide metrics rendered in the Prometheus text exposition format.
+
+A small dependency-free subset of prometheus_client: labelled counters,
+histograms and gauges (set directly or read from a callback at scrape time).
+"""
+import bisect
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .cancellation import JobCancelled
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 registry: "MetricsRegistry | None" = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, function: Callable[[], float] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the (unlabelled) value from `function` at every scrape."""
+        self._function = function
+
+    def render(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return self.header() + [f"{self.name} {_format_value(self._function())}"]
+            except Exception as e:
+                print(f"Metric {self.name} callback failed: {e}")
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            # Per-bucket (non-cumulative) counts, then sum and count.
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 3))
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: object):
+        """Observe the duration of the `with` block, whether or not it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: object) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return int(series[-1]) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_CALL_SECONDS = Histogram(
+    "book_llm_call_seconds", "Latency of LM calls that reached the provider.", ["operation"],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600),
+)
+TTS_CHUNK_SECONDS = Histogram(
+    "book_tts_chunk_seconds", "Latency of one speech synthesis request.",
+    buckets=(0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+TTS_SECONDS_PER_CHAR = Histogram(
+    "book_tts_seconds_per_char", "Speech synthesis latency divided by input characters.",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1),
+)
+AUDIO_COMBINE_SECONDS = Histogram(
+    "book_audio_combine_seconds", "Time to join a chapter's chunk files.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+ZIP_SECONDS = Histogram(
+    "book_zip_seconds", "Time to stream a whole audiobook zip.",
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "book_queue_wait_seconds", "Time work waited in a queue before starting.", ["queue"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "book_http_request_seconds", "API handler latency.", ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120),
+)
+UPSTREAM_ERRORS = Counter(
+    "book_upstream_errors_total", "Failed calls to the LM or TTS provider.", ["service", "error"],
+)
+UPSTREAM_RETRIES = Counter(
+    "book_upstream_retries_total", "Calls to the LM or TTS provider that were retried.", ["service"],
+)
+
+ACTIVE_JOBS = Gauge("book_active_jobs", "Audiobook jobs currently running.")
+QUEUED_JOBS = Gauge("book_queued_jobs", "Audiobook jobs waiting for a worker.")
+JOB_POOL_SATURATION = Gauge("book_job_pool_saturation", "Share of audiobook job workers that are busy.")
+TTS_POOL_SATURATION = Gauge("book_tts_pool_saturation", "Share of TTS scheduler workers that are busy.")
+THREADPOOL_SATURATION = Gauge(
+    "book_threadpool_saturation", "Share of the API's worker threads (sync endpoints, run_in_threadpool) in use.",
+)
+AUDIO_POOL_SATURATION = Gauge(
+    "book_audio_pool_saturation", "Queued and running audio tasks as a share of the backpressure limit.",
+)
+TTS_QUEUED_REQUESTS = Gauge("book_tts_queued_requests", "Speech requests waiting in the TTS scheduler.")
+OUTPUT_DISK_BYTES = Gauge("book_output_disk_bytes", "Bytes used under BOOK_OUTPUT_DIR.")
+
+
+def _is_provider_error(exc: BaseException) -> bool:
+    """Whether `exc` reports a failure of the provider rather than a local one.
+
+    Covers HTTP status errors and the OpenAI SDK and httpx exception trees
+    (litellm's exceptions derive from the SDK's). Those libraries are only
+    consulted once imported, so metrics stay free of the dependencies.
+    """
+    if isinstance(getattr(exc, "status_code", None), int):
+        return True
+    for module, name in (("openai", "APIError"), ("httpx", "HTTPError")):
+        error_type = getattr(sys.modules.get(module), name, None)
+        if error_type is not None and isinstance(exc, error_type):
+            return True
+    return False
+
+
+@contextmanager
+def upstream_call(service: str, histogram: Histogram, **labels: object):
+    """Time a provider call and count it as an upstream error if the provider fails.
+
+    Cancellations and local failures (e.g. writing the response to disk)
+    propagate without being counted.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except JobCancelled:
+        raise
+    except Exception as exc:
+        if _is_provider_error(exc):
+            UPSTREAM_ERRORS.inc(service=service, error=type(exc).__name__)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
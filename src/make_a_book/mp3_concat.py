@@ -0,0 +1,189 @@
+"""Join MP3 files by splicing frames instead of decoding and re-encoding.
+
+Every chunk returned by the TTS API shares one encoding, so a chapter can be
+assembled by copying MPEG audio frames straight through: ID3 tags and the
+Xing/Info/VBRI header frame are dropped, and the pause between chunks is a run
+of silent Layer III frames built from the chunks' own frame header.
+"""
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, NamedTuple
+
+
+class Mp3FormatError(ValueError):
+    """Raised when files can't be joined at the frame level."""
+
+
+_VERSIONS = {0b00: "2.5", 0b10: "2", 0b11: "1"}
+_LAYERS = {0b01: 3, 0b10: 2, 0b11: 1}
+
+_BITRATES_KBPS = {
+    ("1", 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    ("1", 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    ("1", 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    ("2", 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    ("2", 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    ("2", 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+_SAMPLE_RATES = {
+    "1": (44100, 48000, 32000),
+    "2": (22050, 24000, 16000),
+    "2.5": (11025, 12000, 8000),
+}
+
+
+class FrameHeader(NamedTuple):
+    raw: bytes
+    version: str
+    layer: int
+    protected: bool
+    bitrate_kbps: int
+    sample_rate: int
+    padding: int
+    mono: bool
+
+    @property
+    def samples_per_frame(self) -> int:
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and self.version != "1":
+            return 576
+        return 1152
+
+    @property
+    def frame_length(self) -> int:
+        if self.layer == 1:
+            return (12 * self.bitrate_kbps * 1000 // self.sample_rate + self.padding) * 4
+        return self.samples_per_frame // 8 * self.bitrate_kbps * 1000 // self.sample_rate + self.padding
+
+    @property
+    def side_info_length(self) -> int:
+        if self.version == "1":
+            return 17 if self.mono else 32
+        return 9 if self.mono else 17
+
+    @property
+    def encoding(self) -> tuple:
+        """Stream properties that must match for frames to be spliced."""
+        return (self.version, self.layer, self.sample_rate, self.mono)
+
+
+def parse_frame_header(data: bytes) -> FrameHeader:
+    """Parse a 4-byte MPEG audio frame header."""
+    if len(data) < 4 or data[0] != 0xFF or (data[1] & 0xE0) != 0xE0:
+        raise Mp3FormatError("missing frame sync")
+
+    version = _VERSIONS.get((data[1] >> 3) & 0b11)
+    layer = _LAYERS.get((data[1] >> 1) & 0b11)
+    bitrate_index = data[2] >> 4
+    sample_rate_index = (data[2] >> 2) & 0b11
+    if version is None or layer is None:
+        raise Mp3FormatError("reserved MPEG version or layer")
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        raise Mp3FormatError("free-format or invalid bitrate/sample rate")
+
+    return FrameHeader(
+        raw=bytes(data[:4]),
+        version=version,
+        layer=layer,
+        protected=not (data[1] & 0b1),
+        bitrate_kbps=_BITRATES_KBPS[("1" if version == "1" else "2", layer)][bitrate_index],
+        sample_rate=_SAMPLE_RATES[version][sample_rate_index],
+        padding=(data[2] >> 1) & 0b1,
+        mono=(data[3] >> 6) == 0b11,
+    )
+
+
+def _skip_id3v2(handle: BinaryIO) -> None:
+    start = handle.read(10)
+    if len(start) == 10 and start[:3] == b"ID3":
+        size = 0
+        for byte in start[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        if start[5] & 0x10:  # footer present
+            size += 10
+        handle.seek(10 + size)
+    else:
+        handle.seek(0)
+
+
+def _is_info_frame(header: FrameHeader, frame: bytes) -> bool:
+    """Detect the Xing/Info or VBRI header frame some encoders prepend."""
+    offset = 4 + (2 if header.protected else 0) + header.side_info_length
+    return frame[offset:offset + 4] in (b"Xing", b"Info") or frame[36:40] == b"VBRI"
+
+
+def iter_frames(handle: BinaryIO) -> Iterator[tuple[FrameHeader, bytes]]:
+    """Yield (header, frame bytes) for each audio frame, skipping tags."""
+    _skip_id3v2(handle)
+    first = True
+    while True:
+        head = handle.read(4)
+        if len(head) < 4 or head[:3] == b"TAG":
+            return
+        header = parse_frame_header(head)
+        body = handle.read(header.frame_length - 4)
+        if len(body) < header.frame_length - 4:
+            return  # truncated trailing frame
+        frame = head + body
+        if first and _is_info_frame(header, frame):
+            first = False
+            continue
+        first = False
+        yield header, frame
+
+
+def read_first_header(path: Path) -> FrameHeader:
+    with open(path, "rb") as handle:
+        for header, _ in iter_frames(handle):
+            return header
+    raise Mp3FormatError(f"{path.name} contains no audio frames")
+
+
+def silent_frame(header: FrameHeader) -> bytes:
+    """Build a Layer III frame that decodes to silence.
+
+    With all-zero side info every granule has no Huffman data, so the decoder
+    produces zero samples. CRC protection and padding are switched off.
+    """
+    if header.layer != 3:
+        raise Mp3FormatError("silence frames are only supported for Layer III")
+    raw = bytearray(header.raw)
+    raw[1] |= 0b1
+    raw[2] &= ~0b10 & 0xFF
+    length = header._replace(padding=0, protected=False).frame_length
+    return bytes(raw) + bytes(length - 4)
+
+
+def silence(header: FrameHeader, duration_ms: int) -> bytes:
+    """Pre-encoded run of silent frames lasting roughly `duration_ms`."""
+    frames = round(duration_ms / 1000 * header.sample_rate / header.samples_per_frame)
+    return silent_frame(header) * frames
+
+
+def concat_mp3_files(audio_files: List[Path], output_file: Path, gap_ms: int = 500,
+                     buffer_size: int = 64 * 1024) -> None:
+    """Concatenate MP3 files frame by frame with silence between them.
+
+    Raises Mp3FormatError if the files don't share one Layer III encoding, so
+    callers can fall back to re-encoding.
+    """
+    if not audio_files:
+        raise Mp3FormatError("no files to combine")
+
+    headers = [read_first_header(path) for path in audio_files]
+    reference = headers[0]
+    for path, header in zip(audio_files, headers):
+        if header.encoding != reference.encoding:
+            raise Mp3FormatError(f"{path.name} encoding {header.encoding} != {reference.encoding}")
+    gap = silence(reference, gap_ms) if gap_ms > 0 else b""
+
+    with open(output_file, "wb", buffering=buffer_size) as out:
+        for index, path in enumerate(audio_files):
+            if index and gap:
+                out.write(gap)
+            with open(path, "rb", buffering=buffer_size) as handle:
+                for header, frame in iter_frames(handle):
+                    if header.encoding != reference.encoding:
+                        raise Mp3FormatError(f"{path.name} changes encoding mid-stream")
+                    out.write(frame)
@@ -2,6 +2,10 @@ import os
 import dspy
 from dotenv import load_dotenv
 
+from .clients import get_clients
+from .llm_cache import LLMResponseCache, current_model_id
+from .metrics import LLM_CALL_SECONDS, upstream_call
+
 load_dotenv()
 
 class BookOutlineGenerator(dspy.Signature):
@@ -14,23 +18,57 @@ class BookOutlineGenerator(dspy.Signature):
     outline = dspy.OutputField(desc="A detailed book outline with chapters and key points")
 
 class OutlineCreator:
-    def __init__(self, lm=None):
+    def __init__(self, lm=None, cache: LLMResponseCache | None = None):
         # Configure DSPy once per process to avoid cross-thread reconfiguration.
         if lm is None:
-            lm = dspy.LM(
-                model="anthropic/claude-haiku-4-5",
-                api_key=os.getenv("ANTHROPIC_API_KEY")
+            lm = get_clients().lm(
+                "anthropic/claude-haiku-4-5",
+                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                cache=False
             )
         if getattr(dspy.settings, "lm", None) is None:
             dspy.settings.configure(lm=lm)
 
         # Initialize the predictor
         self.generate_outline = dspy.Predict(BookOutlineGenerator)
+        self.cache = cache
     
-    def create_outline(self, prompt: str, target_duration_minutes: int) -> str:
-        """Generate a book outline from the given prompt."""
-        result = self.generate_outline(
-            prompt=prompt,
-            target_duration_minutes=target_duration_minutes
+    def create_outline(self, prompt: str, target_duration_minutes: int, regenerate: bool = False) -> str:
+        """Generate a book outline from the given prompt.
+
+        `regenerate` skips the cached outline for these inputs and replaces it.
+        """
+        key, cached = self._cached(prompt, target_duration_minutes, regenerate)
+        if cached is not None:
+            return cached
+        with upstream_call("llm", LLM_CALL_SECONDS, operation="outline"):
+            result = self.generate_outline(
+                prompt=prompt,
+                target_duration_minutes=target_duration_minutes
+            )
+        return self._remember(key, result.outline)
+
+    async def acreate_outline(self, prompt: str, target_duration_minutes: int, regenerate: bool = False) -> str:
+        """Async variant of create_outline that doesn't block the event loop."""
+        key, cached = self._cached(prompt, target_duration_minutes, regenerate)
+        if cached is not None:
+            return cached
+        with upstream_call("llm", LLM_CALL_SECONDS, operation="outline"):
+            result = await self.generate_outline.acall(
+                prompt=prompt,
+                target_duration_minutes=target_duration_minutes
+            )
+        return self._remember(key, result.outline)
+
+    def _cached(self, prompt: str, target_duration_minutes: int, regenerate: bool):
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(
+            "outline", current_model_id(), prompt=prompt, target_duration_minutes=target_duration_minutes
         )
-        return result.outline
+        return key, self.cache.lookup(key, bypass=regenerate)
+
+    def _remember(self, key: str | None, outline: str) -> str:
+        if key is not None and outline:
+            self.cache.put(key, outline)
+        return outline
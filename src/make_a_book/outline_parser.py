@@ -0,0 +1,47 @@
+import re
+from typing import List, NamedTuple
+
+
+_NUMBER_WORDS = (
+    "one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|"
+    "fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|twenty"
+)
+
+# A chapter line: optional list prefix ("-", "*", "1."), optional markdown
+# heading marks and emphasis, then "Chapter <number>" and an optional title.
+_CHAPTER_LINE_RE = re.compile(
+    r"^\s*(?:[-*+]\s+|\d+[.)]\s+)?(?:#{1,6}\s*)?[*_]{0,2}\s*"
+    rf"(chapter\s+(?:\d+|[ivxlcdm]+|{_NUMBER_WORDS})\b.*?)\s*[*_]{{0,2}}\s*$",
+    re.IGNORECASE,
+)
+
+
+class OutlineChapter(NamedTuple):
+    number: int
+    heading: str
+    summary: str
+
+
+def parse_outline_chapters(outline: str) -> List[OutlineChapter]:
+    """Split an outline into its "Chapter …" entries, in order.
+
+    Each entry's summary is the text between its heading and the next one.
+    Chapters are numbered by position, whatever numbering the outline uses.
+    """
+    chapters: List[OutlineChapter] = []
+    heading = None
+    summary_lines: List[str] = []
+
+    for line in outline.splitlines():
+        match = _CHAPTER_LINE_RE.match(line)
+        if match:
+            if heading is not None:
+                chapters.append(OutlineChapter(len(chapters) + 1, heading, "\n".join(summary_lines).strip()))
+            heading = match.group(1).strip().rstrip("*_").strip()
+            summary_lines = []
+        elif heading is not None:
+            summary_lines.append(line)
+
+    if heading is not None:
+        chapters.append(OutlineChapter(len(chapters) + 1, heading, "\n".join(summary_lines).strip()))
+    return chapters
@@ -0,0 +1,102 @@
+import email.utils
+import os
+import random
+import threading
+import time
+
+import httpx
+import openai
+
+
+DEFAULT_TTS_MAX_ATTEMPTS = int(os.getenv("TTS_MAX_ATTEMPTS", "5"))
+DEFAULT_TTS_RETRY_BASE_SECONDS = float(os.getenv("TTS_RETRY_BASE_SECONDS", "1"))
+DEFAULT_TTS_RETRY_MAX_SECONDS = float(os.getenv("TTS_RETRY_MAX_SECONDS", "60"))
+# Retries one job may spend in total, so a failing upstream can't keep a job
+# (and its worker) busy indefinitely.
+DEFAULT_TTS_RETRY_BUDGET = int(os.getenv("TTS_RETRY_BUDGET", "50"))
+
+RATE_LIMIT = "rate_limit"
+SERVER_ERROR = "server_error"
+TIMEOUT = "timeout"
+CONNECTION = "connection"
+FATAL = "fatal"
+
+RETRYABLE = {RATE_LIMIT, SERVER_ERROR, TIMEOUT, CONNECTION}
+
+
+def classify_error(exc: BaseException) -> str:
+    """Sort an upstream failure into a retry class."""
+    if isinstance(exc, openai.APITimeoutError) or isinstance(exc, httpx.TimeoutException):
+        return TIMEOUT
+    if isinstance(exc, openai.APIConnectionError) or isinstance(exc, httpx.TransportError):
+        return CONNECTION
+    status = getattr(exc, "status_code", None)
+    if status == 429:
+        return RATE_LIMIT
+    if status == 408:
+        return TIMEOUT
+    if isinstance(status, int) and status >= 500:
+        return SERVER_ERROR
+    return FATAL
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Delay the server asked for via Retry-After (seconds or HTTP date) or retry-after-ms."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter, never shorter than Retry-After."""
+
+    def __init__(self, max_attempts: int = DEFAULT_TTS_MAX_ATTEMPTS,
+                 base_delay: float = DEFAULT_TTS_RETRY_BASE_SECONDS,
+                 max_delay: float = DEFAULT_TTS_RETRY_MAX_SECONDS,
+                 rng: random.Random | None = None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = self._rng.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class RetryBudget:
+    """Thread-safe count of retries left for one job."""
+
+    def __init__(self, max_retries: int = DEFAULT_TTS_RETRY_BUDGET):
+        self.max_retries = max(0, max_retries)
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.spent >= self.max_retries:
+                return False
+            self.spent += 1
+            return True
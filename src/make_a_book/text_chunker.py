@@ -0,0 +1,103 @@
+"""Clean chapter text and split it into TTS-sized chunks in one pass.
+
+Chunks are slices of the cleaned text, so punctuation and spacing survive
+unchanged. Sentences longer than the limit are split at a clause boundary,
+then a word boundary, and only cut mid-word as a last resort. Chunk sizes are
+balanced so a chapter's chunks take roughly equal time to synthesize.
+"""
+import math
+import re
+from typing import Iterator, List, Tuple
+
+
+DEFAULT_MAX_CHUNK_CHARS = 4000
+
+_MARKDOWN_RULES = (
+    (re.compile(r"#{1,6}\s*"), ""),  # Headers
+    (re.compile(r"\*{1,2}([^\*]+)\*{1,2}"), r"\1"),  # Bold/italic
+    (re.compile(r"`([^`]+)`"), r"\1"),  # Code
+    (re.compile(r"\[([^\]]+)\]\([^\)]+\)"), r"\1"),  # Links
+    (re.compile(r"\n{3,}"), "\n\n"),  # Multiple newlines
+    (re.compile(r"\s{2,}"), " "),  # Multiple spaces
+)
+
+# Terminal punctuation plus any closing quotes/brackets, then whitespace.
+_SENTENCE_END_RE = re.compile(r"([.!?…]+[\"'”’)\]]*)(?:\s+|$)")
+_CLAUSE_END_RE = re.compile(r"[,;:—–]\s+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+Span = Tuple[int, int]
+
+
+def clean_text_for_speech(text: str) -> str:
+    """Strip markdown formatting and collapse whitespace."""
+    for pattern, replacement in _MARKDOWN_RULES:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def _sentence_spans(text: str) -> Iterator[Span]:
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        end = match.end(1)
+        if end > start:
+            yield start, end
+        start = match.end()
+    if start < len(text):
+        yield start, len(text)
+
+
+def _last_match(pattern: re.Pattern, text: str, start: int, end: int) -> re.Match | None:
+    match = None
+    for match in pattern.finditer(text, start, end):
+        pass
+    return match
+
+
+def _split_oversized(text: str, start: int, end: int, max_chars: int) -> Iterator[Span]:
+    """Break one over-long sentence into pieces of at most `max_chars`."""
+    while end - start > max_chars:
+        limit = start + max_chars
+        clause = _last_match(_CLAUSE_END_RE, text, start + max_chars // 2, limit + 1)
+        if clause is not None:
+            cut, resume = clause.start() + 1, clause.end()
+        else:
+            gap = _last_match(_WHITESPACE_RE, text, start + 1, limit + 1)
+            cut, resume = (gap.start(), gap.end()) if gap is not None else (limit, limit)
+        yield start, cut
+        start = resume
+    if start < end:
+        yield start, end
+
+
+def chunk_text(text: str, max_chars: int = DEFAULT_MAX_CHUNK_CHARS) -> List[str]:
+    """Split text into sentence-aligned chunks of at most `max_chars`."""
+    text = clean_text_for_speech(text)
+    if len(text) <= max_chars:
+        return [text]
+
+    units: List[Span] = []
+    for start, end in _sentence_spans(text):
+        units.extend(_split_oversized(text, start, end, max_chars))
+
+    text_end = units[-1][1]
+    chunks = []
+    chunk_start, chunk_end = units[0]
+    target = _balanced_target(text_end - chunk_start, max_chars)
+    for start, end in units[1:]:
+        current = chunk_end - chunk_start
+        grown = end - chunk_start
+        # Close the chunk if the next sentence would overflow it, or would
+        # take it further past the target size than it currently falls short.
+        if grown > max_chars or (grown > target and grown - target > target - current):
+            chunks.append(text[chunk_start:chunk_end])
+            chunk_start = start
+            target = _balanced_target(text_end - chunk_start, max_chars)
+        chunk_end = end
+    chunks.append(text[chunk_start:chunk_end])
+    return chunks
+
+
+def _balanced_target(remaining: int, max_chars: int) -> int:
+    """Even chunk size for the remaining text given the fewest chunks possible."""
+    return math.ceil(remaining / max(1, math.ceil(remaining / max_chars)))
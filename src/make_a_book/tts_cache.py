@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+
+DEFAULT_TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Hardlink `src` to `dest`, copying when linking isn't possible.
+
+    The link or copy is made under a temporary name and renamed over `dest`,
+    so an existing `dest` is replaced rather than written through (which
+    would truncate every file hardlinked to it). A `dest` that already is
+    `src` is left alone.
+    """
+    dest = Path(dest)
+    if dest.exists() and os.path.samefile(src, dest):
+        return
+    tmp_path = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class TTSChunkCache:
+    """Content-addressed, size-bounded LRU cache of synthesized MP3 chunks.
+
+    Entries are stored as `<root>/<key[:2]>/<key>.mp3`. Recency survives
+    restarts through file mtimes, which are refreshed on every hit.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_TTS_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._load_entries()
+
+    @staticmethod
+    def make_key(model: str, voice: str, speed: float, instructions: str | None, text: str) -> str:
+        payload = json.dumps([model, voice, float(speed), instructions or "", text], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.mp3"
+
+    def _load_entries(self) -> None:
+        found = []
+        for path in self.root.glob("*/*.mp3"):
+            stat = path.stat()
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def fetch(self, key: str, dest: Path) -> bool:
+        """Materialize a cached chunk at `dest`; return False on a miss."""
+        path = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False
+            self._entries.move_to_end(key)
+
+        try:
+            _link_or_copy(path, dest)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: str, src: Path) -> None:
+        """Add a freshly synthesized chunk to the cache."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        _link_or_copy(src, path)
+        size = path.stat().st_size
+
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._path(key).unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
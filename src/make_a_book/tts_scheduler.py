@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Callable
+
+from .metrics import QUEUE_WAIT_SECONDS
+
+
+# Process-wide TTS budget. The rate limits default to what an OpenAI usage
+# tier 1 account allows for the speech models; zero disables a limit.
+DEFAULT_TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "4"))
+DEFAULT_TTS_REQUESTS_PER_MINUTE = float(os.getenv("TTS_REQUESTS_PER_MINUTE", "50"))
+DEFAULT_TTS_CHARS_PER_MINUTE = float(os.getenv("TTS_CHARS_PER_MINUTE", "100000"))
+
+# How many seconds of budget a bucket may accumulate while idle. Keeping this
+# small means a burst after an idle period cannot exceed the per-minute limit.
+BURST_SECONDS = 5.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = BURST_SECONDS):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate_per_second * burst_seconds)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until `amount` tokens are available; return seconds waited."""
+        # Requests larger than the bucket are allowed once it is full.
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate_per_second
+            time.sleep(delay)
+            waited += delay
+
+
+class TTSScheduler:
+    """Run TTS requests under a shared concurrency cap and rate limits.
+
+    Work is queued per group (one group per audiobook job) and workers take
+    from the groups round-robin, so a long book cannot starve a short one.
+    A rate-limit response anywhere can `pause` the scheduler, holding back
+    every job's next request until the upstream's Retry-After has passed.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_TTS_CONCURRENCY,
+                 requests_per_minute: float = DEFAULT_TTS_REQUESTS_PER_MINUTE,
+                 chars_per_minute: float = DEFAULT_TTS_CHARS_PER_MINUTE):
+        self.max_concurrency = max(1, max_concurrency)
+        self._request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._char_bucket = TokenBucket(chars_per_minute) if chars_per_minute > 0 else None
+        self._queues: OrderedDict[object, deque] = OrderedDict()
+        self._condition = threading.Condition()
+        self._workers: list[threading.Thread] = []
+        self._active = 0
+        self._paused_until = 0.0
+
+    def submit(self, fn: Callable[[], object], group: object = None, cost_chars: int = 0) -> Future:
+        """Queue `fn` to run once budget allows; return its future."""
+        future: Future = Future()
+        with self._condition:
+            self._start_workers()
+            self._queues.setdefault(group, deque()).append((future, fn, cost_chars, time.monotonic()))
+            self._condition.notify()
+        return future
+
+    def stats(self) -> dict:
+        with self._condition:
+            # Cancelled tasks stay queued until a worker skips them.
+            queued = sum(
+                1 for queue in self._queues.values() for future, *_ in queue if not future.cancelled()
+            )
+            return {
+                "max_concurrency": self.max_concurrency,
+                "active": self._active,
+                "queued": queued,
+                "groups": len(self._queues),
+                "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            }
+
+    def pause(self, seconds: float) -> None:
+        """Hold back new requests from every job for `seconds` (never shortens a pause)."""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def throttle(self, cost_chars: int = 0) -> None:
+        """Wait out any pause, then take rate budget for one request."""
+        while True:
+            with self._condition:
+                delay = self._paused_until - time.monotonic()
+            if delay <= 0:
+                break
+            time.sleep(delay)
+        if self._request_bucket:
+            self._request_bucket.acquire(1)
+        if self._char_bucket and cost_chars:
+            self._char_bucket.acquire(cost_chars)
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.max_concurrency:
+            worker = threading.Thread(
+                target=self._worker,
+                name=f"tts-worker-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_task(self):
+        group, queue = next(iter(self._queues.items()))
+        task = queue.popleft()
+        if queue:
+            self._queues.move_to_end(group)
+        else:
+            del self._queues[group]
+        return task
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queues:
+                    self._condition.wait()
+                future, fn, cost_chars, queued_at = self._next_task()
+                self._active += 1
+            QUEUE_WAIT_SECONDS.observe(time.monotonic() - queued_at, queue="tts")
+
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    self.throttle(cost_chars)
+                    result = fn()
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            finally:
+                with self._condition:
+                    self._active -= 1
+
+
+_default_scheduler: TTSScheduler | None = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> TTSScheduler:
+    """Return the process-wide scheduler shared by every audiobook job."""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = TTSScheduler()
+        return _default_scheduler
@@ -1,4 +1,10 @@
+import json
+import os
 import re
+import threading
+import time
+from pathlib import Path
+from typing import List
 
 
 # Rough timing model derived from local test runs (50/100/200/300 words).
@@ -6,6 +12,17 @@ import re
 WORDS_TO_SECONDS = 0.0743
 BASE_OVERHEAD_SECONDS = 0.5
 SAFETY_FACTOR = 1.3
+AVERAGE_CHARS_PER_WORD = 5.5
+
+# Per-chunk latency model: seconds = w . features, fitted online.
+LATENCY_FEATURES = ("intercept", "kchars_per_speed", "instruction_kchars", "extra_concurrency")
+PRIOR_WEIGHTS = (
+    BASE_OVERHEAD_SECONDS,
+    WORDS_TO_SECONDS * SAFETY_FACTOR * 1000 / AVERAGE_CHARS_PER_WORD,
+    0.0,
+    0.0,
+)
+MIN_CHUNK_SECONDS = 0.1
 
 
 def count_words(text: str) -> int:
@@ -40,3 +57,180 @@ def format_duration(seconds: int) -> str:
     if minutes:
         return f"{minutes}m {secs}s"
     return f"{secs}s"
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Solve a small dense linear system by Gaussian elimination."""
+    size = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda row: abs(rows[row][col]))
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        if abs(rows[col][col]) < 1e-12:
+            continue
+        for row in range(col + 1, size):
+            factor = rows[row][col] / rows[col][col]
+            for k in range(col, size + 1):
+                rows[row][k] -= factor * rows[col][k]
+    solution = [0.0] * size
+    for row in reversed(range(size)):
+        if abs(rows[row][row]) < 1e-12:
+            continue
+        tail = sum(rows[row][k] * solution[k] for k in range(row + 1, size))
+        solution[row] = (rows[row][size] - tail) / rows[row][row]
+    return solution
+
+
+class TTSLatencyModel:
+    """Per-chunk TTS latency fitted online from observed synthesis times.
+
+    A decayed, ridge-regularized least-squares fit over LATENCY_FEATURES,
+    shrunk toward PRIOR_WEIGHTS until observations accumulate, with a
+    per-voice correction factor. State is persisted as JSON at `path`.
+    """
+
+    def __init__(self, path: Path | None = None, decay: float = 0.995, prior_strength: float = 5.0,
+                 save_every: int = 10):
+        self.path = Path(path) if path is not None else None
+        self.decay = decay
+        self.prior_strength = prior_strength
+        self.save_every = save_every
+        size = len(LATENCY_FEATURES)
+        self._lock = threading.Lock()
+        self._xtx = [[0.0] * size for _ in range(size)]
+        self._xty = [0.0] * size
+        self._voice_ratios: dict[str, float] = {}
+        self._weights: List[float] | None = None
+        self._unsaved = 0
+        self.observations = 0
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    @staticmethod
+    def features(chars: int, speed: float, instruction_chars: int = 0, concurrency: int = 1) -> List[float]:
+        return [
+            1.0,
+            chars / 1000 / max(speed, 0.25),
+            instruction_chars / 1000,
+            float(max(0, concurrency - 1)),
+        ]
+
+    def _solve_weights(self) -> List[float]:
+        if self._weights is None:
+            size = len(LATENCY_FEATURES)
+            matrix = [
+                [self._xtx[i][j] + (self.prior_strength if i == j else 0.0) for j in range(size)]
+                for i in range(size)
+            ]
+            vector = [self._xty[i] + self.prior_strength * PRIOR_WEIGHTS[i] for i in range(size)]
+            self._weights = _solve(matrix, vector)
+        return self._weights
+
+    def predict(self, chars: int, speed: float = 1.0, instruction_chars: int = 0, concurrency: int = 1,
+                voice: str | None = None) -> float:
+        """Expected seconds to synthesize one chunk."""
+        x = self.features(chars, speed, instruction_chars, concurrency)
+        with self._lock:
+            weights = self._solve_weights()
+            ratio = self._voice_ratios.get(voice, 1.0) if voice else 1.0
+        return max(MIN_CHUNK_SECONDS, sum(w * v for w, v in zip(weights, x)) * ratio)
+
+    def observe(self, chars: int, voice: str, speed: float, instruction_chars: int, concurrency: int,
+                seconds: float) -> None:
+        """Record how long one chunk actually took to synthesize."""
+        x = self.features(chars, speed, instruction_chars, concurrency)
+        with self._lock:
+            predicted = max(MIN_CHUNK_SECONDS, sum(w * v for w, v in zip(self._solve_weights(), x)))
+            ratio = self._voice_ratios.get(voice, 1.0)
+            self._voice_ratios[voice] = 0.9 * ratio + 0.1 * (seconds / predicted)
+
+            for i, xi in enumerate(x):
+                self._xty[i] = self.decay * self._xty[i] + xi * seconds
+                for j, xj in enumerate(x):
+                    self._xtx[i][j] = self.decay * self._xtx[i][j] + xi * xj
+            self._weights = None
+            self.observations += 1
+            self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self._save_locked()
+
+    def estimate_seconds(self, chunk_lengths: List[int], speed: float = 1.0, instruction_chars: int = 0,
+                         voice: str | None = None, concurrency: int = 1) -> int:
+        """Wall-clock estimate for synthesizing chunks `concurrency` at a time."""
+        if not chunk_lengths:
+            return 0
+        parallel = max(1, min(concurrency, len(chunk_lengths)))
+        work = sum(self.predict(chars, speed, instruction_chars, parallel, voice) for chars in chunk_lengths)
+        return max(1, int(round(work / parallel)))
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._unsaved:
+                self._save_locked()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "observations": self.observations,
+                "weights": dict(zip(LATENCY_FEATURES, (round(w, 4) for w in self._solve_weights()))),
+                "voice_ratios": {voice: round(ratio, 3) for voice, ratio in self._voice_ratios.items()},
+            }
+
+    def _load(self) -> None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8"))
+            if state.get("features") != list(LATENCY_FEATURES):
+                return
+            self._xtx = state["xtx"]
+            self._xty = state["xty"]
+            self._voice_ratios = state.get("voice_ratios", {})
+            self.observations = state.get("observations", 0)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable TTS latency model {self.path}: {e}")
+
+    def _save_locked(self) -> None:
+        self._unsaved = 0
+        if self.path is None:
+            return
+        state = {
+            "features": list(LATENCY_FEATURES),
+            "xtx": self._xtx,
+            "xty": self._xty,
+            "voice_ratios": self._voice_ratios,
+            "observations": self.observations,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+class RemainingWorkEta:
+    """ETA from the predicted work still outstanding and the rate work is being done.
+
+    Work is measured in predicted synthesis seconds. Until chunks finish, the
+    rate is assumed to be `parallelism`; observed throughput takes over as
+    elapsed time grows past `prior_seconds`.
+    """
+
+    def __init__(self, total_work: float, parallelism: int, prior_seconds: float = 10.0):
+        self.total_work = total_work
+        self.done_work = 0.0
+        self.parallelism = max(1, parallelism)
+        self.prior_seconds = prior_seconds
+        self._started = time.monotonic()
+
+    def complete(self, work: float) -> None:
+        self.done_work += work
+
+    @property
+    def fraction_done(self) -> float:
+        return self.done_work / self.total_work if self.total_work else 1.0
+
+    def eta_seconds(self) -> int:
+        remaining = max(0.0, self.total_work - self.done_work)
+        if not remaining:
+            return 0
+        elapsed = time.monotonic() - self._started
+        rate = (self.done_work + self.parallelism * self.prior_seconds) / (elapsed + self.prior_seconds)
+        return max(1, int(round(remaining / rate)))
@@ -0,0 +1,42 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.make_a_book.audio_pool import AudioPool
+from src.make_a_book.cancellation import CancellationToken, JobCancelled
+
+
+def test_tasks_run_in_a_worker_process_and_full_pool_holds_back_producers():
+    pool = AudioPool(workers=1, max_pending=1)
+    try:
+        assert pool.submit(os.getpid).result(timeout=60) != os.getpid()
+
+        slow = pool.submit(time.sleep, 0.3)
+        assert pool.saturated()
+        waited = pool.wait_for_capacity()
+
+        assert slow.done() and waited > 0
+        assert pool.stats() == {"workers": 1, "pending": 0, "max_pending": 1}
+    finally:
+        pool.shutdown()
+
+
+def test_inline_pool_reports_errors_and_waiting_producers_can_be_cancelled():
+    pool = AudioPool(workers=0, max_pending=1)
+    with pytest.raises(ZeroDivisionError):
+        pool.submit(divmod, 1, 0).result()
+    assert not pool.saturated()
+
+    release = threading.Event()
+    blocker = threading.Thread(target=pool.submit, args=(release.wait, 5))
+    blocker.start()
+    while not pool.saturated():
+        time.sleep(0.01)
+    token = CancellationToken()
+    token.cancel("Cancelled by user")
+    with pytest.raises(JobCancelled):
+        pool.wait_for_capacity(token)
+    release.set()
+    blocker.join()
@@ -0,0 +1,308 @@
+import threading
+import time
+
+import pytest
+
+from src.make_a_book import audio_pool, audiobook_generator
+from src.make_a_book.audio_pool import AudioPool
+from src.make_a_book.audiobook_generator import AudiobookGenerator
+from src.make_a_book.cancellation import CancellationToken, JobCancelled
+from src.make_a_book.job_manifest import JobManifest
+from src.make_a_book.job_trace import JobTrace
+from src.make_a_book.metrics import UPSTREAM_ERRORS
+from src.make_a_book.retry import RetryPolicy
+from src.make_a_book.tts_cache import TTSChunkCache
+from src.make_a_book.tts_scheduler import TTSScheduler
+
+
+class _FakeSpeechResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def iter_bytes(self, chunk_size=None):
+        yield self.text.encode("utf-8")
+
+
+class _FakeStreamingSpeech:
+    def __init__(self, speech):
+        self.speech = speech
+
+    def create(self, **params):
+        return self.speech.create(**params)
+
+
+class _FakeSpeech:
+    def create(self, **params):
+        # Later chunks return first so completion order differs from chunk order.
+        time.sleep(0.05 if params["input"].startswith("A") else 0.0)
+        return _FakeSpeechResponse(params["input"])
+
+    @property
+    def with_streaming_response(self):
+        return _FakeStreamingSpeech(self)
+
+
+class _FakeAudio:
+    speech = _FakeSpeech()
+
+
+class _FakeClient:
+    audio = _FakeAudio()
+
+
+def _make_generator(monkeypatch, max_concurrency=4):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    generator = AudiobookGenerator(
+        scheduler=TTSScheduler(max_concurrency=max_concurrency, requests_per_minute=0, chars_per_minute=0),
+        audio_pool=AudioPool(workers=0)
+    )
+    generator.client = _FakeClient()
+    return generator
+
+
+def test_parallel_chunks_are_combined_in_order(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch)
+    book_folder = generator.create_book_folder("Test Book", output_dir=tmp_path)
+    monkeypatch.setattr(generator, "chunk_text", lambda text: ["A first.", "B second.", "C third."])
+
+    combined = []
+
+    def fake_combine(audio_files, output_file, gap_ms):
+        combined.extend(path.read_text() for path in audio_files)
+        output_file.write_bytes(b"combined")
+
+    monkeypatch.setattr(audio_pool, "combine_audio_files", fake_combine)
+
+    events = []
+    chapter_file = generator.generate_chapter_audio(
+        "ignored", 1, book_folder, progress_callback=lambda **kwargs: events.append(kwargs)
+    )
+
+    assert combined == ["A first.", "B second.", "C third."]
+    assert chapter_file.endswith("chapter_01.mp3")
+    assert events[0]["stage"] == "plan" and events[0]["total_chunks"] == 3
+    chunk_events = [event for event in events if event["stage"] == "chunk"]
+    assert sorted(event["chunk_index"] for event in chunk_events) == [1, 2, 3]
+    assert chunk_events[-1]["chunk_index"] == 1
+    assert [event["completed_chunks"] for event in chunk_events] == [1, 2, 3]
+    assert chunk_events[-1]["work_fraction"] == 1.0
+    assert chunk_events[-1]["eta_seconds"] == 0
+    assert generator.latency_model.observations == 3
+
+
+def test_audiobook_queues_all_chapters_and_reports_completion(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch)
+    monkeypatch.setattr(generator, "chunk_text", lambda text: [text])
+
+    events = []
+    trace = JobTrace("audiobook")
+    folder, audio_files = generator.generate_audiobook(
+        "Test Book", "Outline", ["A slow chapter", "B fast chapter"],
+        progress_callback=lambda **kwargs: events.append(kwargs), output_dir=tmp_path, trace=trace,
+    )
+
+    assert [path.rsplit("/", 1)[-1] for path in audio_files] == [
+        "00_outline.mp3", "chapter_01.mp3", "chapter_02.mp3",
+    ]
+    chapter_events = [event for event in events if event["stage"] == "chapter"]
+    assert [event["chapter_index"] for event in chapter_events] == [2, 1]
+    assert [event["completed_chapters"] for event in chapter_events] == [1, 2]
+
+    timings = trace.tree()
+    assert [span["name"] for span in timings["children"]] == ["save_text", "outline", "chapter 1", "chapter 2"]
+    chapter = timings["children"][2]
+    assert [span["name"] for span in chapter["children"]] == ["chunk", "combine"]
+    assert [span["name"] for span in chapter["children"][0]["children"]] == ["queued", "request"]
+    assert chapter["duration_seconds"] >= 0.05
+
+
+class _UpstreamError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_transient_errors_are_retried_and_failed_chunks_reported(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch)
+    generator.retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    monkeypatch.setattr(generator, "chunk_text", lambda text: text.split("|"))
+    monkeypatch.setattr(audio_pool, "combine_audio_files", lambda files, out, gap_ms: out.write_bytes(b"combined"))
+    attempts = []
+
+    def flaky_create(self, **params):
+        attempts.append(params["input"])
+        if params["input"] == "flaky" and attempts.count("flaky") == 1:
+            raise _UpstreamError(429)
+        if params["input"] == "bad":
+            raise _UpstreamError(400)
+        return _FakeSpeechResponse(params["input"])
+
+    monkeypatch.setattr(_FakeSpeech, "create", flaky_create)
+
+    events = []
+    trace = JobTrace("audiobook")
+    generator.generate_audiobook(
+        "Test Book", "Outline", ["flaky|bad|fine"], include_outline=False, output_dir=tmp_path,
+        progress_callback=lambda **kwargs: events.append(kwargs), trace=trace,
+    )
+
+    assert sorted(attempts) == ["bad", "fine", "flaky", "flaky"]
+    failed = [event for event in events if event["stage"] == "chunk_failed"]
+    assert [(event["chapter_index"], event["chunk_index"]) for event in failed] == [(1, 2)]
+    chunks = trace.tree()["children"][1]["children"]
+    assert [[span["name"] for span in chunk["children"]] for chunk in chunks[:2]] == [
+        ["queued", "request", "backoff", "request"], ["queued", "request"],
+    ]
+    assert chunks[0]["attributes"]["attempts"] == 2
+
+
+def test_cached_chunks_skip_the_speech_api(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch)
+    generator.cache = TTSChunkCache(tmp_path / "cache")
+    monkeypatch.setattr(generator, "chunk_text", lambda text: [text])
+
+    calls = []
+    original_create = _FakeSpeech.create
+    monkeypatch.setattr(
+        _FakeSpeech, "create", lambda self, **params: calls.append(params) or original_create(self, **params)
+    )
+
+    for run in ("first", "second"):
+        book_folder = generator.create_book_folder(run, output_dir=tmp_path)
+        chapter_file = generator.generate_chapter_audio("Same text.", 1, book_folder)
+        assert open(chapter_file).read() == "Same text."
+
+    assert len(calls) == 1
+    assert generator.cache.stats()["hits"] == 1
+    assert generator.cache.stats()["misses"] == 1
+
+
+def test_resume_skips_checkpointed_chapters(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch)
+    monkeypatch.setattr(generator, "chunk_text", lambda text: [text])
+    manifest = JobManifest(tmp_path / "manifest.json")
+
+    calls = []
+    failing = True
+    original_create = _FakeSpeech.create
+
+    def flaky_create(self, **params):
+        calls.append(params["input"])
+        if params["input"] == "B chapter" and failing:
+            raise RuntimeError("upstream failure")
+        return original_create(self, **params)
+
+    monkeypatch.setattr(_FakeSpeech, "create", flaky_create)
+
+    _, audio_files = generator.generate_audiobook(
+        "Test Book", "Outline", ["A chapter", "B chapter"], include_outline=False,
+        output_dir=tmp_path, manifest=manifest,
+    )
+    assert [path.rsplit("/", 1)[-1] for path in audio_files] == ["chapter_01.mp3"]
+
+    calls.clear()
+    failing = False
+    events = []
+    _, audio_files = generator.generate_audiobook(
+        "Test Book", "Outline", ["A chapter", "B chapter"], include_outline=False,
+        output_dir=tmp_path, manifest=JobManifest(tmp_path / "manifest.json"),
+        progress_callback=lambda **kwargs: events.append(kwargs),
+    )
+    assert calls == ["B chapter"]
+    assert [path.rsplit("/", 1)[-1] for path in audio_files] == ["chapter_01.mp3", "chapter_02.mp3"]
+    assert [event["completed_chapters"] for event in events if event["stage"] == "chapter"] == [1, 2]
+
+
+def test_resume_only_synthesizes_missing_chunks(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch)
+    monkeypatch.setattr(generator, "chunk_text", lambda text: text.split("|"))
+    manifest = JobManifest(tmp_path / "manifest.json")
+
+    combined = []
+
+    def fake_combine(audio_files, output_file, gap_ms):
+        combined.extend(path.read_text() for path in audio_files)
+        output_file.write_bytes(b"combined")
+
+    monkeypatch.setattr(audio_pool, "combine_audio_files", fake_combine)
+
+    calls = []
+    failing = True
+    original_create = _FakeSpeech.create
+
+    def flaky_create(self, **params):
+        calls.append(params["input"])
+        if params["input"] == "B second." and failing:
+            raise RuntimeError("upstream failure")
+        return original_create(self, **params)
+
+    monkeypatch.setattr(_FakeSpeech, "create", flaky_create)
+
+    _, audio_files = generator.generate_audiobook(
+        "Test Book", "Outline", ["A first.|B second.|C third."], include_outline=False,
+        output_dir=tmp_path, manifest=manifest,
+    )
+    assert audio_files == [] and combined == []
+    assert manifest.chunk_file(1, 1) and manifest.chunk_file(1, 3)
+
+    calls.clear()
+    failing = False
+    _, audio_files = generator.generate_audiobook(
+        "Test Book", "Outline", ["A first.|B second.|C third."], include_outline=False,
+        output_dir=tmp_path, manifest=JobManifest(tmp_path / "manifest.json"),
+    )
+    assert calls == ["B second."]
+    assert combined == ["A first.", "B second.", "C third."]
+    assert [path.rsplit("/", 1)[-1] for path in audio_files] == ["chapter_01.mp3"]
+
+def test_cancelling_a_job_stops_waiting_and_removes_the_book_folder(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch, max_concurrency=1)
+    monkeypatch.setattr(audiobook_generator, "CANCEL_POLL_SECONDS", 0.01)
+    release = threading.Event()
+    monkeypatch.setattr(_FakeSpeech, "create", lambda self, **params: release.wait(5) and None)
+
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel, args=("Cancelled by user",)).start()
+    started = time.monotonic()
+    with pytest.raises(JobCancelled, match="Cancelled by user"):
+        generator.generate_audiobook(
+            "Test Book", "Outline", ["One.", "Two."], output_dir=tmp_path, cancel_token=token,
+        )
+    release.set()
+
+    assert time.monotonic() - started < 1
+    assert not (tmp_path / "test_book_complete").exists()
+    assert generator.scheduler.stats()["queued"] == 0
+
+
+def test_cancelled_chunk_is_not_counted_as_an_upstream_error(monkeypatch, tmp_path):
+    generator = _make_generator(monkeypatch)
+    token = CancellationToken()
+    original_create = _FakeSpeech.create
+
+    def create_then_cancel(self, **params):
+        # The user cancels while the response is streaming to disk.
+        token.cancel("Cancelled by user")
+        return original_create(self, **params)
+
+    monkeypatch.setattr(_FakeSpeech, "create", create_then_cancel)
+    before = UPSTREAM_ERRORS.render()
+
+    with pytest.raises(JobCancelled):
+        generator._synthesize_chunk("Text.", tmp_path / "chunk.mp3", "alloy", 1.0, None, cancel_token=token)
+
+    assert UPSTREAM_ERRORS.render() == before
+    assert not (tmp_path / "chunk.mp3").exists()
+
+def test_deadline_cancels_the_token():
+    token = CancellationToken(deadline_at=time.time() - 1)
+    assert token.cancelled and token.reason == "Deadline exceeded"
+    assert token.remaining() == 0
+    with pytest.raises(JobCancelled):
+        token.raise_if_cancelled()
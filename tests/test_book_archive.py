@@ -0,0 +1,27 @@
+import io
+import zipfile
+
+from src.make_a_book.book_archive import iter_book_zip
+
+
+def test_streamed_zip_round_trips(tmp_path):
+    book = tmp_path / "my_book_complete"
+    (book / "audio").mkdir(parents=True)
+    (book / "text").mkdir()
+    audio = bytes(range(256)) * 1024
+    (book / "audio" / "chapter_01.mp3").write_bytes(audio)
+    (book / "text" / "chapter_01.md").write_text("# Chapter 1\n\n" + "Once upon a time. " * 500)
+
+    pieces = list(iter_book_zip(book, chunk_size=4096))
+    assert len(pieces) > 2
+
+    with zipfile.ZipFile(io.BytesIO(b"".join(pieces))) as archive:
+        assert archive.testzip() is None
+        entries = {info.filename: info for info in archive.infolist()}
+        assert sorted(entries) == [
+            "my_book_complete/audio/chapter_01.mp3",
+            "my_book_complete/text/chapter_01.md",
+        ]
+        assert entries["my_book_complete/audio/chapter_01.mp3"].compress_type == zipfile.ZIP_STORED
+        assert entries["my_book_complete/text/chapter_01.md"].compress_type == zipfile.ZIP_DEFLATED
+        assert archive.read("my_book_complete/audio/chapter_01.mp3") == audio
@@ -0,0 +1,57 @@
+import asyncio
+
+import dspy
+
+from src.make_a_book.chapter_generator import ChapterCreator
+
+
+OUTLINE = """Chapter 1: Dawn
+The town wakes.
+
+Chapter 2: Dusk
+The town sleeps.
+"""
+
+
+class _FakePredict:
+    def __init__(self, fail_once: str):
+        self.fail_once = fail_once
+        self.calls = []
+
+    def __call__(self, **inputs):
+        self.calls.append(inputs["chapter_heading"])
+        if inputs["chapter_heading"] == self.fail_once and self.calls.count(self.fail_once) == 1:
+            raise RuntimeError("malformed response")
+        return dspy.Prediction(chapter=f"Text of {inputs['chapter_heading']}")
+
+    async def acall(self, **inputs):
+        return self(**inputs)
+
+
+def test_per_chapter_generation_retries_failed_chapters_and_keeps_order():
+    creator = ChapterCreator(lm=None, max_concurrency=2)
+    creator.generate_chapter = _FakePredict(fail_once="Chapter 1: Dawn")
+
+    chapters = creator.create_chapters_per_chapter(OUTLINE, target_duration_minutes=10)
+
+    assert chapters == ["Text of Chapter 1: Dawn", "Text of Chapter 2: Dusk"]
+    assert creator.generate_chapter.calls.count("Chapter 1: Dawn") == 2
+
+    creator.generate_chapter = _FakePredict(fail_once="Chapter 2: Dusk")
+    chapters = asyncio.run(creator.acreate_chapters_per_chapter(OUTLINE, target_duration_minutes=10))
+    assert chapters == ["Text of Chapter 1: Dawn", "Text of Chapter 2: Dusk"]
+
+
+def test_chapters_stream_in_completion_order():
+    class _SlowFirstPredict(_FakePredict):
+        async def acall(self, **inputs):
+            await asyncio.sleep(0.05 if inputs["chapter_number"] == 1 else 0)
+            return self(**inputs)
+
+    creator = ChapterCreator(lm=None)
+    creator.generate_chapter = _SlowFirstPredict(fail_once="")
+
+    async def collect():
+        return [index async for index, _ in creator.aiter_chapters(OUTLINE, target_duration_minutes=10)]
+
+    assert asyncio.run(collect()) == [1, 0]
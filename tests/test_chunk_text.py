@@ -0,0 +1,32 @@
+from src.make_a_book.text_chunker import chunk_text
+
+
+def test_keeps_original_punctuation():
+    text = "Is it raining? Yes! Bring a coat. " * 20
+
+    chunks = chunk_text(text, max_chars=200)
+
+    assert " ".join(chunks) == text.strip()
+    assert all(chunk.endswith(("?", "!", ".")) for chunk in chunks)
+    assert all(len(chunk) <= 200 for chunk in chunks)
+
+
+def test_oversized_sentence_is_split_at_clauses_then_words():
+    clauses = ", ".join(f"clause number {index}" for index in range(30)) + "."
+    words = " ".join(["word"] * 100)
+
+    clause_chunks = chunk_text(clauses, max_chars=100)
+    word_chunks = chunk_text(words, max_chars=100)
+
+    assert all(len(chunk) <= 100 for chunk in clause_chunks + word_chunks)
+    assert all(chunk.endswith((",", ".")) for chunk in clause_chunks)
+    assert " ".join(word_chunks) == words
+
+
+def test_chunk_sizes_are_balanced():
+    text = " ".join(f"Sentence {index:02d} has a few more words in it." for index in range(90))
+
+    chunks = chunk_text(text, max_chars=1000)
+
+    assert len(chunks) == 4
+    assert max(map(len, chunks)) - min(map(len, chunks)) < 100
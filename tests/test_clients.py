@@ -0,0 +1,36 @@
+from src.make_a_book.clients import ClientRegistry, ConnectionStats
+
+
+class _Connection:
+    pass
+
+
+def test_connection_stats_count_reused_requests():
+    stats = ConnectionStats()
+    first, second = _Connection(), _Connection()
+
+    stats.record([first])
+    stats.record([first])
+    stats.record([first, second])
+
+    assert stats.snapshot() == {
+        "requests": 3,
+        "connections_opened": 2,
+        "reused_requests": 1,
+        "reuse_ratio": 0.333,
+    }
+
+
+def test_registry_shares_one_client_per_key_and_sizes_the_pool(monkeypatch):
+    monkeypatch.delenv("OPENAI_BASE_URL", raising=False)
+    registry = ClientRegistry(concurrency=3, http2=False)
+
+    client = registry.openai("key-a")
+    assert registry.openai("key-a") is client
+    assert registry.openai("key-b") is not client
+
+    stats = registry.stats()
+    assert stats["max_keepalive_connections"] == 3
+    assert [pool["client"] for pool in stats["pools"]] == ["openai", "openai"]
+    registry.close()
+    assert client._client.is_closed
@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+from src.make_a_book.job_queue import JobQueue, QueueFullError
+
+
+def test_queue_is_bounded_and_reports_positions_and_start_times():
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    queue = JobQueue(workers=1, max_depth=2)
+    running = queue.submit("running", blocker, estimated_seconds=60)
+    assert started.wait(5)
+    queue.submit("first", lambda: "first", estimated_seconds=30)
+    queue.submit("second", lambda: "second", estimated_seconds=30)
+
+    assert queue.position("running") is None
+    position, start = queue.position("second")
+    assert position == 2 and 89 <= start <= 90
+
+    queue.report_remaining("running", 10)
+    assert 39 <= queue.position("second")[1] <= 40
+
+    with pytest.raises(QueueFullError) as excinfo:
+        queue.submit("third", lambda: None)
+    assert excinfo.value.retry_after == 10
+    # Already queued jobs are not queued twice, even when the queue is full.
+    assert queue.submit("first", lambda: None) is not running
+    assert "first" in queue
+
+    release.set()
+    assert running.result(5) == "done"
+    assert queue.submit("forced", lambda: "forced", force=True).result(5) == "forced"
+    assert queue.stats() == {"workers": 1, "running": 0, "queued": 0, "max_depth": 2}
+
+
+def test_zero_depth_still_admits_a_job_for_an_idle_worker():
+    queue = JobQueue(workers=1, max_depth=0)
+    assert queue.submit("only", lambda: "done").result(5) == "done"
+    assert queue.stats()["max_depth"] == 1
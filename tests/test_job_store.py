@@ -0,0 +1,45 @@
+from src.make_a_book.job_store import JobStore
+
+
+def test_progress_updates_are_batched_but_visible(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3", flush_interval=3600)
+    store.create("job1", status="queued", progress=0, total_chapters=3)
+    store.update("job1", status="running")
+    store.update("job1", progress=33, completed_chapters=1)
+
+    assert store.get("job1")["progress"] == 33
+    # Not flushed yet: a second connection only sees the durable status change.
+    other = JobStore(tmp_path / "jobs.sqlite3")
+    assert other.get("job1")["status"] == "running"
+    assert other.get("job1")["progress"] == 0
+
+    store.update("job1", status="completed", progress=100)
+    assert other.get("job1")["progress"] == 100
+    assert other.get("missing") is None
+
+
+def test_jobs_survive_reopen_and_are_listed_by_status(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3")
+    store.create("a", status="running")
+    store.create("b", status="completed")
+    store.update("a", progress=50)
+    store.close()
+
+    reopened = JobStore(tmp_path / "jobs.sqlite3")
+    running = reopened.list_by_status("queued", "running")
+    assert [job_id for job_id, _ in running] == ["a"]
+    assert running[0][1]["progress"] == 50
+
+
+def test_conditional_update_keeps_a_finished_status(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite3", flush_interval=3600)
+    store.create("done", status="running")
+    store.update("done", status="completed", progress=100)
+    store.create("live", status="running")
+    store.update("live", progress=40)
+
+    assert not store.update_if_status("done", ("queued", "running"), status="cancelled")
+    assert store.get("done")["status"] == "completed"
+    assert store.update_if_status("live", ("queued", "running"), status="cancelled", error="Cancelled")
+    assert store.get("live") == {"status": "cancelled", "error": "Cancelled", "progress": 40}
+    assert not store.update_if_status("missing", ("running",), status="cancelled")
@@ -0,0 +1,45 @@
+import threading
+
+from src.make_a_book.job_trace import JobTrace, append_span, read_trace, timings_from_trace
+
+
+def test_chrome_trace_round_trips_to_a_span_tree(tmp_path):
+    trace = JobTrace("audiobook", job_id="abc")
+    chapter = trace.start("chapter 1", track="chapter 1")
+    chunk = trace.start("chunk", parent=chapter, chunk=1)
+    worker = threading.Thread(target=lambda: trace.end(chunk), name="tts-worker-0")
+    worker.start()
+    worker.join()
+    with trace.span("combine", parent=chapter):
+        pass
+    trace.end(chapter)
+    trace.finish(status="completed")
+
+    path = tmp_path / "trace.json"
+    trace.write(path)
+    saved = read_trace(path)
+
+    tracks = {event["args"]["name"] for event in saved["traceEvents"] if event["ph"] == "M"}
+    assert tracks == {"MainThread", "chapter 1", "tts-worker-0"}
+    timings = timings_from_trace(saved)
+    assert timings["name"] == "audiobook"
+    assert timings["attributes"] == {"job_id": "abc", "status": "completed"}
+    assert [child["name"] for child in timings["children"][0]["children"]] == ["chunk", "combine"]
+
+
+def test_open_spans_are_marked_and_external_spans_append_under_the_root(tmp_path):
+    trace = JobTrace("audiobook")
+    trace.start("chapter 1")
+    assert trace.tree()["children"][0]["attributes"] == {"open": True}
+
+    path = tmp_path / "trace.json"
+    assert not append_span(path, "zip", 0.0, 1.0)
+    trace.finish()
+    trace.write(path)
+    assert append_span(path, "zip", trace.started_at + 2.0, trace.started_at + 2.5, bytes=10)
+
+    zip_span = timings_from_trace(read_trace(path))["children"][-1]
+    assert zip_span == {
+        "name": "zip", "start_seconds": 2.0, "duration_seconds": 0.5,
+        "attributes": {"bytes": 10}, "children": [],
+    }
@@ -0,0 +1,48 @@
+import time
+
+import dspy
+
+from src.make_a_book.llm_cache import LLMResponseCache
+from src.make_a_book.outline_generator import OutlineCreator
+
+
+def test_disk_tier_survives_restart_and_keys_ignore_whitespace(tmp_path):
+    cache = LLMResponseCache(tmp_path)
+    cache.put(LLMResponseCache.make_key("outline", "model-a", prompt="A book  \r\nabout owls"), "outline")
+
+    restarted = LLMResponseCache(tmp_path)
+    assert restarted.get(LLMResponseCache.make_key("outline", "model-a", prompt=" A book\nabout owls ")) == "outline"
+    assert restarted.get(LLMResponseCache.make_key("outline", "model-b", prompt="A book\nabout owls")) is None
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_expired_and_evicted_entries_are_misses(tmp_path):
+    cache = LLMResponseCache(tmp_path, ttl_seconds=0.01, max_memory_entries=1)
+    cache.put("aa01", "old")
+    time.sleep(0.02)
+    assert cache.get("aa01") is None
+
+    small = LLMResponseCache(tmp_path / "small", max_memory_entries=1, max_disk_bytes=120)
+    small.put("bb01", "x" * 40)
+    small.put("bb02", "y" * 40)
+    assert small.get("bb01") is None
+    assert small.get("bb02") == "y" * 40
+
+
+def test_outline_creator_caches_and_regenerate_bypasses(tmp_path):
+    calls = []
+
+    class _FakePredict:
+        def __call__(self, **inputs):
+            calls.append(inputs)
+            return dspy.Prediction(outline=f"Outline {len(calls)}")
+
+    creator = OutlineCreator(lm=dspy.LM("openai/test-model"), cache=LLMResponseCache(tmp_path))
+    creator.generate_outline = _FakePredict()
+
+    assert creator.create_outline("Owls", 10) == "Outline 1"
+    assert creator.create_outline("Owls ", 10) == "Outline 1"
+    assert creator.create_outline("Owls", 10, regenerate=True) == "Outline 2"
+    assert creator.create_outline("Owls", 10) == "Outline 2"
+    assert len(calls) == 2
+    assert creator.cache.stats()["bypassed"] == 1
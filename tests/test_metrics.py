@@ -0,0 +1,64 @@
+import httpx
+import pytest
+
+from src.make_a_book.cancellation import JobCancelled
+from src.make_a_book.metrics import UPSTREAM_ERRORS, Counter, Gauge, Histogram, MetricsRegistry, upstream_call
+
+
+def test_histogram_renders_cumulative_buckets_per_label_set():
+    registry = MetricsRegistry()
+    histogram = Histogram("stage_seconds", "Stage latency.", ["stage"], buckets=(1, 5), registry=registry)
+
+    histogram.observe(0.5, stage="tts")
+    histogram.observe(1, stage="tts")
+    histogram.observe(7, stage="tts")
+    histogram.observe(2, stage="zip")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP stage_seconds Stage latency.", "# TYPE stage_seconds histogram"]
+    assert 'stage_seconds_bucket{stage="tts",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="tts",le="5"} 2' in lines
+    assert 'stage_seconds_bucket{stage="tts",le="+Inf"} 3' in lines
+    assert 'stage_seconds_sum{stage="tts"} 8.5' in lines
+    assert 'stage_seconds_count{stage="tts"} 3' in lines
+    assert 'stage_seconds_bucket{stage="zip",le="5"} 1' in lines
+    assert histogram.count(stage="zip") == 1
+
+
+def test_counter_and_gauge_render_and_validate_labels():
+    registry = MetricsRegistry()
+    errors = Counter("errors_total", "Errors.", ["service"], registry=registry)
+    depth = Gauge("queue_depth", "Depth.", registry=registry, function=lambda: 3)
+
+    errors.inc(service='say "hi"')
+    with pytest.raises(ValueError):
+        errors.inc(kind="tts")
+    with pytest.raises(ValueError):
+        Gauge("queue_depth", "Duplicate.", registry=registry)
+
+    text = registry.render()
+    assert 'errors_total{service="say \\"hi\\""} 1' in text
+    assert "queue_depth 3" in text
+    assert depth.render()[-1] == "queue_depth 3"
+
+
+def test_upstream_call_times_the_call_and_counts_errors():
+    registry = MetricsRegistry()
+    histogram = Histogram("call_seconds", "Calls.", registry=registry)
+    before = UPSTREAM_ERRORS.value(service="test", error="ConnectError")
+
+    with upstream_call("test", histogram):
+        pass
+    with pytest.raises(httpx.ConnectError):
+        with upstream_call("test", histogram):
+            raise httpx.ConnectError("refused")
+    # Local failures and cancellations are not the provider's.
+    for exc in (FileNotFoundError("chunk.mp3"), JobCancelled("Cancelled by user")):
+        with pytest.raises(type(exc)):
+            with upstream_call("test", histogram):
+                raise exc
+
+    assert histogram.count() == 4
+    assert UPSTREAM_ERRORS.value(service="test", error="ConnectError") == before + 1
+    assert UPSTREAM_ERRORS.value(service="test", error="FileNotFoundError") == 0
+    assert UPSTREAM_ERRORS.value(service="test", error="JobCancelled") == 0
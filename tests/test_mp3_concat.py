@@ -0,0 +1,73 @@
+import pytest
+
+from src.make_a_book.mp3_concat import (
+    Mp3FormatError,
+    concat_mp3_files,
+    iter_frames,
+    parse_frame_header,
+    silence,
+)
+
+# MPEG-2 Layer III, 64 kbps, 24 kHz, mono: 192-byte frames of 576 samples.
+MONO_24K = bytes([0xFF, 0xF3, 0x84, 0xC0])
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, joint stereo.
+STEREO_44K = bytes([0xFF, 0xFB, 0x90, 0x40])
+
+
+def _frames(header: bytes, count: int, fill: int) -> bytes:
+    length = parse_frame_header(header).frame_length
+    return (header + bytes([fill]) * (length - 4)) * count
+
+
+def _info_frame(header: bytes) -> bytes:
+    parsed = parse_frame_header(header)
+    frame = bytearray(parsed.frame_length)
+    frame[:4] = header
+    offset = 4 + parsed.side_info_length
+    frame[offset:offset + 4] = b"Info"
+    return bytes(frame)
+
+
+def _id3_tag() -> bytes:
+    return b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+
+
+def test_parse_frame_header():
+    header = parse_frame_header(MONO_24K)
+    assert (header.version, header.layer, header.sample_rate, header.mono) == ("2", 3, 24000, True)
+    assert header.frame_length == 192
+    assert parse_frame_header(STEREO_44K).frame_length == 417
+
+
+def test_concat_strips_tags_and_inserts_silence(tmp_path):
+    first = tmp_path / "part_01.mp3"
+    second = tmp_path / "part_02.mp3"
+    first.write_bytes(_id3_tag() + _info_frame(MONO_24K) + _frames(MONO_24K, 3, 0x11))
+    second.write_bytes(_frames(MONO_24K, 2, 0x22) + b"TAG" + b"\x00" * 125)
+    output = tmp_path / "chapter.mp3"
+
+    concat_mp3_files([first, second], output, gap_ms=500)
+
+    gap = silence(parse_frame_header(MONO_24K), 500)
+    assert len(gap) == 21 * 192
+    assert output.read_bytes() == _frames(MONO_24K, 3, 0x11) + gap + _frames(MONO_24K, 2, 0x22)
+    with open(output, "rb") as handle:
+        assert len(list(iter_frames(handle))) == 3 + 21 + 2
+
+
+def test_concat_rejects_mismatched_encodings(tmp_path):
+    first = tmp_path / "part_01.mp3"
+    second = tmp_path / "part_02.mp3"
+    first.write_bytes(_frames(MONO_24K, 2, 0x11))
+    second.write_bytes(_frames(STEREO_44K, 2, 0x22))
+
+    with pytest.raises(Mp3FormatError):
+        concat_mp3_files([first, second], tmp_path / "chapter.mp3")
+
+
+def test_concat_rejects_non_mp3_data(tmp_path):
+    first = tmp_path / "part_01.mp3"
+    first.write_bytes(b"not audio at all")
+
+    with pytest.raises(Mp3FormatError):
+        concat_mp3_files([first], tmp_path / "chapter.mp3")
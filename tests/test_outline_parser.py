@@ -0,0 +1,36 @@
+from src.make_a_book.outline_parser import parse_outline_chapters
+
+
+OUTLINE = """# The Lighthouse Keeper
+
+A gentle story about courage.
+
+## Chapter 1: The Storm
+- Mara hears the foghorn fail
+- She climbs the tower
+
+**Chapter Two - The Lamp**
+The lamp will not light.
+
+1. Chapter III: Morning
+   Boats return safely.
+
+Chapter summaries are kept short.
+"""
+
+
+def test_parses_headings_lists_and_emphasis():
+    chapters = parse_outline_chapters(OUTLINE)
+
+    assert [chapter.number for chapter in chapters] == [1, 2, 3]
+    assert [chapter.heading for chapter in chapters] == [
+        "Chapter 1: The Storm",
+        "Chapter Two - The Lamp",
+        "Chapter III: Morning",
+    ]
+    assert chapters[0].summary == "- Mara hears the foghorn fail\n- She climbs the tower"
+    assert chapters[2].summary == "Boats return safely.\n\nChapter summaries are kept short."
+
+
+def test_outline_without_chapters():
+    assert parse_outline_chapters("Just a paragraph about a book.") == []
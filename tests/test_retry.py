@@ -0,0 +1,58 @@
+import random
+
+import httpx
+import openai
+
+from src.make_a_book.retry import (
+    CONNECTION,
+    FATAL,
+    RATE_LIMIT,
+    SERVER_ERROR,
+    TIMEOUT,
+    RetryBudget,
+    RetryPolicy,
+    classify_error,
+    retry_after_seconds,
+)
+
+
+def _status_error(status: int, headers: dict | None = None) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/audio/speech")
+    response = httpx.Response(status, headers=headers, request=request)
+    return openai.APIStatusError("upstream error", response=response, body=None)
+
+
+def test_errors_are_classified_by_type_and_status():
+    request = httpx.Request("POST", "https://api.openai.com/v1/audio/speech")
+    assert classify_error(_status_error(429)) == RATE_LIMIT
+    assert classify_error(_status_error(503)) == SERVER_ERROR
+    assert classify_error(_status_error(408)) == TIMEOUT
+    assert classify_error(_status_error(400)) == FATAL
+    assert classify_error(openai.APITimeoutError(request=request)) == TIMEOUT
+    assert classify_error(openai.APIConnectionError(request=request)) == CONNECTION
+    assert classify_error(httpx.ReadError("reset")) == CONNECTION
+    assert classify_error(ValueError("bad input")) == FATAL
+
+
+def test_retry_after_reads_seconds_and_milliseconds():
+    assert retry_after_seconds(_status_error(429, {"retry-after": "7"})) == 7
+    assert retry_after_seconds(_status_error(429, {"retry-after-ms": "250", "retry-after": "7"})) == 0.25
+    assert retry_after_seconds(_status_error(429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+    assert retry_after_seconds(_status_error(429)) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_delay_is_jittered_capped_and_respects_retry_after():
+    policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=8, rng=random.Random(0))
+
+    delays = [policy.delay(attempt) for attempt in range(1, 7) for _ in range(50)]
+    assert all(0 <= delay <= 8 for delay in delays)
+    assert max(policy.delay(1) for _ in range(50)) <= 1
+    assert policy.delay(1, retry_after=5) >= 5
+    assert policy.delay(1, retry_after=120) == 8
+
+
+def test_budget_stops_after_max_retries():
+    budget = RetryBudget(max_retries=2)
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+    assert budget.spent == 2
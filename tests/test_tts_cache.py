@@ -0,0 +1,52 @@
+from src.make_a_book.tts_cache import TTSChunkCache
+
+
+def _write(path, size):
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_cache_key_depends_on_every_setting():
+    base = TTSChunkCache.make_key("model", "alloy", 1.0, "warm", "Hello.")
+    assert base == TTSChunkCache.make_key("model", "alloy", 1, "warm", "Hello.")
+    assert base != TTSChunkCache.make_key("model", "fable", 1.0, "warm", "Hello.")
+    assert base != TTSChunkCache.make_key("model", "alloy", 1.25, "warm", "Hello.")
+    assert base != TTSChunkCache.make_key("model", "alloy", 1.0, None, "Hello.")
+    assert base != TTSChunkCache.make_key("model", "alloy", 1.0, "warm", "Hello!")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = TTSChunkCache(tmp_path / "cache", max_bytes=250)
+    cache.store("aa01", _write(tmp_path / "a.mp3", 100))
+    cache.store("bb02", _write(tmp_path / "b.mp3", 100))
+
+    # Touch the older entry so the newer one becomes the eviction candidate.
+    assert cache.fetch("aa01", tmp_path / "a_copy.mp3")
+    cache.store("cc03", _write(tmp_path / "c.mp3", 100))
+
+    assert cache.fetch("aa01", tmp_path / "a_again.mp3")
+    assert not cache.fetch("bb02", tmp_path / "b_copy.mp3")
+    assert cache.stats()["bytes"] == 200
+
+    reloaded = TTSChunkCache(tmp_path / "cache", max_bytes=250)
+    assert reloaded.stats()["entries"] == 2
+
+
+def test_cache_fetch_onto_existing_path(tmp_path):
+    cache = TTSChunkCache(tmp_path / "cache")
+    chunk = _write(tmp_path / "chunk.mp3", 100)
+    cache.store("aa01", chunk)
+
+    # The chunk is already a link to the cached entry: a plain hit.
+    assert cache.fetch("aa01", chunk)
+    assert chunk.read_bytes() == b"x" * 100
+
+    # A different file at dest is replaced, not written through, so files
+    # hardlinked to it keep their content.
+    stale = _write(tmp_path / "stale.mp3", 10)
+    stale_link = tmp_path / "stale_link.mp3"
+    stale_link.hardlink_to(stale)
+    assert cache.fetch("aa01", stale)
+    assert stale.read_bytes() == b"x" * 100
+    assert stale_link.read_bytes() == b"x" * 10
+    assert not list(tmp_path.glob(".*.tmp"))
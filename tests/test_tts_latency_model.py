@@ -0,0 +1,26 @@
+from src.make_a_book.tts_time_estimator import RemainingWorkEta, TTSLatencyModel
+
+
+def test_model_learns_observed_latency_and_persists(tmp_path):
+    path = tmp_path / "model.json"
+    model = TTSLatencyModel(path, save_every=1)
+    for chars in (500, 1000, 2000, 3000, 4000) * 20:
+        model.observe(chars, "alloy", 1.0, 100, 1, 1.0 + chars / 1000 * 4)
+
+    assert abs(model.predict(2500, voice="alloy", instruction_chars=100) - 11.0) < 1.0
+
+    restored = TTSLatencyModel(path)
+    assert restored.observations == 100
+    assert abs(restored.predict(2500, voice="alloy", instruction_chars=100) - 11.0) < 1.0
+
+
+def test_eta_counts_only_remaining_work():
+    eta = RemainingWorkEta(total_work=100.0, parallelism=4, prior_seconds=10.0)
+    assert eta.eta_seconds() == 25
+
+    eta.complete(75.0)
+    assert eta.fraction_done == 0.75
+    assert eta.eta_seconds() < 25
+
+    eta.complete(25.0)
+    assert eta.eta_seconds() == 0
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from src.make_a_book.tts_scheduler import TokenBucket, TTSScheduler
+
+
+def test_scheduler_serves_groups_round_robin():
+    scheduler = TTSScheduler(max_concurrency=1, requests_per_minute=0, chars_per_minute=0)
+    gate = threading.Event()
+    order = []
+
+    # Hold the single worker so the queue fills before anything runs.
+    blocker = scheduler.submit(gate.wait, group="blocker")
+    futures = [scheduler.submit(lambda: order.append("a"), group="a") for _ in range(3)]
+    futures += [scheduler.submit(lambda: order.append("b"), group="b") for _ in range(2)]
+    gate.set()
+
+    blocker.result(timeout=1)
+    for future in futures:
+        future.result(timeout=1)
+    assert order == ["a", "b", "a", "b", "a"]
+
+
+def test_scheduler_caps_concurrency():
+    scheduler = TTSScheduler(max_concurrency=2, requests_per_minute=0, chars_per_minute=0)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def task():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    futures = [scheduler.submit(task) for _ in range(6)]
+    for future in futures:
+        future.result(timeout=1)
+    assert peak == 2
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(rate_per_minute=600, burst_seconds=0.1)
+    assert bucket.capacity == 1.0
+    assert bucket.acquire() == 0.0
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.05